@@ -3,26 +3,57 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_cors import CORS
 from flask_migrate import Migrate
 from flask_caching import Cache
+from flask_compress import Compress
 from config import Config
 
 db = SQLAlchemy()
 migrate = Migrate()
 cache = Cache()
+compress = Compress()
 
 def create_app(config_class=Config):
     app = Flask(__name__)
     app.config.from_object(config_class)
 
+    # orjson-backed jsonify/app.json when orjson is installed
+    from app.utils.fast_json import FastJSONProvider
+    app.json = FastJSONProvider(app)
+
     # Initialize extensions
     db.init_app(app)
     migrate.init_app(app, db)
     CORS(app)
     cache.init_app(app)
+    compress.init_app(app)
+
+    # On-disk cache of raw upstream responses
+    from app.services.http_cache import init_app as init_http_cache
+    init_http_cache(app)
+
+    # Parquet store of pitch-level Statcast events
+    from app.services.pitch_store import init_app as init_pitch_store
+    init_pitch_store(app)
 
     # Register blueprints
     from app.api import init_app as init_api
     init_api(app)
 
+    # Columnar leaderboard snapshot (needs numpy; loads once tables exist)
+    from app.services.columnar import init_app as init_columnar
+    init_columnar(app)
+
+    # Date-sorted game logs for rolling splits, loaded per season on first use
+    from app.services.game_logs import init_app as init_game_logs
+    init_game_logs(app)
+
+    # In-memory player-name search index, built on first search
+    from app.services.player_index import init_app as init_player_index
+    init_player_index(app)
+
+    # Register CLI commands
+    from app.cli import init_app as init_cli
+    init_cli(app)
+
     @app.route('/')
     def index():
         return render_template('index.html')
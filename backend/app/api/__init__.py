@@ -4,6 +4,24 @@ bp = Blueprint('api', __name__)
 
 # Import routes after creating blueprint to avoid circular imports
 from app.api.statistics import bp as stats_bp  # Import the statistics blueprint
+from app.api.jobs import bp as jobs_bp
+from app.api.cache import bp as cache_bp
+from app.api.export import bp as export_bp
+from app.api.nlp import bp as nlp_bp
+from app.api.compare import bp as compare_bp
+from app.api.windows import bp as windows_bp
+from app.api.rolling import bp as rolling_bp
+from app.api.splits import bp as splits_bp
+from app.api.statcast import bp as statcast_bp
 
 def init_app(app):
-    app.register_blueprint(stats_bp, url_prefix='/api') 
\ No newline at end of file
+    app.register_blueprint(stats_bp, url_prefix='/api')
+    app.register_blueprint(jobs_bp, url_prefix='/api')
+    app.register_blueprint(cache_bp, url_prefix='/api')
+    app.register_blueprint(export_bp, url_prefix='/api')
+    app.register_blueprint(nlp_bp, url_prefix='/api')
+    app.register_blueprint(compare_bp, url_prefix='/api')
+    app.register_blueprint(windows_bp, url_prefix='/api')
+    app.register_blueprint(rolling_bp, url_prefix='/api')
+    app.register_blueprint(splits_bp, url_prefix='/api')
+    app.register_blueprint(statcast_bp, url_prefix='/api') 
\ No newline at end of file
@@ -0,0 +1,18 @@
+from flask import Blueprint, jsonify
+from app.services.http_cache import response_cache
+from app.services.response_cache import cache_stats
+from app.services.upstream import upstream_stats
+
+bp = Blueprint('cache', __name__)
+
+@bp.route('/cache/stats', methods=['GET'])
+def get_cache_stats():
+    disk = response_cache()
+    return jsonify({
+        'success': True,
+        'data': {
+            **cache_stats(),
+            'upstream': upstream_stats(),
+            'disk': disk.stats() if disk else None
+        }
+    })
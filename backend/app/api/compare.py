@@ -0,0 +1,75 @@
+from flask import Blueprint, current_app, jsonify, request
+from app.services.aggregates import STAT_MODELS
+from app.services.comparison import compare_players
+from app.services.jobs import ACTIVE_STATUSES, enqueue_sync_jobs
+from app.services.response_cache import all_season_scopes, cached_response
+
+bp = Blueprint('compare', __name__)
+
+def parse_ids(value):
+    """'1,2,2,3' -> [1, 2, 3], keeping the first occurrence of each ID"""
+    try:
+        return list(dict.fromkeys(int(part) for part in value.split(',') if part.strip()))
+    except ValueError:
+        return None
+
+@bp.route('/players/compare', methods=['GET'])
+@cached_response(all_season_scopes)
+def compare():
+    """Season lines for several players, e.g. ?ids=1,2,3&type=batting&season_from=2020&season_to=2024"""
+    stat_type = request.args.get('type', 'batting')
+    if stat_type not in STAT_MODELS:
+        return jsonify({
+            'success': False,
+            'error': f'Unknown stat type: {stat_type}'
+        }), 400
+
+    player_ids = parse_ids(request.args.get('ids', ''))
+    max_players = current_app.config['COMPARE_MAX_PLAYERS']
+    if not player_ids or len(player_ids) > max_players:
+        return jsonify({
+            'success': False,
+            'error': f'ids must list 1 to {max_players} player IDs'
+        }), 400
+
+    season = request.args.get('season', type=int)
+    season_from = request.args.get('season_from', season, type=int)
+    season_to = request.args.get('season_to', season, type=int)
+    if season_from and season_to and season_from > season_to:
+        return jsonify({
+            'success': False,
+            'error': 'season_from is after season_to'
+        }), 400
+
+    compared, unknown_ids = compare_players(stat_type, player_ids, season_from, season_to)
+    if unknown_ids:
+        return jsonify({
+            'success': False,
+            'error': f'Unknown player IDs: {",".join(map(str, unknown_ids))}'
+        }), 404
+
+    # Players with no lines in a bounded range get one sync job per season;
+    # the worker batches a season's jobs into one upstream fetch
+    jobs = []
+    sync_max_seasons = current_app.config['COMPARE_SYNC_MAX_SEASONS']
+    if season_from and season_to and season_to - season_from < sync_max_seasons:
+        jobs = enqueue_sync_jobs(stat_type, [
+            (entry['player']['id'], year)
+            for entry in compared if not entry['seasons']
+            for year in range(season_from, season_to + 1)
+        ])
+
+    # Recently finished jobs that found no lines leave those players empty
+    jobs = [job for job in jobs if job.status in ACTIVE_STATUSES]
+    if jobs:
+        return jsonify({
+            'success': True,
+            'status': 'pending',
+            'job_ids': [job.id for job in jobs],
+            'data': compared
+        }), 202
+
+    return jsonify({
+        'success': True,
+        'data': compared
+    })
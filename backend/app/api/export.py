@@ -0,0 +1,69 @@
+from flask import Blueprint, Response, current_app, jsonify, request, stream_with_context
+from app.api.statistics import leaderboard_filters
+from app.services.aggregates import STAT_MODELS, keyset_order, season_totals_query
+from app.services.export import EXPORT_FORMATS, ExportUnavailable, export_rows, game_log_query
+
+bp = Blueprint('export', __name__)
+
+# Filters only one level can apply: season totals have no dates, and the
+# minimums apply to season totals rather than single games
+LEVEL_ONLY_FILTERS = {
+    'game': ('start_date', 'end_date'),
+    'season': ('min_games', 'min_at_bats', 'min_innings', 'min_hits', 'min_home_runs',
+               'min_strikeouts')
+}
+
+@bp.route('/statistics/export', methods=['GET'])
+def export_statistics():
+    """Stream season totals (level=season) or game logs (level=game)
+    as CSV, Parquet or Arrow IPC, using the get_statistics filters."""
+    stat_type = request.args.get('stat_type', 'batting')
+    file_format = request.args.get('format', 'csv')
+    level = request.args.get('level', 'season')
+    
+    if stat_type not in STAT_MODELS or file_format not in EXPORT_FORMATS \
+            or level not in ('season', 'game'):
+        return jsonify({
+            'success': False,
+            'error': 'stat_type must be batting or pitching, format one of '
+                     f'{", ".join(EXPORT_FORMATS)} and level season or game'
+        }), 400
+    
+    unsupported = [
+        name for other, names in LEVEL_ONLY_FILTERS.items() if other != level
+        for name in names if request.args.get(name)
+    ]
+    if unsupported:
+        return jsonify({
+            'success': False,
+            'error': f'{", ".join(unsupported)} cannot be used with level={level}'
+        }), 400
+    
+    filters = leaderboard_filters()
+    if level == 'season':
+        query = keyset_order(season_totals_query(stat_type, **filters), stat_type)
+    else:
+        query = game_log_query(
+            stat_type,
+            season=filters['season'],
+            season_from=filters['season_from'],
+            season_to=filters['season_to'],
+            team=filters['team'],
+            start_date=request.args.get('start_date'),
+            end_date=request.args.get('end_date')
+        )
+    
+    try:
+        body = export_rows(query, file_format, current_app.config['STREAM_BATCH_SIZE'])
+    except ExportUnavailable as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 501
+    
+    mimetype, extension = EXPORT_FORMATS[file_format]
+    return Response(
+        stream_with_context(body),
+        mimetype=mimetype,
+        headers={'Content-Disposition': f'attachment; filename={stat_type}_{level}.{extension}'}
+    )
@@ -0,0 +1,19 @@
+from flask import Blueprint, jsonify
+from app import db
+from app.models import SyncJob
+
+bp = Blueprint('jobs', __name__)
+
+@bp.route('/jobs/<int:job_id>', methods=['GET'])
+def get_job(job_id):
+    job = db.session.get(SyncJob, job_id)
+    if not job:
+        return jsonify({
+            'success': False,
+            'error': 'Job not found'
+        }), 404
+
+    return jsonify({
+        'success': True,
+        'data': job.to_dict()
+    })
@@ -0,0 +1,45 @@
+import time
+from flask import Blueprint, current_app, jsonify, request
+from app.services.nlp import QueryNotUnderstood, parse_query
+from app.services.query_plan import execute_plan
+
+bp = Blueprint('nlp', __name__)
+
+@bp.route('/nlp/query', methods=['POST'])
+def nlp_query():
+    """Answer a leaderboard question posted as {"query": "..."}"""
+    text = (request.get_json(silent=True) or {}).get('query', '')
+    if not isinstance(text, str) or not text.strip():
+        return jsonify({
+            'success': False,
+            'error': 'A query is required'
+        }), 400
+
+    started = time.perf_counter()
+    try:
+        plan = parse_query(
+            text,
+            current_app.config['ITEMS_PER_PAGE'],
+            current_app.config['MAX_ITEMS_PER_PAGE']
+        )
+    except QueryNotUnderstood as e:
+        return jsonify({
+            'success': False,
+            'error': f'Could not understand the query: {e}'
+        }), 400
+    parsed = time.perf_counter()
+
+    data, columns = execute_plan(plan)
+    executed = time.perf_counter()
+
+    parse_ms = (parsed - started) * 1000
+    execute_ms = (executed - parsed) * 1000
+    response = jsonify({
+        'success': True,
+        'data': data,
+        'columns': columns,
+        'plan': plan.to_dict(),
+        'timings': {'parse_ms': round(parse_ms, 3), 'execute_ms': round(execute_ms, 3)}
+    })
+    response.headers['Server-Timing'] = f'parse;dur={parse_ms:.3f}, execute;dur={execute_ms:.3f}'
+    return response
@@ -0,0 +1,76 @@
+from datetime import date
+from flask import Blueprint, jsonify, request
+from app.api.statistics import leaderboard_filters
+from app.services.aggregates import STAT_MODELS
+from app.services.leaderboard import InvalidSort, parse_sort
+from app.services.response_cache import all_season_scopes, cached_response
+from app.services.rolling import hot_leaders, latest_game_date, player_rolling
+from app.utils.pagination import page_limit
+
+bp = Blueprint('rolling', __name__)
+
+UNITS = ('days', 'games')
+
+def error(message, status=400):
+    return jsonify({
+        'success': False,
+        'error': message
+    }), status
+
+def as_of_date():
+    """?as_of=YYYY-MM-DD, else the date of the latest game stored (None if none)"""
+    value = request.args.get('as_of')
+    return date.fromisoformat(value) if value else latest_game_date()
+
+@bp.route('/stats/<stat_type>/hot', methods=['GET'])
+@cached_response(all_season_scopes)
+def get_hot_leaders(stat_type):
+    """Leaders over the last ?days=N (default 7) days, e.g. ?sort=-hits&min_at_bats=10"""
+    if stat_type not in STAT_MODELS:
+        return error(f'Unknown stat type: {stat_type}')
+    try:
+        sort, descending = parse_sort(stat_type, request.args.get('sort'))
+        as_of = as_of_date()
+    except InvalidSort as e:
+        return error(f'Unknown column: {e}')
+    except ValueError:
+        return error('as_of must be a date like 2024-06-30')
+    if not sort:
+        return error('sort is required, e.g. sort=-hits')
+
+    days = request.args.get('days', 7, type=int)
+    if not 1 <= days <= 366:
+        return error('days must be between 1 and 366')
+    limit = page_limit()
+
+    filters = leaderboard_filters()
+    for key in ('season', 'season_from', 'season_to'):
+        filters.pop(key)
+    rows = hot_leaders(stat_type, as_of, days, sort, descending, limit, **filters) if as_of else []
+    return jsonify({
+        'success': True,
+        'as_of': as_of.isoformat() if as_of else None,
+        'data': rows
+    })
+
+@bp.route('/players/<int:player_id>/rolling', methods=['GET'])
+@cached_response(all_season_scopes)
+def get_player_rolling(player_id):
+    """Per-game totals over a trailing ?window=N (default 7) ?unit=days|games"""
+    stat_type = request.args.get('type', 'batting')
+    if stat_type not in STAT_MODELS:
+        return error(f'Unknown stat type: {stat_type}')
+    window = request.args.get('window', 7, type=int)
+    unit = request.args.get('unit', 'days')
+    if not 1 <= window <= 366 or unit not in UNITS:
+        return error('window must be between 1 and 366 and unit one of days, games')
+
+    season = request.args.get('season', type=int)
+    if season is None:
+        latest = latest_game_date()
+        season = latest.year if latest else None
+
+    return jsonify({
+        'success': True,
+        'data': player_rolling(stat_type, player_id, season, window, unit) if season else []
+    })
@@ -0,0 +1,66 @@
+from flask import Blueprint, jsonify, request
+from app.api.statistics import leaderboard_filters
+from app.services.aggregates import STAT_MODELS
+from app.services.leaderboard import InvalidSort, parse_sort
+from app.services.response_cache import all_season_scopes, cached_response
+from app.services.splits import SPLITS, player_splits, split_rows, split_value
+from app.services.windows import ranked_rows
+from app.utils.pagination import page_limit
+
+bp = Blueprint('splits', __name__)
+
+def error(message, status=400):
+    return jsonify({
+        'success': False,
+        'error': message
+    }), status
+
+@bp.route('/players/<int:player_id>/splits', methods=['GET'])
+@cached_response(all_season_scopes)
+def get_player_splits(player_id):
+    """A season's home/away, opponent and month splits, e.g. ?season=2024&split=venue"""
+    stat_type = request.args.get('type', 'batting')
+    if stat_type not in STAT_MODELS:
+        return error(f'Unknown stat type: {stat_type}')
+    split = request.args.get('split')
+    if split and split not in SPLITS:
+        return error(f'split must be one of {", ".join(SPLITS)}')
+    season = request.args.get('season', type=int)
+    if season is None:
+        return error('season is required')
+
+    return jsonify({
+        'success': True,
+        'data': player_splits(stat_type, player_id, season, split)
+    })
+
+@bp.route('/stats/<stat_type>/splits/<split>', methods=['GET'])
+@cached_response(all_season_scopes)
+def get_split_leaders(stat_type, split):
+    """Player-seasons ranked within one split, e.g. venue?value=away&sort=-home_runs
+    or opponent?value=SF (a team abbreviation) or month?value=9"""
+    if stat_type not in STAT_MODELS:
+        return error(f'Unknown stat type: {stat_type}')
+    if split not in SPLITS:
+        return error(f'split must be one of {", ".join(SPLITS)}')
+    try:
+        value = split_value(split, request.args.get('value'))
+    except ValueError:
+        return error(f'Unknown {split}: {request.args.get("value")}')
+    try:
+        sort, descending = parse_sort(stat_type, request.args.get('sort'))
+    except InvalidSort as e:
+        return error(f'Unknown column: {e}')
+    if not sort:
+        return error('sort is required, e.g. sort=-home_runs')
+
+    limit = page_limit()
+    filters = leaderboard_filters()
+    rows = split_rows(stat_type, split, value, *(
+        filters.pop(key) for key in ('season', 'season_from', 'season_to')
+    ))
+    query = ranked_rows(rows, stat_type, sort, descending, ties=('season',), **filters)
+    return jsonify({
+        'success': True,
+        'data': [row._asdict() for row in query.limit(limit)]
+    })
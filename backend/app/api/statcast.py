@@ -0,0 +1,58 @@
+from flask import Blueprint, jsonify, request
+from app.services.comparison import player_rows
+from app.services.pitch_store import METRICS, pitch_store
+from app.services.response_cache import cached_response, statcast_scopes
+from app.utils.pagination import page_limit
+
+bp = Blueprint('statcast', __name__)
+
+def error(message, status=400):
+    return jsonify({
+        'success': False,
+        'error': message
+    }), status
+
+@bp.route('/statcast/leaders', methods=['GET'])
+@cached_response(statcast_scopes)
+def get_statcast_leaders():
+    """Players ranked by an average pitch-level metric over a season, e.g.
+    ?sort=-exit_velocity&season=2024&min_events=100 (batted balls), or
+    ?sort=-velocity&pitch_type=FF; narrow with ?month=N"""
+    store = pitch_store()
+    if store is None:
+        return error('The Statcast pitch store is not configured', 503)
+
+    sort = request.args.get('sort', '')
+    metric = sort.lstrip('-')
+    if metric not in METRICS:
+        return error(f'sort must be one of {", ".join(METRICS)}, e.g. sort=-exit_velocity')
+    season = request.args.get('season', type=int)
+    if season is None:
+        return error('season is required')
+    month = request.args.get('month', type=int)
+    if month is not None and not 1 <= month <= 12:
+        return error('month must be between 1 and 12')
+
+    limit = page_limit()
+    leaders = store.leaders(
+        metric, season, sort.startswith('-'),
+        min_events=request.args.get('min_events', type=int),
+        limit=limit,
+        month=month,
+        pitch_type=request.args.get('pitch_type')
+    )
+    players = player_rows([player_id for _, player_id, _, _ in leaders])
+    return jsonify({
+        'success': True,
+        'data': [
+            {
+                'rank': rank,
+                'player_id': player_id,
+                'name': players.get(player_id, {}).get('name'),
+                'team': players.get(player_id, {}).get('team'),
+                metric: average,
+                'events': events
+            }
+            for rank, player_id, average, events in leaders
+        ]
+    })
@@ -1,115 +1,219 @@
-from flask import Blueprint, jsonify, request
+import base64
+import json
+from flask import Blueprint, Response, current_app, jsonify, request, stream_with_context
 from app.models import Player, BattingStats, PitchingStats, Team
 from app.services.mlb_api import MLBAPIService
+from app.services.aggregates import (
+    STAT_MODELS, keyset_order, season_totals_query, season_totals_version
+)
+from app.services.player_index import search_player_ids
+from app.services.leaderboard import InvalidSort, leaderboard_percentiles, leaderboard_rows, parse_sort
+from app.services.jobs import ACTIVE_STATUSES, enqueue_sync_job
+from app.services.response_cache import (
+    cached_response, conditional_response, invalidate, player_scopes, season_scopes
+)
+from app.utils.pagination import page_limit
+from app.utils.streaming import write_json_envelope, write_ndjson
 from app import db
-from sqlalchemy import and_
+from sqlalchemy import func
+from sqlalchemy.orm import joinedload
 
 bp = Blueprint('statistics', __name__)
 
+def pending_response(job, data):
+    """202 telling the client a backfill is queued; poll /api/jobs/<job_id>."""
+    return jsonify({
+        'success': True,
+        'status': 'pending',
+        'job_id': job.id,
+        'data': data
+    }), 202
+
+def leaderboard_filters():
+    """The get_statistics filters from the query string"""
+    return {
+        'season': request.args.get('season', type=int),
+        'season_from': request.args.get('season_from', type=int),
+        'season_to': request.args.get('season_to', type=int),
+        'team': request.args.get('team'),
+        'min_games': request.args.get('min_games', type=int),
+        
+        # Advanced filters
+        'min_at_bats': request.args.get('min_at_bats', type=int),
+        'min_innings': request.args.get('min_innings', type=float),
+        'min_hits': request.args.get('min_hits', type=int),
+        'min_home_runs': request.args.get('min_home_runs', type=int),
+        'min_strikeouts': request.args.get('min_strikeouts', type=int)
+    }
+
+# Per-game stats columns returned to clients (the models' to_dict() fields)
+TIMESTAMP_COLUMNS = ('created_at', 'updated_at')
+
+def stat_columns(stat_model):
+    return [column for column in stat_model.__table__.c if column.name not in TIMESTAMP_COLUMNS]
+
+def player_stats_query(player_id, stat_type, season=None):
+    stat_model = BattingStats if stat_type == 'batting' else PitchingStats
+    stats = stat_model.query.filter_by(player_id=player_id)
+    if season:
+        stats = stats.filter_by(season=season)
+    return stats
+
+def leaderboard_version(stat_type):
+    """Newest update and row count of the leaderboard rows in scope"""
+    if stat_type not in STAT_MODELS:
+        return None
+    return season_totals_version(stat_type, **leaderboard_filters())
+
+def player_stats_version(player_id):
+    """Newest update and row count of the player's stats rows in scope"""
+    stat_type = request.args.get('type', 'batting')
+    stat_model = BattingStats if stat_type == 'batting' else PitchingStats
+    player_updated_at = db.session.query(Player.updated_at) \
+        .filter(Player.id == player_id) \
+        .scalar_subquery()
+    return player_stats_query(
+        player_id, stat_type, request.args.get('season', type=int)
+    ).with_entities(
+        func.max(stat_model.updated_at),
+        player_updated_at,
+        func.count()
+    ).one()
+
+class InvalidCursor(ValueError):
+    pass
+
+def encode_cursor(row):
+    """Opaque cursor pointing just past a season row"""
+    return base64.urlsafe_b64encode(json.dumps([row['season'], row['player_id']]).encode()).decode()
+
+def decode_cursor(cursor):
+    if not cursor:
+        return None
+    try:
+        season, player_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return int(season), int(player_id)
+    except (ValueError, TypeError):
+        raise InvalidCursor(cursor)
+
+STREAM_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'json': 'application/json'
+}
+
+def streamed_response(query, stream_format):
+    """Stream every row of `query`, fetching STREAM_BATCH_SIZE rows at a time"""
+    rows = (row._asdict() for row in query.yield_per(current_app.config['STREAM_BATCH_SIZE']))
+    dumps = current_app.json.dumps
+    if stream_format == 'ndjson':
+        body = write_ndjson(rows, dumps)
+    else:
+        body = write_json_envelope(rows, dumps, success=True)
+    return Response(stream_with_context(body), mimetype=STREAM_FORMATS[stream_format])
+
 @bp.route('/stats/<stat_type>', methods=['GET'])
+@conditional_response(leaderboard_version)
+@cached_response(season_scopes)
 def get_statistics(stat_type):
+    if stat_type not in STAT_MODELS:
+        return jsonify({
+            'success': False,
+            'error': f'Unknown stat type: {stat_type}'
+        }), 400
+
     try:
-        # Get query parameters
-        season = request.args.get('season', type=int)
-        team = request.args.get('team')
-        min_games = request.args.get('min_games', type=int)
+        # Season totals come from the materialized per-season tables
+        filters = leaderboard_filters()
+        season = filters['season']
+        team = filters['team']
+        after = decode_cursor(request.args.get('cursor'))
+        sort, descending = parse_sort(stat_type, request.args.get('sort'))
+        if sort and after:
+            raise InvalidCursor(request.args.get('cursor'))
         
-        # Advanced filters
-        min_at_bats = request.args.get('min_at_bats', type=int)
-        min_innings = request.args.get('min_innings', type=float)
-        min_hits = request.args.get('min_hits', type=int)
-        min_home_runs = request.args.get('min_home_runs', type=int)
-        min_strikeouts = request.args.get('min_strikeouts', type=int)
-        
-        # Base query
-        if stat_type == 'batting':
-            query = db.session.query(Player, BattingStats).join(BattingStats)
-            filters = [BattingStats.season == season] if season else []
-            
-            # Apply batting-specific filters
-            if min_at_bats:
-                filters.append(BattingStats.at_bats >= min_at_bats)
-            if min_hits:
-                filters.append(BattingStats.hits >= min_hits)
-            if min_home_runs:
-                filters.append(BattingStats.home_runs >= min_home_runs)
-        else:  # pitching
-            query = db.session.query(Player, PitchingStats).join(PitchingStats)
-            filters = [PitchingStats.season == season] if season else []
-            
-            # Apply pitching-specific filters
-            if min_innings:
-                filters.append(PitchingStats.innings_pitched >= min_innings)
-            if min_strikeouts:
-                filters.append(PitchingStats.strikeouts >= min_strikeouts)
-        
-        # Apply common filters
-        if team:
-            team_obj = Team.query.filter_by(abbreviation=team).first()
-            if team_obj:
-                filters.append(Player.team_id == team_obj.id)
-        if min_games:
-            if stat_type == 'batting':
-                filters.append(BattingStats.games >= min_games)
-            else:
-                filters.append(PitchingStats.games >= min_games)
-        
-        if filters:
-            query = query.filter(and_(*filters))
-        
-        # Execute query
-        results = query.all()
-        
-        # If no results and season is specified, try to fetch from MLB API
-        if not results and season:
-            try:
-                # Search for players based on team if specified
-                if team:
-                    # Note: This is a simplified version. In a real implementation,
-                    # you would need to map team names to MLB team IDs
-                    team_roster = MLBAPIService.get_team_roster(team)
-                    for player_data in team_roster:
-                        MLBAPIService.sync_player_stats(
-                            player_data['person']['id'],
-                            season,
-                            stat_type
-                        )
-                else:
-                    # For now, we'll just sync a few popular players
-                    # In a real implementation, you would want to sync all players
-                    popular_players = [
-                        {'id': 545361, 'name': 'Mike Trout'},  # Example player IDs
-                        {'id': 677594, 'name': 'Shohei Ohtani'},
-                        {'id': 677594, 'name': 'Aaron Judge'}
-                    ]
-                    for player in popular_players:
-                        MLBAPIService.sync_player_stats(player['id'], season, stat_type)
-                
-                # Query again after syncing
-                results = query.all()
-            except Exception as e:
-                # Log the error but continue with whatever results we have
-                print(f"Error syncing with MLB API: {str(e)}")
-        
-        # Format response
-        stats = []
-        for player, stat in results:
-            player_dict = player.to_dict()
-            stat_dict = stat.to_dict()
-            stats.append({**player_dict, **stat_dict})
+        stream = request.args.get('stream')
+        if stream in STREAM_FORMATS:
+            query = keyset_order(season_totals_query(stat_type, **filters), stat_type, after)
+            return streamed_response(query, stream)
+        
+        # Fetch one extra row to tell whether another page exists; ranked
+        # (sort=[-]column) results are a single top-N page
+        limit = page_limit()
+        results = leaderboard_rows(stat_type, filters, sort, descending, after, limit + 1)
+        has_more = len(results) > limit and not sort
+        next_cursor = encode_cursor(results[limit - 1]) if has_more else None
+        results = results[:limit]
+        
+        # If no results and season is specified, queue a backfill from the MLB API
+        # (a recently finished one that found nothing leaves the page empty)
+        if not results and season and not after:
+            # Without a team the worker syncs a set of popular players
+            job = enqueue_sync_job(stat_type, season, team=team)
+            if job.status in ACTIVE_STATUSES:
+                return pending_response(job, [])
         
         return jsonify({
             'success': True,
-            'data': stats
+            'data': results,
+            'next_cursor': next_cursor
         })
         
+    except InvalidSort as e:
+        return jsonify({
+            'success': False,
+            'error': f'Unknown column: {e}'
+        }), 400
+        
+    except InvalidCursor:
+        return jsonify({
+            'success': False,
+            'error': 'Invalid cursor'
+        }), 400
+        
     except Exception as e:
         return jsonify({
             'success': False,
             'error': str(e)
         }), 500
 
+@bp.route('/stats/<stat_type>/percentiles', methods=['GET'])
+@conditional_response(leaderboard_version)
+@cached_response(season_scopes)
+def get_percentiles(stat_type):
+    """Percentiles of one season-total column, e.g. ?column=home_runs&q=50&q=90"""
+    if stat_type not in STAT_MODELS:
+        return jsonify({
+            'success': False,
+            'error': f'Unknown stat type: {stat_type}'
+        }), 400
+
+    column = request.args.get('column', '')
+    quantiles = request.args.getlist('q', type=float) or [25.0, 50.0, 75.0, 90.0, 99.0]
+    if not all(0 <= q <= 100 for q in quantiles):
+        return jsonify({
+            'success': False,
+            'error': 'Percentiles must be between 0 and 100'
+        }), 400
+
+    try:
+        values = leaderboard_percentiles(stat_type, column, quantiles, leaderboard_filters())
+    except InvalidSort:
+        return jsonify({
+            'success': False,
+            'error': f'Unknown column: {column}'
+        }), 400
+
+    return jsonify({
+        'success': True,
+        'data': {
+            'column': column,
+            'percentiles': {f'{q:g}': value for q, value in values.items()}
+        }
+    })
+
 @bp.route('/stats/player/<int:player_id>', methods=['GET'])
+@conditional_response(player_stats_version)
+@cached_response(season_scopes)
 def get_player_stats(player_id):
     try:
         stat_type = request.args.get('type', 'batting')
@@ -117,37 +221,27 @@ def get_player_stats(player_id):
         
         player = Player.query.get_or_404(player_id)
         
-        if stat_type == 'batting':
-            stats = BattingStats.query.filter_by(player_id=player_id)
-        else:
-            stats = PitchingStats.query.filter_by(player_id=player_id)
-            
-        if season:
-            stats = stats.filter_by(season=season)
-            
-        stats = stats.all()
+        # Plain rows rather than ORM objects: no identity map or to_dict() per game
+        stat_model = BattingStats if stat_type == 'batting' else PitchingStats
+        stats = [
+            row._asdict() for row in
+            player_stats_query(player_id, stat_type, season).with_entities(*stat_columns(stat_model))
+        ]
         
-        # If no stats found and season is specified, try to fetch from MLB API
+        # If no stats found and season is specified, queue a backfill from the MLB API
         if not stats and season:
-            try:
-                MLBAPIService.sync_player_stats(player_id, season, stat_type)
-                # Query again after syncing
-                if stat_type == 'batting':
-                    stats = BattingStats.query.filter_by(player_id=player_id)
-                else:
-                    stats = PitchingStats.query.filter_by(player_id=player_id)
-                if season:
-                    stats = stats.filter_by(season=season)
-                stats = stats.all()
-            except Exception as e:
-                # Log the error but continue with whatever results we have
-                print(f"Error syncing with MLB API: {str(e)}")
+            job = enqueue_sync_job(stat_type, season, player_id=player_id)
+            if job.status in ACTIVE_STATUSES:
+                return pending_response(job, {
+                    'player': player.to_dict(),
+                    'stats': []
+                })
         
         return jsonify({
             'success': True,
             'data': {
                 'player': player.to_dict(),
-                'stats': [stat.to_dict() for stat in stats]
+                'stats': stats
             }
         })
         
@@ -158,6 +252,7 @@ def get_player_stats(player_id):
         }), 500
 
 @bp.route('/players/search', methods=['GET'])
+@cached_response(player_scopes)
 def search_players():
     try:
         query = request.args.get('q', '')
@@ -167,10 +262,14 @@ def search_players():
                 'data': []
             })
         
-        # First search in our database
-        db_players = Player.query.filter(
-            Player.name.ilike(f'%{query}%')
-        ).limit(10).all()
+        # First search our players through the in-memory name index
+        player_ids = search_player_ids(current_app, query, limit=10)
+        players_by_id = {
+            player.id: player
+            for player in Player.query.options(joinedload(Player.team))
+                                      .filter(Player.id.in_(player_ids))
+        }
+        db_players = [players_by_id[i] for i in player_ids if i in players_by_id]
         
         # If we have results, return them
         if db_players:
@@ -182,25 +281,23 @@ def search_players():
         # If no results in database, try MLB API
         try:
             mlb_players = MLBAPIService.search_players(query)
+            team_names = {p.get('currentTeam', {}).get('name') for p in mlb_players}
+            teams = {team.name: team for team in Team.query.filter(Team.name.in_(team_names))}
             players = []
             
             for player_data in mlb_players:
-                # Create player in our database
-                player = Player(
+                # Create (or refresh) the player in our database
+                player = db.session.merge(Player(
                     id=player_data['id'],
                     name=player_data['name'],
-                    team=player_data.get('currentTeam', {}).get('name'),
                     position=player_data.get('primaryPosition', {}).get('abbreviation')
-                )
-                db.session.add(player)
-                players.append({
-                    'id': player.id,
-                    'name': player.name,
-                    'team': player.team,
-                    'position': player.position
-                })
+                ))
+                player.team = teams.get(player_data.get('currentTeam', {}).get('name'))
+                players.append(player.to_dict())
             
-            db.session.commit()
+            if players:
+                db.session.commit()
+                invalidate('players')
             
             return jsonify({
                 'success': True,
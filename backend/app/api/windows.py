@@ -0,0 +1,70 @@
+from flask import Blueprint, jsonify, request
+from app.api.statistics import leaderboard_filters
+from app.services.aggregates import STAT_MODELS
+from app.services.leaderboard import InvalidSort, parse_sort
+from app.services.response_cache import all_season_scopes, cached_response
+from app.services.windows import best_seasons_query, career_totals_query, running_totals_query
+from app.utils.pagination import page_limit
+
+bp = Blueprint('windows', __name__)
+
+def window_filters():
+    """The leaderboard filters, with ?season=N meaning the range N..N"""
+    filters = leaderboard_filters()
+    season = filters.pop('season')
+    if season:
+        filters['season_from'] = filters['season_to'] = season
+    return filters
+
+def ranked_response(stat_type, build, **options):
+    """Run build(stat_type, sort, descending, **filters) and answer with its top rows"""
+    if stat_type not in STAT_MODELS:
+        return jsonify({
+            'success': False,
+            'error': f'Unknown stat type: {stat_type}'
+        }), 400
+
+    try:
+        sort, descending = parse_sort(stat_type, request.args.get('sort'))
+    except InvalidSort as e:
+        return jsonify({
+            'success': False,
+            'error': f'Unknown column: {e}'
+        }), 400
+    if not sort:
+        return jsonify({
+            'success': False,
+            'error': 'sort is required, e.g. sort=-home_runs'
+        }), 400
+
+    limit = page_limit()
+    query = build(stat_type, sort, descending, **options, **window_filters())
+    return jsonify({
+        'success': True,
+        'data': [row._asdict() for row in query.limit(limit)]
+    })
+
+@bp.route('/stats/<stat_type>/career', methods=['GET'])
+@cached_response(all_season_scopes)
+def get_career_totals(stat_type):
+    """Totals per player over ?season_from..season_to, e.g. ?sort=-home_runs"""
+    return ranked_response(stat_type, career_totals_query)
+
+@bp.route('/stats/<stat_type>/running', methods=['GET'])
+@cached_response(all_season_scopes)
+def get_running_totals(stat_type):
+    """Player-seasons with trailing ?window=N-season (default career-to-date) totals"""
+    window = request.args.get('window', type=int)
+    if window is not None and window < 1:
+        return jsonify({
+            'success': False,
+            'error': 'window must be at least 1'
+        }), 400
+    return ranked_response(stat_type, running_totals_query, window=window)
+
+@bp.route('/stats/<stat_type>/best', methods=['GET'])
+@cached_response(all_season_scopes)
+def get_best_seasons(stat_type):
+    """Each player's ?per_player=N (default 1) best seasons by ?sort"""
+    per_player = max(request.args.get('per_player', 1, type=int), 1)
+    return ranked_response(stat_type, best_seasons_query, per_player=per_player)
@@ -0,0 +1,74 @@
+import time
+import click
+from app import db
+from app.services.aggregates import SEASON_MODELS, STAT_MODELS
+from app.services.delta_sync import delta_sync
+from app.services.jobs import run_pending_jobs
+from app.services.response_cache import invalidate_seasons
+from app.services.season_sync import sync_season
+from app.services.season_totals import rebuild_season_totals
+from app.utils.statcast import SEASON_MONTHS, load_statcast_pitches
+
+
+def init_app(app):
+    @app.cli.command('rebuild-season-totals')
+    @click.option('--season', type=int, help='Only rebuild this season.')
+    @click.option('--type', 'stat_type', type=click.Choice(list(STAT_MODELS)),
+                  help='Only rebuild batting or pitching totals.')
+    def rebuild_season_totals_command(season, stat_type):
+        """Recompute the season-totals tables from the per-game stats rows."""
+        for name in [stat_type] if stat_type else STAT_MODELS:
+            count = rebuild_season_totals(name, season=season)
+            db.session.commit()
+            seasons = [season] if season else [
+                value for (value,) in db.session.query(SEASON_MODELS[name].season).distinct()
+            ]
+            invalidate_seasons(seasons)
+            click.echo(f'Rebuilt {count} {name} season rows')
+
+    @app.cli.command('sync-worker')
+    @click.option('--once', is_flag=True, help='Process one batch and exit.')
+    @click.option('--poll-interval', default=2.0, show_default=True,
+                  help='Seconds to wait when the queue is empty.')
+    def sync_worker_command(once, poll_interval):
+        """Run queued MLB API sync jobs."""
+        while True:
+            handled = run_pending_jobs()
+            if handled:
+                click.echo(f'Processed {handled} sync jobs')
+            if once:
+                break
+            if not handled:
+                time.sleep(poll_interval)
+
+    @app.cli.command('sync-season')
+    @click.option('--season', type=int, required=True)
+    @click.option('--type', 'stat_type', type=click.Choice(list(STAT_MODELS)),
+                  help='Only sync batting or pitching game logs.')
+    @click.option('--restart', is_flag=True, help='Ignore the checkpoint of an interrupted run.')
+    def sync_season_command(season, stat_type, restart):
+        """Sync a full season of game logs from the MLB Stats API in bulk."""
+        for name in [stat_type] if stat_type else STAT_MODELS:
+            written = sync_season(season, name, restart=restart)
+            click.echo(f'Synced {written} {name} game rows for {season}')
+
+    @app.cli.command('delta-sync')
+    @click.option('--season', type=int, help='Season to sync; defaults to the current year.')
+    def delta_sync_command(season):
+        """Sync the games finished or corrected since the last run."""
+        counts = delta_sync(season)
+        click.echo(
+            f"Synced {counts['games']} games: {counts['batting']} batting and "
+            f"{counts['pitching']} pitching rows"
+        )
+
+    @app.cli.command('load-pitches')
+    @click.option('--season', type=int, required=True)
+    @click.option('--month', type=click.IntRange(1, 12), help='Only load this month.')
+    def load_pitches_command(season, month):
+        """Load a season of Statcast pitches into the Parquet pitch store."""
+        try:
+            written = load_statcast_pitches(season, [month] if month else SEASON_MONTHS)
+        except RuntimeError as e:
+            raise click.ClickException(str(e))
+        click.echo(f'Stored {written} pitches for {season}')
@@ -10,6 +10,10 @@ class User(db.Model):
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
 class Player(db.Model):
+    __table_args__ = (
+        db.Index('ix_player_team_id', 'team_id'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     team_id = db.Column(db.Integer, db.ForeignKey('team.id'))
@@ -31,6 +35,10 @@ class Player(db.Model):
         }
 
 class Team(db.Model):
+    __table_args__ = (
+        db.Index('ix_team_abbreviation', 'abbreviation'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     abbreviation = db.Column(db.String(3))
@@ -45,6 +53,10 @@ class Team(db.Model):
         }
 
 class Game(db.Model):
+    __table_args__ = (
+        db.Index('ix_game_date', 'date'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     date = db.Column(db.Date, nullable=False)
     home_team_id = db.Column(db.Integer, db.ForeignKey('team.id'))
@@ -65,10 +77,17 @@ class Game(db.Model):
         }
 
 class BattingStats(db.Model):
+    __table_args__ = (
+        db.Index('ix_batting_stats_player_id_season', 'player_id', 'season'),
+        db.Index('uq_batting_stats_player_id_game_id', 'player_id', 'game_id', unique=True),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     player_id = db.Column(db.Integer, db.ForeignKey('player.id'), nullable=False)
     game_id = db.Column(db.Integer, db.ForeignKey('game.id'), nullable=False)
     season = db.Column(db.Integer, nullable=False)
+    # The player's team in this game; home/away and opponent splits need it
+    team_id = db.Column(db.Integer, db.ForeignKey('team.id', name='fk_batting_stats_team_id_team'))
     at_bats = db.Column(db.Integer)
     hits = db.Column(db.Integer)
     runs = db.Column(db.Integer)
@@ -87,6 +106,7 @@ class BattingStats(db.Model):
             'player_id': self.player_id,
             'game_id': self.game_id,
             'season': self.season,
+            'team_id': self.team_id,
             'at_bats': self.at_bats,
             'hits': self.hits,
             'runs': self.runs,
@@ -96,10 +116,16 @@ class BattingStats(db.Model):
         }
 
 class PitchingStats(db.Model):
+    __table_args__ = (
+        db.Index('ix_pitching_stats_player_id_season', 'player_id', 'season'),
+        db.Index('uq_pitching_stats_player_id_game_id', 'player_id', 'game_id', unique=True),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     player_id = db.Column(db.Integer, db.ForeignKey('player.id'), nullable=False)
     game_id = db.Column(db.Integer, db.ForeignKey('game.id'), nullable=False)
     season = db.Column(db.Integer, nullable=False)
+    team_id = db.Column(db.Integer, db.ForeignKey('team.id', name='fk_pitching_stats_team_id_team'))
     innings_pitched = db.Column(db.Float)
     hits_allowed = db.Column(db.Integer)
     runs_allowed = db.Column(db.Integer)
@@ -119,6 +145,7 @@ class PitchingStats(db.Model):
             'player_id': self.player_id,
             'game_id': self.game_id,
             'season': self.season,
+            'team_id': self.team_id,
             'innings_pitched': self.innings_pitched,
             'hits_allowed': self.hits_allowed,
             'runs_allowed': self.runs_allowed,
@@ -126,4 +153,149 @@ class PitchingStats(db.Model):
             'walks': self.walks,
             'strikeouts': self.strikeouts,
             'era': self.era
-        } 
\ No newline at end of file
+        } 
+
+class PlayerSeasonBatting(db.Model):
+    """Season batting totals materialized from the per-game BattingStats rows."""
+    __table_args__ = (
+        db.Index('ix_player_season_batting_season_player_id', 'season', 'player_id'),
+        db.Index('ix_player_season_batting_season_games', 'season', 'games'),
+        db.Index('ix_player_season_batting_season_at_bats', 'season', 'at_bats'),
+        db.Index('ix_player_season_batting_season_hits', 'season', 'hits'),
+        db.Index('ix_player_season_batting_season_home_runs', 'season', 'home_runs'),
+    )
+
+    player_id = db.Column(db.Integer, db.ForeignKey('player.id'), primary_key=True)
+    season = db.Column(db.Integer, primary_key=True)
+    games = db.Column(db.Integer)
+    at_bats = db.Column(db.Integer)
+    hits = db.Column(db.Integer)
+    runs = db.Column(db.Integer)
+    rbis = db.Column(db.Integer)
+    home_runs = db.Column(db.Integer)
+    batting_average = db.Column(db.Float)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class PlayerSeasonPitching(db.Model):
+    """Season pitching totals materialized from the per-game PitchingStats rows."""
+    __table_args__ = (
+        db.Index('ix_player_season_pitching_season_player_id', 'season', 'player_id'),
+        db.Index('ix_player_season_pitching_season_games', 'season', 'games'),
+        db.Index('ix_player_season_pitching_season_innings_pitched', 'season', 'innings_pitched'),
+        db.Index('ix_player_season_pitching_season_strikeouts', 'season', 'strikeouts'),
+    )
+
+    player_id = db.Column(db.Integer, db.ForeignKey('player.id'), primary_key=True)
+    season = db.Column(db.Integer, primary_key=True)
+    games = db.Column(db.Integer)
+    innings_pitched = db.Column(db.Float)
+    hits_allowed = db.Column(db.Integer)
+    runs_allowed = db.Column(db.Integer)
+    earned_runs = db.Column(db.Integer)
+    walks = db.Column(db.Integer)
+    strikeouts = db.Column(db.Integer)
+    era = db.Column(db.Float)
+    strikeouts_per_nine = db.Column(db.Float)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class PlayerSplitBatting(db.Model):
+    """Batting totals per player, season and split (see services/splits.py).
+
+    `split` is 'venue', 'opponent' or 'month'; `value` is 'home'/'away',
+    the opponent's team id or the month number, as text.
+    """
+    __table_args__ = (
+        db.Index('ix_player_split_batting_season_split_value', 'season', 'split', 'value'),
+    )
+
+    player_id = db.Column(db.Integer, db.ForeignKey('player.id'), primary_key=True)
+    season = db.Column(db.Integer, primary_key=True)
+    split = db.Column(db.String(10), primary_key=True)
+    value = db.Column(db.String(10), primary_key=True)
+    games = db.Column(db.Integer)
+    at_bats = db.Column(db.Integer)
+    hits = db.Column(db.Integer)
+    runs = db.Column(db.Integer)
+    rbis = db.Column(db.Integer)
+    home_runs = db.Column(db.Integer)
+    batting_average = db.Column(db.Float)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class PlayerSplitPitching(db.Model):
+    """Pitching totals per player, season and split (see PlayerSplitBatting)."""
+    __table_args__ = (
+        db.Index('ix_player_split_pitching_season_split_value', 'season', 'split', 'value'),
+    )
+
+    player_id = db.Column(db.Integer, db.ForeignKey('player.id'), primary_key=True)
+    season = db.Column(db.Integer, primary_key=True)
+    split = db.Column(db.String(10), primary_key=True)
+    value = db.Column(db.String(10), primary_key=True)
+    games = db.Column(db.Integer)
+    innings_pitched = db.Column(db.Float)
+    hits_allowed = db.Column(db.Integer)
+    runs_allowed = db.Column(db.Integer)
+    earned_runs = db.Column(db.Integer)
+    walks = db.Column(db.Integer)
+    strikeouts = db.Column(db.Integer)
+    era = db.Column(db.Float)
+    strikeouts_per_nine = db.Column(db.Float)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class SyncJob(db.Model):
+    """A queued MLB API backfill for a season: one player, a team roster, or (neither set) the popular players."""
+    __table_args__ = (
+        db.Index('ix_sync_job_status', 'status'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    stat_type = db.Column(db.String(10), nullable=False)
+    season = db.Column(db.Integer, nullable=False)
+    player_id = db.Column(db.Integer)
+    team = db.Column(db.String(10))
+    status = db.Column(db.String(10), nullable=False, default='pending')
+    error = db.Column(db.Text)
+    rows_written = db.Column(db.Integer)  # game lines fetched for the job's players
+    claimed_at = db.Column(db.DateTime)  # when a worker took it; see SYNC_JOB_LEASE
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'stat_type': self.stat_type,
+            'season': self.season,
+            'player_id': self.player_id,
+            'team': self.team,
+            'status': self.status,
+            'error': self.error,
+            'rows_written': self.rows_written
+        }
+
+
+class SyncCheckpoint(db.Model):
+    """Progress of a resumable upstream sync, per source, season and stat type.
+
+    `cursor` is source-specific: the next page offset for a paged season sync.
+    Delta syncs keep watermarks instead: the date of the newest final game
+    stored and the time of the last run (upstream's updatedSince).
+    """
+    __table_args__ = (
+        db.UniqueConstraint('source', 'season', 'stat_type',
+                            name='uq_sync_checkpoint_source_season_stat_type'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    source = db.Column(db.String(32), nullable=False)
+    season = db.Column(db.Integer, nullable=False)
+    stat_type = db.Column(db.String(10), nullable=False)
+    cursor = db.Column(db.String(64))
+    completed = db.Column(db.Boolean, nullable=False, default=False)
+    last_game_date = db.Column(db.Date)
+    last_updated = db.Column(db.DateTime)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
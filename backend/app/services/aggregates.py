@@ -0,0 +1,188 @@
+"""Season aggregation over the per-game BattingStats/PitchingStats rows.
+
+Each stats row is a single game, so season lines are built by grouping on
+player/season in SQL. Counting stats are summed and rate stats are derived
+from those sums. The grouped results are materialized into the
+PlayerSeasonBatting/PlayerSeasonPitching tables (see season_totals.py), and
+leaderboards read from those tables rather than scanning game rows.
+"""
+from sqlalchemy import and_, func, select, tuple_
+from app import db
+from app.models import (
+    Player, Team, BattingStats, PitchingStats,
+    PlayerSeasonBatting, PlayerSeasonPitching
+)
+
+STAT_MODELS = {
+    'batting': BattingStats,
+    'pitching': PitchingStats
+}
+
+SEASON_MODELS = {
+    'batting': PlayerSeasonBatting,
+    'pitching': PlayerSeasonPitching
+}
+
+# Request filters mapped to the season-total column they are compared against
+MINIMUM_FILTERS = {
+    'batting': {
+        'min_games': 'games',
+        'min_at_bats': 'at_bats',
+        'min_hits': 'hits',
+        'min_home_runs': 'home_runs'
+    },
+    'pitching': {
+        'min_games': 'games',
+        'min_innings': 'innings_pitched',
+        'min_strikeouts': 'strikeouts'
+    }
+}
+
+
+def _rate(numerator, denominator, scale=1.0):
+    """numerator * scale / denominator, NULL when the denominator is zero."""
+    return numerator * scale / func.nullif(denominator, 0)
+
+
+# Rate stats as (numerator, denominator, scale) over the counting totals
+RATE_STATS = {
+    'batting': {
+        'batting_average': ('hits', 'at_bats', 1.0)
+    },
+    'pitching': {
+        'era': ('earned_runs', 'innings_pitched', 9.0),
+        'strikeouts_per_nine': ('strikeouts', 'innings_pitched', 9.0)
+    }
+}
+
+
+def with_rates(stat_type, totals):
+    """Add the stat type's rate stats, derived from the counting `totals`."""
+    for name, (numerator, denominator, scale) in RATE_STATS[stat_type].items():
+        totals[name] = _rate(totals[numerator], totals[denominator], scale)
+    return totals
+
+
+def batting_aggregates():
+    return with_rates('batting', {
+        'games': func.count(func.distinct(BattingStats.game_id)),
+        'at_bats': func.sum(BattingStats.at_bats),
+        'hits': func.sum(BattingStats.hits),
+        'runs': func.sum(BattingStats.runs),
+        'rbis': func.sum(BattingStats.rbis),
+        'home_runs': func.sum(BattingStats.home_runs)
+    })
+
+
+def pitching_aggregates():
+    return with_rates('pitching', {
+        'games': func.count(func.distinct(PitchingStats.game_id)),
+        'innings_pitched': func.sum(PitchingStats.innings_pitched),
+        'hits_allowed': func.sum(PitchingStats.hits_allowed),
+        'runs_allowed': func.sum(PitchingStats.runs_allowed),
+        'earned_runs': func.sum(PitchingStats.earned_runs),
+        'walks': func.sum(PitchingStats.walks),
+        'strikeouts': func.sum(PitchingStats.strikeouts)
+    })
+
+
+AGGREGATES = {
+    'batting': batting_aggregates,
+    'pitching': pitching_aggregates
+}
+
+
+def season_aggregate_select(stat_type, *criteria):
+    """SELECT player_id, season and the aggregates from the game rows.
+
+    The column order matches the season-totals table, so the result can be
+    fed straight into an INSERT ... SELECT.
+    """
+    stat_model = STAT_MODELS[stat_type]
+    aggregates = AGGREGATES[stat_type]()
+
+    statement = select(
+        stat_model.player_id,
+        stat_model.season,
+        *(expression.label(name) for name, expression in aggregates.items())
+    )
+    if criteria:
+        statement = statement.where(and_(*criteria))
+    return statement.group_by(stat_model.player_id, stat_model.season)
+
+
+def season_totals_query(stat_type, season=None, team=None, season_from=None, season_to=None,
+                        **minimums):
+    """Build a query returning one row per player/season from the totals table.
+
+    `season_from`/`season_to` bound the seasons inclusively. `minimums`
+    accepts the keys in MINIMUM_FILTERS for the stat type; any other or
+    empty values are ignored.
+    """
+    season_model = SEASON_MODELS[stat_type]
+    total_columns = [
+        getattr(season_model, name) for name in AGGREGATES[stat_type]()
+    ]
+
+    query = db.session.query(
+        season_model.player_id,
+        Player.name,
+        Team.abbreviation.label('team'),
+        Player.position,
+        season_model.season,
+        *total_columns
+    ).join(Player, season_model.player_id == Player.id) \
+     .outerjoin(Team, Player.team_id == Team.id)
+
+    filters = []
+    if season:
+        filters.append(season_model.season == season)
+    if season_from:
+        filters.append(season_model.season >= season_from)
+    if season_to:
+        filters.append(season_model.season <= season_to)
+    if team:
+        filters.append(Team.abbreviation == team)
+    for arg, column in MINIMUM_FILTERS[stat_type].items():
+        if minimums.get(arg):
+            filters.append(getattr(season_model, column) >= minimums[arg])
+
+    if filters:
+        query = query.filter(and_(*filters))
+
+    return query
+
+
+def season_totals_version(stat_type, **filters):
+    """(newest season-line update, newest player update, row count) of the lines in scope.
+
+    Any write to the totals or the players they join changes it, whichever
+    process made it.
+    """
+    season_model = SEASON_MODELS[stat_type]
+    return tuple(season_totals_query(stat_type, **filters).with_entities(
+        func.max(season_model.updated_at),
+        func.max(Player.updated_at),
+        func.count()
+    ).one())
+
+
+def keyset_order(query, stat_type, after=None):
+    """Order season rows by (season, player_id), starting after that key.
+
+    The pair is unique per row, so it is a stable keyset for cursor
+    pagination: a page never repeats or skips rows that existed when the
+    previous page was read.
+    """
+    season_model = SEASON_MODELS[stat_type]
+    if after:
+        query = query.filter(tuple_(season_model.season, season_model.player_id) > tuple(after))
+    return query.order_by(season_model.season, season_model.player_id)
+
+
+def ranked_order(query, stat_type, column, descending=True):
+    """Order season rows by a totals column (NULLs last), ties by season, player_id."""
+    season_model = SEASON_MODELS[stat_type]
+    key = getattr(season_model, column)
+    key = key.desc() if descending else key.asc()
+    return query.order_by(key.nulls_last(), season_model.season, season_model.player_id)
@@ -0,0 +1,235 @@
+"""In-memory columnar snapshot of the season-totals tables.
+
+Each stat type's season lines are held as one NumPy array per column, in
+(season, player_id) order, so leaderboard filters, sorts, top-N and
+percentiles are vectorized operations instead of a database round trip
+plus a dict per row.
+
+The snapshot is loaded at startup and marked stale whenever writers
+invalidate the stats caches (response_cache.stats_invalidated). Reads
+also compare the cache generation tokens the snapshot was built under,
+and, at most every COLUMNAR_VERSION_CHECK_INTERVAL seconds, the version
+of the season-totals tables in the database, so writes made by other
+processes (sync workers, CLI commands) are noticed even when the cache
+is per-process. A stale snapshot is never served: callers fall back to
+SQL while a background thread rebuilds it. NumPy is an optional dependency; without
+it every query takes the SQL path.
+"""
+import logging
+import threading
+import time
+from sqlalchemy import Float, Integer, Numeric
+from sqlalchemy.exc import SQLAlchemyError
+from app.services.aggregates import (
+    MINIMUM_FILTERS, STAT_MODELS, keyset_order, season_totals_query, season_totals_version
+)
+from app.services.response_cache import scope_generations, stats_invalidated
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None
+
+logger = logging.getLogger(__name__)
+
+# Generation scopes whose invalidation makes the snapshot stale
+SNAPSHOT_SCOPES = ('season:all', 'players')
+
+
+def database_changed(loaded, probe, interval):
+    """Whether probe() no longer matches `loaded.version`, asked of the
+    database at most every `interval` seconds per loaded object."""
+    now = time.monotonic()
+    if now - loaded.checked_at < interval:
+        return False
+    loaded.checked_at = now
+    return probe() != loaded.version
+
+
+class SeasonSnapshot:
+    """Column arrays for every season line of one stat type."""
+
+    def __init__(self, stat_type, names, columns, integers, generation, version=None):
+        self.stat_type = stat_type
+        self.names = names
+        self.columns = columns
+        self.integers = integers
+        self.generation = generation
+        self.version = version
+        self.checked_at = time.monotonic()
+        self.size = len(columns['player_id'])
+
+    @classmethod
+    def load(cls, stat_type):
+        # Read the tokens and version first: a write landing mid-load leaves them outdated
+        generation = scope_generations(SNAPSHOT_SCOPES)
+        version = season_totals_version(stat_type)
+        query = keyset_order(season_totals_query(stat_type), stat_type)
+        descriptions = query.column_descriptions
+        rows = query.all()
+
+        names, columns, integers = [], {}, set()
+        for position, description in enumerate(descriptions):
+            name = description['name']
+            values = [row[position] for row in rows]
+            names.append(name)
+            if isinstance(description['type'], (Integer, Float, Numeric)):
+                columns[name] = np.array(
+                    [np.nan if value is None else value for value in values], dtype=np.float64
+                )
+                if isinstance(description['type'], Integer):
+                    integers.add(name)
+            else:
+                columns[name] = np.array(values, dtype=object)
+        return cls(stat_type, names, columns, integers, generation, version)
+
+    def mask(self, season=None, team=None, after=None, season_from=None, season_to=None, **minimums):
+        """Boolean row mask for the leaderboard filters and keyset cursor."""
+        mask = np.ones(self.size, dtype=bool)
+        if season:
+            mask &= self.columns['season'] == season
+        if season_from:
+            mask &= self.columns['season'] >= season_from
+        if season_to:
+            mask &= self.columns['season'] <= season_to
+        if team:
+            mask &= self.columns['team'] == team
+        for arg, column in MINIMUM_FILTERS[self.stat_type].items():
+            if minimums.get(arg):
+                mask &= self.columns[column] >= minimums[arg]
+        if after:
+            seasons, player_ids = self.columns['season'], self.columns['player_id']
+            mask &= (seasons > after[0]) | ((seasons == after[0]) & (player_ids > after[1]))
+        return mask
+
+    def _ranked(self, index, column, descending, limit):
+        """`index` reordered by `column` (NaN last), then season, player_id."""
+        key = self.columns[column][index]
+        if descending:
+            key = -key
+        if limit and limit < len(key):
+            # Only rows tied with or ahead of the limit-th value can make the cut
+            cutoff = np.partition(key, limit - 1)[limit - 1]
+            if not np.isnan(cutoff):
+                keep = key <= cutoff
+                index, key = index[keep], key[keep]
+        order = np.lexsort((
+            self.columns['player_id'][index], self.columns['season'][index], key
+        ))
+        return index[order]
+
+    def select(self, filters, sort=None, descending=True, after=None, limit=None):
+        """Season lines as dicts, like season_totals_query rows."""
+        index = np.flatnonzero(self.mask(after=after, **filters))
+        if sort:
+            index = self._ranked(index, sort, descending, limit)
+        if limit:
+            index = index[:limit]
+        return self.rows(index)
+
+    def rows(self, index):
+        """Dicts for the rows at `index`, built column by column; NaN becomes None."""
+        values = []
+        for name in self.names:
+            column = self.columns[name][index].tolist()
+            if name in self.integers:
+                column = [None if value != value else int(value) for value in column]
+            elif self.columns[name].dtype != object:
+                column = [None if value != value else value for value in column]
+            values.append(column)
+        return [dict(zip(self.names, row)) for row in zip(*values)]
+
+    def percentiles(self, column, quantiles, filters):
+        values = self.columns[column][self.mask(**filters)]
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return {q: None for q in quantiles}
+        return dict(zip(quantiles, np.percentile(values, quantiles).tolist()))
+
+
+class ColumnarStore:
+    """Per-app registry of snapshots, kept in app.extensions['columnar']."""
+
+    def __init__(self, app):
+        self.app = app
+        self.snapshots = {}
+        self._stale = set(STAT_MODELS)
+        self._refresh_lock = threading.Lock()
+        stats_invalidated.connect(self.mark_stale, sender=app)
+
+    @property
+    def enabled(self):
+        return np is not None and self.app.config['COLUMNAR_SNAPSHOT']
+
+    def mark_stale(self, sender, scopes=()):
+        if not any(scope in SNAPSHOT_SCOPES for scope in scopes):
+            return
+        self._stale.update(STAT_MODELS)
+        if self.enabled and self.app.config['COLUMNAR_BACKGROUND_REFRESH']:
+            self.schedule_refresh()
+
+    def refresh(self):
+        """Rebuild every snapshot; call inside an app context."""
+        self._stale.clear()
+        for stat_type in STAT_MODELS:
+            self.snapshots[stat_type] = SeasonSnapshot.load(stat_type)
+
+    def load(self):
+        """refresh() in a fresh app context, leaving the snapshots stale on failure."""
+        try:
+            with self.app.app_context():
+                self.refresh()
+            return True
+        except SQLAlchemyError:
+            self._stale.update(STAT_MODELS)
+            logger.warning('Columnar snapshot refresh failed', exc_info=True)
+            return False
+
+    def _refresh_in_background(self):
+        try:
+            self.load()
+        finally:
+            self._refresh_lock.release()
+
+    def schedule_refresh(self):
+        if not self.app.config['COLUMNAR_BACKGROUND_REFRESH']:
+            with self._refresh_lock:
+                self.refresh()
+        elif self._refresh_lock.acquire(blocking=False):
+            threading.Thread(target=self._refresh_in_background, daemon=True).start()
+
+    def _is_fresh(self, stat_type):
+        snapshot = self.snapshots.get(stat_type)
+        if snapshot is None or stat_type in self._stale:
+            return False
+        if snapshot.generation != scope_generations(SNAPSHOT_SCOPES):
+            return False
+        if database_changed(
+            snapshot, lambda: season_totals_version(stat_type),
+            self.app.config['COLUMNAR_VERSION_CHECK_INTERVAL']
+        ):
+            # Written by another process; rebuild rather than re-probe
+            self._stale.add(stat_type)
+            return False
+        return True
+
+    def fresh(self, stat_type):
+        """The stat type's snapshot if it reflects the latest writes, else None."""
+        if not self.enabled:
+            return None
+        if not self._is_fresh(stat_type):
+            self.schedule_refresh()
+            if not self._is_fresh(stat_type):
+                return None
+        return self.snapshots[stat_type]
+
+
+def fresh_snapshot(app, stat_type):
+    return app.extensions['columnar'].fresh(stat_type)
+
+
+def init_app(app):
+    store = app.extensions['columnar'] = ColumnarStore(app)
+    # Warm the snapshot at startup; before migrations have run this just logs
+    if store.enabled:
+        store.load()
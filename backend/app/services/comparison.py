@@ -0,0 +1,41 @@
+"""Side-by-side season lines for several players.
+
+compare_players answers with a fixed number of queries however many
+players are compared: one for the players and one IN-list query over the
+season-totals table for all of their season lines.
+"""
+from itertools import groupby
+from app import db
+from app.models import Player, Team
+from app.services.aggregates import SEASON_MODELS, season_totals_query
+
+
+def player_rows(player_ids):
+    """{id: player dict} (as Player.to_dict() has it) for the players that exist."""
+    query = db.session.query(
+        Player.id, Player.name, Team.abbreviation.label('team'), Player.position
+    ).outerjoin(Team, Player.team_id == Team.id).filter(Player.id.in_(player_ids))
+    return {row.id: row._asdict() for row in query}
+
+
+def season_lines(stat_type, player_ids, season_from=None, season_to=None):
+    """{player_id: [season line, ...]} oldest season first."""
+    season_model = SEASON_MODELS[stat_type]
+    query = season_totals_query(stat_type, season_from=season_from, season_to=season_to) \
+        .filter(season_model.player_id.in_(player_ids))
+    rows = query.order_by(season_model.player_id, season_model.season)
+    return {
+        player_id: [row._asdict() for row in lines]
+        for player_id, lines in groupby(rows, key=lambda row: row.player_id)
+    }
+
+
+def compare_players(stat_type, player_ids, season_from=None, season_to=None):
+    """Players in request order with their season lines, and the unknown IDs."""
+    players = player_rows(player_ids)
+    lines = season_lines(stat_type, list(players), season_from, season_to) if players else {}
+    compared = [
+        {'player': players[player_id], 'seasons': lines.get(player_id, [])}
+        for player_id in player_ids if player_id in players
+    ]
+    return compared, [player_id for player_id in player_ids if player_id not in players]
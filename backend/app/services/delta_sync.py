@@ -0,0 +1,102 @@
+"""Daily delta sync of new and corrected games from the MLB Stats API.
+
+A full season sync (season_sync) re-reads every game log. delta_sync
+instead keeps two watermarks on a SyncCheckpoint: the date of the newest
+final game stored and the time of the last run. Each run fetches the
+schedule from the date watermark onward (inclusive, so games that were
+not final yet last time are picked up) plus the games upstream reports
+changed since the last run (game/changes?updatedSince), which catches
+scoring corrections to older games. Only final games are read, one
+boxscore each, and their per-game rows are upserted on (player_id,
+game_id). Season totals are refreshed only for the player-seasons those
+rows touch.
+"""
+from datetime import date, datetime
+from app.services.ingest import bulk_upsert_game_stats
+from app.services.mlb_api import MLBAPIService
+from app.services.response_cache import invalidate
+from app.services.season_sync import STAT_FIELDS, checkpoint_for, game_record, store_references
+from app import db
+
+SOURCE = 'daily_games'
+WATERMARK_STAT_TYPE = 'all'
+
+# Games before this day of the season are spring training
+SEASON_START = (3, 1)
+
+
+def final_games(games, season):
+    """Final regular-season games of `season`, keyed by gamePk."""
+    return {
+        game['gamePk']: game for game in games
+        if game.get('status', {}).get('abstractGameState') == 'Final'
+        and game.get('gameType', 'R') == 'R'
+        and str(game.get('season', season)) == str(season)
+    }
+
+
+def boxscore_splits(game, boxscore):
+    """Game-log-shaped splits (see season_sync.game_record) per stat type."""
+    splits = {stat_type: [] for stat_type in STAT_FIELDS}
+    teams = boxscore.get('teams', {})
+    for side, other in (('home', 'away'), ('away', 'home')):
+        team, opponent = teams.get(side, {}), teams.get(other, {})
+        for player in team.get('players', {}).values():
+            for stat_type in STAT_FIELDS:
+                stat = player.get('stats', {}).get(stat_type)
+                if not stat:
+                    continue
+                splits[stat_type].append({
+                    'date': game['officialDate'],
+                    'isHome': side == 'home',
+                    'team': team.get('team'),
+                    'opponent': opponent.get('team'),
+                    'player': player['person'],
+                    'position': player.get('position', {}),
+                    'game': {'gamePk': game['gamePk']},
+                    'stat': stat
+                })
+    return splits
+
+
+def delta_sync(season=None, today=None):
+    """Sync the games finished or changed since the last run.
+
+    Returns the number of games read and of batting and pitching rows written.
+    """
+    today = today or date.today()
+    season = season or today.year
+    checkpoint = checkpoint_for(SOURCE, season, WATERMARK_STAT_TYPE)
+    started = datetime.utcnow()
+
+    start = checkpoint.last_game_date or date(season, *SEASON_START)
+    end = min(today, date(season, 12, 31))
+    games = MLBAPIService.get_schedule(start, end) if start <= end else []
+    if checkpoint.last_updated:
+        games += MLBAPIService.get_game_changes(checkpoint.last_updated)
+    games = final_games(games, season)
+    boxscores = MLBAPIService.get_boxscores(games)
+
+    counts = {'games': len(games)}
+    new_players = 0
+    for stat_type in STAT_FIELDS:
+        splits = [
+            split for game_pk, game in games.items()
+            for split in boxscore_splits(game, boxscores[game_pk])[stat_type]
+        ]
+        team_ids = {}
+        if splits:
+            added, team_ids = store_references(splits)
+            new_players += added
+        counts[stat_type] = bulk_upsert_game_stats(
+            stat_type, (game_record(stat_type, season, split, team_ids) for split in splits)
+        )
+
+    if games:
+        newest = max(date.fromisoformat(game['officialDate']) for game in games.values())
+        checkpoint.last_game_date = max(newest, checkpoint.last_game_date or newest)
+    checkpoint.last_updated = started
+    db.session.commit()
+    if new_players:
+        invalidate('players')
+    return counts
@@ -0,0 +1,164 @@
+"""Streaming exports of season totals and per-game logs.
+
+Rows come off a server-side cursor (yield_per) and are encoded one fetched
+batch at a time: CSV lines, or one Parquet/Arrow IPC record batch. Neither
+the rows nor the encoded file are ever held in memory whole.
+Parquet/Arrow need pyarrow, which is an optional dependency.
+"""
+import csv
+import io
+from sqlalchemy import Date, DateTime, Float, Integer, String, and_
+from app import db
+from app.models import Player, Team, Game
+from app.services.aggregates import STAT_MODELS
+from app.services.ingest import STAT_COLUMNS
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - exercised only without pyarrow
+    pa = pq = None
+
+EXPORT_FORMATS = {
+    'csv': ('text/csv', 'csv'),
+    'parquet': ('application/vnd.apache.parquet', 'parquet'),
+    'arrow': ('application/vnd.apache.arrow.stream', 'arrows')
+}
+
+
+class ExportUnavailable(RuntimeError):
+    pass
+
+
+def game_log_query(stat_type, season=None, team=None, start_date=None, end_date=None,
+                   season_from=None, season_to=None):
+    """One row per player per game, with the game date and the player's team in that game."""
+    stat_model = STAT_MODELS[stat_type]
+    query = db.session.query(
+        stat_model.player_id,
+        Player.name,
+        Team.abbreviation.label('team'),
+        stat_model.season,
+        stat_model.game_id,
+        Game.date,
+        *(getattr(stat_model, column) for column in STAT_COLUMNS[stat_type])
+    ).join(Player, stat_model.player_id == Player.id) \
+     .join(Game, stat_model.game_id == Game.id) \
+     .outerjoin(Team, stat_model.team_id == Team.id)
+
+    filters = []
+    if season:
+        filters.append(stat_model.season == season)
+    if season_from:
+        filters.append(stat_model.season >= season_from)
+    if season_to:
+        filters.append(stat_model.season <= season_to)
+    if team:
+        filters.append(Team.abbreviation == team)
+    if start_date:
+        filters.append(Game.date >= start_date)
+    if end_date:
+        filters.append(Game.date <= end_date)
+    if filters:
+        query = query.filter(and_(*filters))
+
+    return query.order_by(stat_model.season, Game.date, stat_model.player_id)
+
+
+def _arrow_type(sql_type):
+    if isinstance(sql_type, Integer):
+        return pa.int64()
+    if isinstance(sql_type, Float):
+        return pa.float64()
+    if isinstance(sql_type, DateTime):
+        return pa.timestamp('us')
+    if isinstance(sql_type, Date):
+        return pa.date32()
+    if isinstance(sql_type, String):
+        return pa.string()
+    return pa.float64()
+
+
+def _arrow_schema(query):
+    return pa.schema([
+        (column['name'], _arrow_type(column['type']))
+        for column in query.column_descriptions
+    ])
+
+
+def _batches(query, batch_size):
+    """Yield lists of row tuples, `batch_size` rows at a time."""
+    batch = []
+    for row in query.yield_per(batch_size):
+        batch.append(row)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def write_csv(query, batch_size):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(column['name'] for column in query.column_descriptions)
+    for batch in _batches(query, batch_size):
+        writer.writerows(batch)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+class _DrainableSink(io.RawIOBase):
+    """Write-only byte sink whose contents are handed out and dropped per batch."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def write_arrow(query, batch_size, file_format):
+    if pa is None:
+        raise ExportUnavailable(f'{file_format} export requires pyarrow')
+
+    schema = _arrow_schema(query)
+    sink = _DrainableSink()
+    if file_format == 'parquet':
+        writer = pq.ParquetWriter(sink, schema)
+    else:
+        writer = pa.ipc.new_stream(sink, schema)
+
+    def generate():
+        for batch in _batches(query, batch_size):
+            columns = list(zip(*batch))
+            writer.write_batch(pa.record_batch(
+                [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+                schema=schema
+            ))
+            data = sink.drain()
+            if data:
+                yield data
+        writer.close()
+        yield sink.drain()
+
+    return generate()
+
+
+def export_rows(query, file_format, batch_size):
+    """Generator of encoded chunks for `query` in the requested format."""
+    if file_format == 'csv':
+        return write_csv(query, batch_size)
+    return write_arrow(query, batch_size, file_format)
@@ -0,0 +1,196 @@
+"""In-memory, date-sorted game logs for rolling splits.
+
+A GameLog holds one season's per-game lines of one stat type as NumPy
+arrays sorted by (player_id, date), with a running (cumulative) sum per
+stat. The total over any run of a player's games is then the difference
+of two cumulative sums, and the run's boundaries are found by
+binary-searching a combined (player_id, day) key, so a rolling window
+for every game, or a last-N-days total for every player, is a handful of
+vectorized operations.
+
+Logs are loaded on first use and dropped when writers invalidate their
+season (response_cache.stats_invalidated), when that season's generation
+token moves under a shared cache, or when the season's rows in the
+database change under another process's writes (checked at most every
+COLUMNAR_VERSION_CHECK_INTERVAL seconds). Like the columnar snapshot
+they need numpy and COLUMNAR_SNAPSHOT; otherwise rolling.py answers from
+SQL.
+"""
+import threading
+import time
+from sqlalchemy import func
+from app import db
+from app.models import Game
+from app.services.aggregates import RATE_STATS, STAT_MODELS
+from app.services.columnar import database_changed
+from app.services.response_cache import scope_generations, stats_invalidated
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None
+
+# Bits of the (player_id, day) key holding the day; date ordinals are < 2**20
+DAY_BITS = 20
+
+
+def game_columns(stat_type):
+    """The per-game counting columns summed in rolling windows."""
+    stat_model = STAT_MODELS[stat_type]
+    return [
+        column.name for column in stat_model.__table__.c
+        if column.name not in (
+            'id', 'player_id', 'game_id', 'season', 'team_id', 'created_at', 'updated_at'
+        )
+        and column.name not in RATE_STATS[stat_type]
+    ]
+
+
+def game_log_query(stat_type, season, player_id=None):
+    """(player_id, game_id, date, stats...) rows in (player_id, date, game_id) order."""
+    stat_model = STAT_MODELS[stat_type]
+    query = db.session.query(
+        stat_model.player_id,
+        stat_model.game_id,
+        Game.date,
+        *[getattr(stat_model, name) for name in game_columns(stat_type)]
+    ).join(Game, stat_model.game_id == Game.id).filter(stat_model.season == season)
+    if player_id is not None:
+        query = query.filter(stat_model.player_id == player_id)
+    return query.order_by(stat_model.player_id, Game.date, stat_model.game_id)
+
+
+def game_log_version(stat_type, season):
+    """Latest update times and row count of a season's game lines."""
+    stat_model = STAT_MODELS[stat_type]
+    return tuple(db.session.query(
+        func.max(stat_model.updated_at), func.max(Game.updated_at), func.count()
+    ).join(Game, stat_model.game_id == Game.id).filter(stat_model.season == season).one())
+
+
+def with_rate_arrays(stat_type, totals):
+    """Add the rate stats to summed `totals` arrays; zero denominators give NaN."""
+    for name, (numerator, denominator, scale) in RATE_STATS[stat_type].items():
+        with np.errstate(divide='ignore', invalid='ignore'):
+            totals[name] = np.where(
+                totals[denominator] > 0, totals[numerator] * scale / totals[denominator], np.nan
+            )
+    return totals
+
+
+class GameLog:
+    def __init__(self, stat_type, season, rows, generation, version=None):
+        self.stat_type = stat_type
+        self.season = season
+        self.generation = generation
+        self.version = version
+        self.checked_at = time.monotonic()
+        self.names = game_columns(stat_type)
+
+        self.player_ids = np.array([row[0] for row in rows], dtype=np.int64)
+        self.game_ids = np.array([row[1] for row in rows], dtype=np.int64)
+        self.days = np.array([row[2].toordinal() for row in rows], dtype=np.int64)
+        self.keys = (self.player_ids << DAY_BITS) | self.days
+        self.players = np.unique(self.player_ids)
+
+        # cumulative[name][i] is the sum of the first i rows and counted[name][i]
+        # how many of them were not None; a run with none recorded sums to NaN,
+        # as SUM() over only NULLs is NULL
+        self.cumulative = {'games': np.arange(len(rows) + 1, dtype=np.float64)}
+        self.counted = {}
+        for position, name in enumerate(self.names, start=3):
+            values = np.array([row[position] for row in rows], dtype=np.float64)
+            recorded = ~np.isnan(values)
+            summed = np.cumsum(np.where(recorded, values, 0))
+            self.cumulative[name] = np.concatenate(([0.0], summed))
+            self.counted[name] = np.concatenate(([0], np.cumsum(recorded)))
+
+    @classmethod
+    def load(cls, stat_type, season):
+        # Read the token and version first: a write landing mid-load leaves them outdated
+        generation = scope_generations((f'season:{season}',))
+        version = game_log_version(stat_type, season)
+        return cls(stat_type, season, game_log_query(stat_type, season).all(), generation, version)
+
+    def totals(self, starts, ends):
+        """{stat: array} summed over rows [starts, ends), rates included."""
+        totals = {
+            name: cumulative[ends] - cumulative[starts]
+            for name, cumulative in self.cumulative.items()
+        }
+        for name, counted in self.counted.items():
+            totals[name][counted[ends] == counted[starts]] = np.nan
+        return with_rate_arrays(self.stat_type, totals)
+
+    def last_days(self, as_of, days):
+        """(player_ids, totals) over each player's games in the `days` days ending `as_of`."""
+        first = as_of.toordinal() - days + 1
+        base = self.players << DAY_BITS
+        starts = np.searchsorted(self.keys, base | first, side='left')
+        ends = np.searchsorted(self.keys, base | as_of.toordinal(), side='right')
+        played = ends > starts
+        return self.players[played], self.totals(starts[played], ends[played])
+
+    def rolling(self, player_id, window, unit='days'):
+        """(row index, totals) for each of a player's games over the trailing window."""
+        lower, upper = np.searchsorted(
+            self.keys, [player_id << DAY_BITS, (player_id + 1) << DAY_BITS], side='left'
+        )
+        index = np.arange(lower, upper)
+        if unit == 'games':
+            starts = np.maximum(index - window + 1, lower)
+        else:
+            # Clamped so a window reaching past the day bits stays within the player
+            starts = np.maximum(
+                np.searchsorted(self.keys, self.keys[index] - window + 1, side='left'), lower
+            )
+        return index, self.totals(starts, index + 1)
+
+
+class GameLogStore:
+    """Per-app cache of GameLogs by (stat_type, season), in app.extensions['game_logs']."""
+
+    def __init__(self, app):
+        self.app = app
+        self.logs = {}
+        self._lock = threading.Lock()
+        stats_invalidated.connect(self.mark_stale, sender=app)
+
+    @property
+    def enabled(self):
+        return np is not None and self.app.config['COLUMNAR_SNAPSHOT']
+
+    def mark_stale(self, sender, scopes=()):
+        seasons = {scope.split(':')[1] for scope in scopes if scope.startswith('season:')}
+        if seasons - {'all'}:
+            self.logs = {key: log for key, log in self.logs.items() if str(key[1]) not in seasons}
+        elif seasons:
+            self.logs = {}
+
+    def _is_fresh(self, log):
+        if log is None or log.generation != scope_generations((f'season:{log.season}',)):
+            return False
+        return not database_changed(
+            log, lambda: game_log_version(log.stat_type, log.season),
+            self.app.config['COLUMNAR_VERSION_CHECK_INTERVAL']
+        )
+
+    def get(self, stat_type, season):
+        """The season's log, loaded first if missing or outdated; None when disabled."""
+        if not self.enabled:
+            return None
+        outdated = self.logs.get((stat_type, season))
+        if self._is_fresh(outdated):
+            return outdated
+        with self._lock:
+            log = self.logs.get((stat_type, season))
+            if log is None or log is outdated:  # not reloaded by another thread meanwhile
+                log = self.logs[(stat_type, season)] = GameLog.load(stat_type, season)
+        return log
+
+def game_log(app, stat_type, season):
+    return app.extensions['game_logs'].get(stat_type, season)
+
+
+def init_app(app):
+    app.extensions['game_logs'] = GameLogStore(app)
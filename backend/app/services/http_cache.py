@@ -0,0 +1,276 @@
+"""On-disk cache of raw upstream (MLB Stats API, Statcast) responses.
+
+Bodies are stored zlib-compressed in a SQLite file (UPSTREAM_CACHE_PATH),
+keyed by a SHA-256 of the request URL and its sorted query parameters, so
+the same request always maps to the same entry across processes and runs.
+Payloads for a past season (from a season, endDate or end_date parameter)
+never expire, since finished seasons do not change; everything else
+expires after UPSTREAM_CACHE_TTL seconds. Once the file holds more than
+UPSTREAM_CACHE_MAX_BYTES of compressed bodies, the least recently read
+entries are evicted. Streamed responses (Statcast CSV) are stored as a
+sequence of compressed chunk rows while the caller reads them, and read
+back and decompressed a chunk at a time, so a season-long body is never
+held in memory whole.
+
+With UPSTREAM_CACHE_OFFLINE set, requests are answered only from the
+cache, expired entries included, and a miss raises OfflineCacheMiss
+instead of touching the network, so backfills can be replayed offline.
+"""
+import hashlib
+import itertools
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from datetime import date
+from urllib.parse import urlencode
+from uuid import uuid4
+import requests
+from flask import current_app
+
+SEASON_PARAM = re.compile(r'(?:season|endDate|end_date)=(\d{4})')
+
+# Compressed bytes per chunk row of a streamed response
+STORE_CHUNK_BYTES = 1024 * 1024
+
+# A response row with this body keeps its body in chunk rows instead
+CHUNKED = b''
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS response (
+    key TEXT PRIMARY KEY,
+    content_type TEXT,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    expires_at REAL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_response_accessed_at ON response (accessed_at);
+CREATE TABLE IF NOT EXISTS chunk (
+    key TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    data BLOB NOT NULL,
+    PRIMARY KEY (key, seq)
+);
+"""
+
+
+class OfflineCacheMiss(requests.exceptions.ConnectionError):
+    """A request missed the cache while UPSTREAM_CACHE_OFFLINE is set."""
+
+
+def canonical_request(url, params=None):
+    """The URL with its query parameters sorted, as used for the cache key."""
+    items = sorted((str(key), str(value)) for key, value in (params or {}).items())
+    return f'{url}?{urlencode(items)}' if items else url
+
+
+def cache_key(request):
+    return hashlib.sha256(request.encode()).hexdigest()
+
+
+def inflate(pieces, chunk_size):
+    """Decompress a zlib stream split over `pieces`, at most chunk_size bytes at a time."""
+    inflater = zlib.decompressobj()
+    for piece in pieces:
+        while piece:
+            chunk = inflater.decompress(piece, chunk_size)
+            piece = inflater.unconsumed_tail
+            if chunk:
+                yield chunk
+    if not inflater.eof:
+        # The entry was evicted or replaced while it was being read
+        raise zlib.error('Incomplete cached response')
+    tail = inflater.flush()
+    if tail:
+        yield tail
+
+
+def request_season(params):
+    """The newest season the query parameters name (hydrate strings included), or None."""
+    text = ' '.join(f'{key}={value}' for key, value in (params or {}).items())
+    seasons = [int(year) for year in SEASON_PARAM.findall(text)]
+    return max(seasons) if seasons else None
+
+
+class ResponseCache:
+    def __init__(self, path, max_bytes, ttl, offline=False):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.offline = offline
+        self.counts = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0}
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.executescript(SCHEMA)
+
+    def expires_at(self, params, now):
+        season = request_season(params)
+        if season is not None and season < date.today().year:
+            return None
+        return now + self.ttl
+
+    def _lookup(self, key):
+        """(content_type, body) of a fresh entry, counting the hit or miss, or None."""
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                'SELECT content_type, body, expires_at FROM response WHERE key = ?', (key,)
+            ).fetchone()
+            fresh = row is not None and (self.offline or row[2] is None or row[2] > now)
+            self.counts['hits' if fresh else 'misses'] += 1
+            if not fresh:
+                return None
+            self._db.execute('UPDATE response SET accessed_at = ? WHERE key = ?', (now, key))
+        return row[0], row[1]
+
+    def _pieces(self, key, body):
+        """The compressed body of an entry, chunk row by chunk row."""
+        if body != CHUNKED:
+            yield body
+            return
+        for seq in itertools.count():
+            with self._lock:
+                row = self._db.execute(
+                    'SELECT data FROM chunk WHERE key = ? AND seq = ?', (key, seq)
+                ).fetchone()
+            if row is None:
+                return
+            yield row[0]
+
+    def get(self, request):
+        """(content_type, body) of a cached response, or None."""
+        key = cache_key(request)
+        cached = self._lookup(key)
+        if cached is None:
+            return None
+        content_type, body = cached
+        if body != CHUNKED:
+            return content_type, zlib.decompress(body)
+        return content_type, b''.join(inflate(self._pieces(key, body), STORE_CHUNK_BYTES))
+
+    def put(self, request, params, content_type, compressed):
+        """Store an already zlib-compressed body, evicting the least recently read."""
+        self._store(cache_key(request), params, content_type, compressed, len(compressed))
+
+    def _store(self, key, params, content_type, body, size, staged=None):
+        """Replace the entry for `key`; a CHUNKED body takes the chunk rows
+        written under the `staged` key."""
+        now = time.time()
+        with self._lock:
+            self._db.execute('BEGIN IMMEDIATE')
+            try:
+                self._db.execute('DELETE FROM chunk WHERE key = ?', (key,))
+                if staged:
+                    self._db.execute('UPDATE chunk SET key = ? WHERE key = ?', (key, staged))
+                self._db.execute(
+                    'INSERT OR REPLACE INTO response VALUES (?, ?, ?, ?, ?, ?)',
+                    (key, content_type, body, size, self.expires_at(params, now), now)
+                )
+                total = self._db.execute(
+                    'SELECT COALESCE(SUM(size), 0) FROM response'
+                ).fetchone()[0]
+                if total > self.max_bytes:
+                    self._evict(total - self.max_bytes)
+                self._db.execute('COMMIT')
+            except BaseException:
+                self._db.execute('ROLLBACK')
+                raise
+            self.counts['stores'] += 1
+
+    def _evict(self, excess):
+        evicted = []
+        for key, size in self._db.execute('SELECT key, size FROM response ORDER BY accessed_at'):
+            if excess <= 0:
+                break
+            evicted.append((key,))
+            excess -= size
+        self._db.executemany('DELETE FROM response WHERE key = ?', evicted)
+        self._db.executemany('DELETE FROM chunk WHERE key = ?', evicted)
+        self.counts['evictions'] += len(evicted)
+
+    def stats(self):
+        with self._lock:
+            entries, size = self._db.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM response'
+            ).fetchone()
+            return {**self.counts, 'entries': entries, 'bytes': size, 'offline': self.offline}
+
+    def _miss(self, request):
+        if self.offline:
+            raise OfflineCacheMiss(f'Not in the offline cache: {request}')
+
+    def get_json_body(self, url, params, fetch):
+        """The body of GET url?params; fetch() -> requests.Response on a miss."""
+        request = canonical_request(url, params)
+        cached = self.get(request)
+        if cached is not None:
+            return cached[1]
+        self._miss(request)
+        response = fetch()
+        content_type = response.headers.get('Content-Type')
+        self.put(request, params, content_type, zlib.compress(response.content))
+        return response.content
+
+    def stream(self, url, params, open_response, chunk_size):
+        """(content_type, encoding, byte chunks) of GET url?params.
+
+        On a miss the body is compressed into chunk rows as the caller reads
+        it; the entry becomes visible once fully read.
+        """
+        request = canonical_request(url, params)
+        key = cache_key(request)
+        cached = self._lookup(key)
+        if cached is not None:
+            content_type, body = cached
+            return content_type, None, inflate(self._pieces(key, body), chunk_size)
+        self._miss(request)
+        response = open_response()
+        content_type = response.headers.get('Content-Type')
+
+        def record():
+            # Chunks go under a key of this attempt's own, so concurrent misses
+            # on one URL don't collide, and only a complete body replaces the entry
+            staged = f'{key}.{uuid4().hex}'
+            compressor, pending, seq, size = zlib.compressobj(), bytearray(), 0, 0
+
+            def write(data):
+                nonlocal seq, size
+                with self._lock:
+                    self._db.execute('INSERT INTO chunk VALUES (?, ?, ?)', (staged, seq, data))
+                seq, size = seq + 1, size + len(data)
+
+            try:
+                with response:
+                    for chunk in response.iter_content(chunk_size=chunk_size):
+                        pending += compressor.compress(chunk)
+                        if len(pending) >= STORE_CHUNK_BYTES:
+                            write(bytes(pending))
+                            pending.clear()
+                        yield chunk
+                write(bytes(pending + compressor.flush()))
+                self._store(key, params, content_type, CHUNKED, size, staged)
+            except BaseException:
+                # Abandoned or failed: drop the chunks, which no entry accounts for
+                with self._lock:
+                    self._db.execute('DELETE FROM chunk WHERE key = ?', (staged,))
+                raise
+
+        return content_type, response.encoding, record()
+
+
+def response_cache(app=None):
+    """The app's cache, or None when UPSTREAM_CACHE_PATH is unset."""
+    return (app or current_app).extensions.get('http_cache')
+
+
+def init_app(app):
+    path = app.config['UPSTREAM_CACHE_PATH']
+    if path:
+        app.extensions['http_cache'] = ResponseCache(
+            path,
+            max_bytes=app.config['UPSTREAM_CACHE_MAX_BYTES'],
+            ttl=app.config['UPSTREAM_CACHE_TTL'],
+            offline=app.config['UPSTREAM_CACHE_OFFLINE']
+        )
@@ -0,0 +1,85 @@
+"""Pooled HTTP client for upstream APIs.
+
+One requests.Session per client keeps connections alive across calls, the
+mounted adapter retries connection errors and 429/5xx responses with
+exponential backoff, and a token bucket caps the request rate across all
+threads sharing the client. A client given an http_cache.ResponseCache
+answers get_json from it when it can.
+"""
+import json
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class TokenBucket:
+    """Allows `rate` acquisitions per second with bursts of up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: int = None):
+        self.rate = rate
+        self.capacity = capacity or max(1, int(rate))
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class PooledClient:
+    def __init__(self, timeout: float = 10, max_retries: int = 3, backoff_factor: float = 0.5,
+                 pool_size: int = 10, rate_limit: float = None, cache=None):
+        self.timeout = timeout
+        self.cache = cache
+        self.limiter = TokenBucket(rate_limit) if rate_limit else None
+
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset(['GET']),
+            respect_retry_after_header=True
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+        self.session = requests.Session()
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    @classmethod
+    def from_config(cls, config, prefix: str, cache=None) -> 'PooledClient':
+        """Build a client from <prefix>_TIMEOUT, <prefix>_MAX_RETRIES, ... settings."""
+        return cls(
+            timeout=config[f'{prefix}_TIMEOUT'],
+            max_retries=config[f'{prefix}_MAX_RETRIES'],
+            backoff_factor=config[f'{prefix}_BACKOFF_FACTOR'],
+            pool_size=config[f'{prefix}_POOL_SIZE'],
+            rate_limit=config[f'{prefix}_RATE_LIMIT'],
+            cache=cache
+        )
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        if self.limiter:
+            self.limiter.acquire()
+        kwargs.setdefault('timeout', self.timeout)
+        response = self.session.get(url, **kwargs)
+        response.raise_for_status()
+        return response
+
+    def get_json(self, url: str, params=None):
+        if self.cache is None:
+            return self.get(url, params=params).json()
+        return json.loads(self.cache.get_json_body(url, params, lambda: self.get(url, params=params)))
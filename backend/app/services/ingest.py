@@ -0,0 +1,141 @@
+"""Batched upsert of per-game stats rows.
+
+Records are consumed lazily in chunks of INGEST_CHUNK_SIZE. Each chunk is
+written as one multi-row INSERT ... ON CONFLICT (player_id, game_id) DO
+UPDATE (staged through COPY on PostgreSQL), the affected season totals are
+refreshed and the chunk is committed, so memory and transaction size stay
+bounded however many records are fed in.
+"""
+import csv
+import io
+from datetime import datetime
+from itertools import islice
+from flask import current_app
+from sqlalchemy import func, insert, text
+from sqlalchemy.dialects import postgresql, sqlite
+from app import db
+from app.services.aggregates import STAT_MODELS
+from app.services.response_cache import invalidate_seasons
+from app.services.season_totals import player_seasons, refresh_season_totals
+
+KEY_COLUMNS = ['player_id', 'game_id', 'season']
+
+STAT_COLUMNS = {
+    'batting': [
+        'at_bats', 'hits', 'runs', 'rbis', 'home_runs', 'batting_average'
+    ],
+    'pitching': [
+        'innings_pitched', 'hits_allowed', 'runs_allowed', 'earned_runs',
+        'walks', 'strikeouts', 'era'
+    ]
+}
+
+CONFLICT_COLUMNS = ['player_id', 'game_id']
+
+# Optional; an upsert without it keeps the team already stored
+TEAM_COLUMN = 'team_id'
+
+
+def game_columns(stat_type):
+    return KEY_COLUMNS + [TEAM_COLUMN] + STAT_COLUMNS[stat_type] + ['updated_at']
+
+
+def _game_row(stat_type, item, now):
+    row = {column: item[column] for column in KEY_COLUMNS}
+    row[TEAM_COLUMN] = item.get(TEAM_COLUMN)
+    row.update({column: item.get(column) for column in STAT_COLUMNS[stat_type]})
+    row['updated_at'] = now
+    return row
+
+
+def _upsert_statement(stat_type, dialect_name):
+    table = STAT_MODELS[stat_type].__table__
+    dialect_insert = postgresql.insert if dialect_name == 'postgresql' else sqlite.insert
+    statement = dialect_insert(table)
+    updates = {
+        column: statement.excluded[column]
+        for column in game_columns(stat_type)
+        if column not in CONFLICT_COLUMNS
+    }
+    updates[TEAM_COLUMN] = func.coalesce(statement.excluded[TEAM_COLUMN], table.c[TEAM_COLUMN])
+    return statement.on_conflict_do_update(index_elements=CONFLICT_COLUMNS, set_=updates)
+
+
+def _write_executemany(stat_type, rows, dialect_name):
+    if dialect_name in ('postgresql', 'sqlite'):
+        statement = _upsert_statement(stat_type, dialect_name)
+    else:
+        # No portable upsert; plain inserts still batch, conflicts will raise
+        statement = insert(STAT_MODELS[stat_type].__table__)
+    db.session.execute(statement, rows)
+
+
+def _write_copy(stat_type, rows):
+    """COPY the chunk into a temp table, then upsert from it in one statement."""
+    table = STAT_MODELS[stat_type].__tablename__
+    columns = game_columns(stat_type)
+    column_list = ', '.join(columns)
+    updates = ', '.join(
+        f'{column} = COALESCE(EXCLUDED.{column}, {table}.{column})' if column == TEAM_COLUMN
+        else f'{column} = EXCLUDED.{column}'
+        for column in columns if column not in CONFLICT_COLUMNS
+    )
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow(['' if row[column] is None else row[column] for column in columns])
+    buffer.seek(0)
+
+    db.session.execute(text(
+        f'CREATE TEMP TABLE IF NOT EXISTS {table}_stage ON COMMIT DELETE ROWS '
+        f'AS SELECT {column_list} FROM {table} WITH NO DATA'
+    ))
+    cursor = db.session.connection().connection.cursor()
+    cursor.copy_expert(
+        f"COPY {table}_stage ({column_list}) FROM STDIN WITH (FORMAT csv, NULL '')",
+        buffer
+    )
+    db.session.execute(text(
+        f'INSERT INTO {table} ({column_list}, created_at) '
+        f'SELECT {column_list}, now() FROM {table}_stage '
+        f'ON CONFLICT ({", ".join(CONFLICT_COLUMNS)}) DO UPDATE SET {updates}'
+    ))
+
+
+def bulk_upsert_game_stats(stat_type, records, chunk_size=None, refresh_totals=True):
+    """Upsert per-game stats records keyed on (player_id, game_id).
+
+    `records` may be any iterable of dicts with the KEY_COLUMNS plus the
+    stat columns for `stat_type` (and optionally team_id); it is only read
+    one chunk at a time. Pass refresh_totals=False for backfills that
+    rebuild the season totals afterwards. Returns the number of records
+    written.
+    """
+    chunk_size = chunk_size or current_app.config['INGEST_CHUNK_SIZE']
+    dialect_name = db.engine.dialect.name
+    records = iter(records)
+    written = 0
+
+    while True:
+        now = datetime.utcnow()
+        rows = [_game_row(stat_type, item, now) for item in islice(records, chunk_size)]
+        if not rows:
+            break
+
+        try:
+            if dialect_name == 'postgresql':
+                _write_copy(stat_type, rows)
+            else:
+                _write_executemany(stat_type, rows, dialect_name)
+            if refresh_totals:
+                refresh_season_totals(stat_type, player_seasons(rows))
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        invalidate_seasons(row['season'] for row in rows)
+
+        written += len(rows)
+
+    return written
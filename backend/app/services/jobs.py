@@ -0,0 +1,152 @@
+"""Background MLB API backfills, queued in the sync_job table.
+
+Request handlers call enqueue_sync_job on a cache miss and answer right
+away with the job ID. A worker (`flask sync-worker`) claims pending jobs,
+groups them by season and stat type, and syncs each group with batched
+upstream calls instead of one call per request.
+
+A job ends 'done', 'empty' (upstream had no game lines for its players,
+e.g. a call-up without a season yet) or 'failed'. A done or empty job
+answers for its player and season for SYNC_JOB_RETRY_AFTER seconds, so
+repeated cache misses are not queued again. A running job whose worker
+has not finished it within SYNC_JOB_LEASE seconds is claimed again.
+"""
+from collections import defaultdict
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import and_, insert, or_
+from app import db
+from app.models import SyncJob
+from app.services.mlb_api import MLBAPIService
+from app.services.season_sync import sync_players
+
+ACTIVE_STATUSES = ('pending', 'running')
+FINISHED_STATUSES = ('done', 'empty')
+
+# Synced by leaderboard jobs that name neither a player nor a team
+POPULAR_PLAYER_IDS = [
+    545361,  # Mike Trout
+    660271,  # Shohei Ohtani
+    592450   # Aaron Judge
+]
+
+
+def reusable_jobs():
+    """Criterion for jobs a new request can share: active, or recently finished."""
+    finished_after = datetime.utcnow() - timedelta(
+        seconds=current_app.config['SYNC_JOB_RETRY_AFTER']
+    )
+    return or_(
+        SyncJob.status.in_(ACTIVE_STATUSES),
+        and_(SyncJob.status.in_(FINISHED_STATUSES), SyncJob.updated_at >= finished_after)
+    )
+
+
+def enqueue_sync_job(stat_type, season, player_id=None, team=None):
+    """Queue a sync, reusing an identical job that is still pending or running
+    or that finished recently (check job.status before reporting it pending)."""
+    job = SyncJob.query.filter(
+        SyncJob.stat_type == stat_type,
+        SyncJob.season == season,
+        SyncJob.player_id == player_id,
+        SyncJob.team == team,
+        reusable_jobs()
+    ).order_by(SyncJob.id.desc()).first()
+    if job:
+        return job
+
+    job = SyncJob(stat_type=stat_type, season=season, player_id=player_id, team=team)
+    db.session.add(job)
+    db.session.commit()
+    return job
+
+
+def enqueue_sync_jobs(stat_type, pairs):
+    """Queue player syncs for (player_id, season) pairs in one round trip.
+
+    Pairs that already have a pending or running job, or one that finished
+    recently, reuse it (check job.status before reporting it pending). The
+    worker syncs all of a season's players with one batched upstream fetch.
+    """
+    pairs = set(pairs)
+    if not pairs:
+        return []
+    reusable = SyncJob.query.filter(
+        SyncJob.stat_type == stat_type,
+        SyncJob.player_id.in_({player_id for player_id, _ in pairs}),
+        SyncJob.season.in_({season for _, season in pairs}),
+        SyncJob.team.is_(None),
+        reusable_jobs()
+    ).order_by(SyncJob.id).all()
+    # One job per pair; the newest wins
+    jobs = list({
+        (job.player_id, job.season): job for job in reusable if (job.player_id, job.season) in pairs
+    }.values())
+    queued = pairs - {(job.player_id, job.season) for job in jobs}
+    if queued:
+        jobs += db.session.scalars(insert(SyncJob).returning(SyncJob), [
+            {'stat_type': stat_type, 'season': season, 'player_id': player_id, 'status': 'pending'}
+            for player_id, season in sorted(queued)
+        ]).all()
+        db.session.commit()
+    return jobs
+
+
+def claim_jobs(limit=500):
+    """Mark up to `limit` pending jobs, or running jobs whose lease ran out,
+    as running and return them."""
+    now = datetime.utcnow()
+    expired = now - timedelta(seconds=current_app.config['SYNC_JOB_LEASE'])
+    jobs = SyncJob.query.filter(or_(
+        SyncJob.status == 'pending',
+        and_(SyncJob.status == 'running', SyncJob.claimed_at < expired)
+    )) \
+        .order_by(SyncJob.id) \
+        .limit(limit) \
+        .with_for_update(skip_locked=True) \
+        .all()
+    for job in jobs:
+        job.status = 'running'
+        job.claimed_at = now
+    db.session.commit()
+    return jobs
+
+
+def _player_ids(job):
+    if job.player_id:
+        return {job.player_id}
+    if job.team:
+        # Note: This is a simplified version. In a real implementation,
+        # you would need to map team names to MLB team IDs
+        roster = MLBAPIService.get_team_roster(job.team)
+        return {player['person']['id'] for player in roster}
+    return set(POPULAR_PLAYER_IDS)
+
+
+def run_pending_jobs(limit=500):
+    """Process one batch of pending jobs. Returns the number of jobs handled."""
+    jobs = claim_jobs(limit)
+
+    groups = defaultdict(list)
+    for job in jobs:
+        groups[(job.season, job.stat_type)].append(job)
+
+    for (season, stat_type), group in groups.items():
+        try:
+            players = {job.id: _player_ids(job) for job in group}
+            lines = sync_players(set().union(*players.values()), season, stat_type)
+            error = None
+        except Exception as e:
+            db.session.rollback()
+            error = str(e)
+
+        for job in group:
+            job.error = error
+            if error:
+                job.status = 'failed'
+            else:
+                job.rows_written = sum(lines[player_id] for player_id in players[job.id])
+                job.status = 'done' if job.rows_written else 'empty'
+        db.session.commit()
+
+    return len(jobs)
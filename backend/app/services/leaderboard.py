@@ -0,0 +1,66 @@
+"""Leaderboard reads: filtered, optionally ranked season lines and percentiles.
+
+Each read is answered from the columnar snapshot when it is fresh and from
+the season-totals tables otherwise; both paths return the same rows in the
+same order.
+"""
+import math
+from flask import current_app
+from app.services.aggregates import (
+    AGGREGATES, SEASON_MODELS, keyset_order, ranked_order, season_totals_query
+)
+from app.services.columnar import fresh_snapshot
+
+
+class InvalidSort(ValueError):
+    pass
+
+
+def parse_sort(stat_type, sort):
+    """'home_runs' -> ('home_runs', False); a leading '-' sorts descending."""
+    if not sort:
+        return None, True
+    column = sort.lstrip('-')
+    if column not in AGGREGATES[stat_type]():
+        raise InvalidSort(sort)
+    return column, sort.startswith('-')
+
+
+def leaderboard_rows(stat_type, filters, sort=None, descending=True, after=None, limit=None):
+    """Season lines as dicts, ranked by `sort` or else in keyset order after `after`."""
+    snapshot = fresh_snapshot(current_app, stat_type)
+    if snapshot is not None:
+        return snapshot.select(filters, sort, descending, after, limit)
+
+    query = season_totals_query(stat_type, **filters)
+    if sort:
+        query = ranked_order(query, stat_type, sort, descending)
+    else:
+        query = keyset_order(query, stat_type, after)
+    if limit:
+        query = query.limit(limit)
+    return [row._asdict() for row in query]
+
+
+def _percentile(ordered, q):
+    """Linear interpolation between closest ranks, as numpy.percentile does."""
+    position = (len(ordered) - 1) * q / 100
+    lower = math.floor(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return float(ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower))
+
+
+def leaderboard_percentiles(stat_type, column, quantiles, filters):
+    """{q: value of `column` at the q-th percentile} over the filtered lines."""
+    if column not in AGGREGATES[stat_type]():
+        raise InvalidSort(column)
+    snapshot = fresh_snapshot(current_app, stat_type)
+    if snapshot is not None:
+        return snapshot.percentiles(column, quantiles, filters)
+
+    key = getattr(SEASON_MODELS[stat_type], column)
+    ordered = [
+        value for (value,) in season_totals_query(stat_type, **filters)
+        .with_entities(key).filter(key.isnot(None)).order_by(key)
+    ]
+    return {q: _percentile(ordered, q) if ordered else None for q in quantiles}
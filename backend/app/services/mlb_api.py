@@ -1,23 +1,48 @@
-import requests
-from datetime import datetime
-from typing import Dict, List, Optional
-from app import db
-from app.models import Player, BattingStats, PitchingStats
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional
+from flask import current_app
+from app.services.http_cache import response_cache
+from app.services.http_client import PooledClient
+from app.services.upstream import coalesced, is_known_empty, lookup, remember_empty
+
+
+def has_stats(data: Dict) -> bool:
+    """Whether a stats/people response entry carries any stat splits"""
+    return any(group.get('splits') for group in data.get('stats', []))
+
 
 class MLBAPIService:
     BASE_URL = "https://statsapi.mlb.com/api/v1"
     
+    @staticmethod
+    def _client() -> PooledClient:
+        """The app's shared pooled client, created on first use"""
+        extensions = current_app.extensions
+        if 'mlb_api_client' not in extensions:
+            extensions['mlb_api_client'] = PooledClient.from_config(
+                current_app.config, 'MLB_API', cache=response_cache()
+            )
+        return extensions['mlb_api_client']
+    
     @staticmethod
     def _make_request(endpoint: str, params: Optional[Dict] = None) -> Dict:
         """Make a request to the MLB API"""
         url = f"{MLBAPIService.BASE_URL}/{endpoint}"
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        return response.json()
+        return MLBAPIService._client().get_json(url, params=params)
     
     @staticmethod
     def get_player_stats(player_id: int, season: int, stat_type: str) -> Dict:
         """Fetch player statistics from MLB API"""
+        return lookup(
+            ('stats', player_id, season, stat_type),
+            lambda: MLBAPIService._fetch_player_stats(player_id, season, stat_type),
+            is_empty=lambda response: not has_stats(response),
+            empty={'stats': []}
+        )
+    
+    @staticmethod
+    def _fetch_player_stats(player_id: int, season: int, stat_type: str) -> Dict:
         if stat_type == 'batting':
             endpoint = f"stats"
             params = {
@@ -47,94 +72,127 @@ class MLBAPIService:
             'query': query,
             'type': 'player'
         }
-        response = MLBAPIService._make_request(endpoint, params)
-        return response.get('searchResults', [])
+        return lookup(
+            ('search', ' '.join(query.lower().split())),
+            lambda: MLBAPIService._make_request(endpoint, params).get('searchResults', []),
+            is_empty=lambda results: not results,
+            empty=[]
+        )
     
     @staticmethod
     def get_team_roster(team_id: int) -> List[Dict]:
         """Get team roster"""
         endpoint = f"teams/{team_id}/roster"
-        response = MLBAPIService._make_request(endpoint)
-        return response.get('roster', [])
+        return lookup(
+            ('roster', team_id),
+            lambda: MLBAPIService._make_request(endpoint).get('roster', []),
+            is_empty=lambda roster: not roster,
+            empty=[]
+        )
+    
+    @staticmethod
+    def _map_parallel(fetch, items: List) -> List:
+        """fetch(item) for every item on a bounded thread pool, each in an app context"""
+        if not items:
+            return []
+        app = current_app._get_current_object()
+        
+        def run(item):
+            with app.app_context():
+                return fetch(item)
+        
+        workers = min(app.config['MLB_API_MAX_WORKERS'], len(items))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(run, items))
+    
+    @staticmethod
+    def get_schedule(start_date: date, end_date: date) -> List[Dict]:
+        """Regular-season games scheduled between two dates, inclusive"""
+        response = MLBAPIService._make_request('schedule', {
+            'sportId': 1,
+            'gameType': 'R',
+            'startDate': start_date.isoformat(),
+            'endDate': end_date.isoformat()
+        })
+        return [game for day in response.get('dates', []) for game in day.get('games', [])]
     
     @staticmethod
-    def sync_player_stats(player_id: int, season: int, stat_type: str) -> None:
-        """Sync player statistics from MLB API to local database"""
-        try:
-            # Get player from database or create new one
-            player = Player.query.get(player_id)
-            if not player:
-                return
-            
-            # Fetch stats from MLB API
-            stats_data = MLBAPIService.get_player_stats(player_id, season, stat_type)
-            
-            if not stats_data.get('stats'):
-                return
-            
-            stats = stats_data['stats'][0].get('splits', [])
-            if not stats:
-                return
-            
-            stat_data = stats[0]
-            
-            if stat_type == 'batting':
-                # Create or update batting stats
-                batting_stats = BattingStats.query.filter_by(
-                    player_id=player_id,
-                    season=season
-                ).first()
-                
-                if not batting_stats:
-                    batting_stats = BattingStats(player_id=player_id, season=season)
-                
-                # Update batting stats
-                batting_stats.games = stat_data.get('stat', {}).get('gamesPlayed', 0)
-                batting_stats.at_bats = stat_data.get('stat', {}).get('atBats', 0)
-                batting_stats.hits = stat_data.get('stat', {}).get('hits', 0)
-                batting_stats.runs = stat_data.get('stat', {}).get('runs', 0)
-                batting_stats.rbis = stat_data.get('stat', {}).get('rbi', 0)
-                batting_stats.home_runs = stat_data.get('stat', {}).get('homeRuns', 0)
-                batting_stats.batting_average = stat_data.get('stat', {}).get('avg', 0)
-                
-                # Advanced stats (if available)
-                if 'exitVelocity' in stat_data.get('stat', {}):
-                    batting_stats.exit_velocity = stat_data['stat']['exitVelocity']
-                if 'launchAngle' in stat_data.get('stat', {}):
-                    batting_stats.launch_angle = stat_data['stat']['launchAngle']
-                
-                db.session.add(batting_stats)
-                
-            else:  # pitching
-                # Create or update pitching stats
-                pitching_stats = PitchingStats.query.filter_by(
-                    player_id=player_id,
-                    season=season
-                ).first()
-                
-                if not pitching_stats:
-                    pitching_stats = PitchingStats(player_id=player_id, season=season)
-                
-                # Update pitching stats
-                pitching_stats.games = stat_data.get('stat', {}).get('gamesPlayed', 0)
-                pitching_stats.innings_pitched = stat_data.get('stat', {}).get('inningsPitched', 0)
-                pitching_stats.hits_allowed = stat_data.get('stat', {}).get('hits', 0)
-                pitching_stats.runs_allowed = stat_data.get('stat', {}).get('runs', 0)
-                pitching_stats.earned_runs = stat_data.get('stat', {}).get('earnedRuns', 0)
-                pitching_stats.walks = stat_data.get('stat', {}).get('baseOnBalls', 0)
-                pitching_stats.strikeouts = stat_data.get('stat', {}).get('strikeOuts', 0)
-                pitching_stats.era = stat_data.get('stat', {}).get('era', 0)
-                
-                # Advanced stats (if available)
-                if 'velocity' in stat_data.get('stat', {}):
-                    pitching_stats.velocity = stat_data['stat']['velocity']
-                if 'spinRate' in stat_data.get('stat', {}):
-                    pitching_stats.spin_rate = stat_data['stat']['spinRate']
-                
-                db.session.add(pitching_stats)
-            
-            db.session.commit()
-            
-        except Exception as e:
-            db.session.rollback()
-            raise e 
\ No newline at end of file
+    def get_game_changes(updated_since: datetime) -> List[Dict]:
+        """Games whose data changed upstream since a UTC timestamp"""
+        response = MLBAPIService._make_request('game/changes', {
+            'sportId': 1,
+            'updatedSince': updated_since.strftime('%Y-%m-%dT%H:%M:%SZ')
+        })
+        return [game for day in response.get('dates', []) for game in day.get('games', [])]
+    
+    @staticmethod
+    def get_boxscores(game_pks: Iterable[int]) -> Dict[int, Dict]:
+        """Boxscores keyed by gamePk, fetched concurrently"""
+        game_pks = list(dict.fromkeys(game_pks))
+        responses = MLBAPIService._map_parallel(
+            lambda game_pk: coalesced(
+                ('boxscore', game_pk),
+                lambda: MLBAPIService._make_request(f'game/{game_pk}/boxscore')
+            ),
+            game_pks
+        )
+        return dict(zip(game_pks, responses))
+    
+    @staticmethod
+    def get_season_game_logs(season: int, stat_type: str, offset: int, limit: int) -> List[Dict]:
+        """One page of every player's game-log splits for a season, league-wide"""
+        response = MLBAPIService._make_request('stats', {
+            'stats': 'gameLog',
+            'group': 'hitting' if stat_type == 'batting' else 'pitching',
+            'playerPool': 'All',
+            'sportId': 1,
+            'season': season,
+            'offset': offset,
+            'limit': limit
+        })
+        stats = response.get('stats', [])
+        return stats[0].get('splits', []) if stats else []
+    
+    @staticmethod
+    def get_players_stats(player_ids: Iterable[int], season: int, stat_type: str,
+                          stats_type: str = 'season') -> Dict[int, Dict]:
+        """Fetch several players' fullName and statistics, keyed by player ID
+        
+        `stats_type` is the upstream stats type: 'season' totals or 'gameLog' splits.
+        Players are requested MLB_API_BATCH_SIZE at a time through the people
+        endpoint, and the batches run concurrently on a bounded thread pool.
+        Players known to have no stats for the season are skipped, and
+        players that come back without stats are remembered as such.
+        """
+        group = 'hitting' if stat_type == 'batting' else 'pitching'
+        player_ids = [
+            player_id for player_id in dict.fromkeys(player_ids)
+            if not is_known_empty(('stats', player_id, season, stat_type))
+        ]
+        if not player_ids:
+            return {}
+        
+        batch_size = current_app.config['MLB_API_BATCH_SIZE']
+        batches = [player_ids[i:i + batch_size] for i in range(0, len(player_ids), batch_size)]
+        
+        def fetch(batch):
+            params = {
+                'personIds': ','.join(str(player_id) for player_id in batch),
+                'hydrate': f'stats(group=[{group}],type=[{stats_type}],season={season})'
+            }
+            return coalesced(
+                ('people', params['personIds'], season, stat_type, stats_type),
+                lambda: MLBAPIService._make_request('people', params)
+            )
+        
+        stats = {}
+        for response in MLBAPIService._map_parallel(fetch, batches):
+            for person in response.get('people', []):
+                stats[person['id']] = {
+                    'fullName': person.get('fullName'), 'stats': person.get('stats', [])
+                }
+        
+        for player_id in player_ids:
+            if not has_stats(stats.get(player_id, {})):
+                remember_empty(('stats', player_id, season, stat_type))
+        return stats
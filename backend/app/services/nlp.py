@@ -0,0 +1,210 @@
+"""Rule-based parsing of leaderboard questions into QueryPlans.
+
+    "top 10 batting averages in 2023 with at least 300 at bats"
+    -> batting, 2023-2023, min_at_bats=300, sort -batting_average, limit 10
+
+Questions are lower-cased and whitespace-collapsed before parsing, and
+the text -> plan mapping is cached, so a repeated question skips parsing
+entirely and a paraphrase that normalizes to the same plan reuses the
+compiled statement (see query_plan.py).
+"""
+import re
+from datetime import date
+from functools import lru_cache
+from app.services.aggregates import MINIMUM_FILTERS
+from app.services.query_plan import QueryPlan
+
+
+class QueryNotUnderstood(ValueError):
+    pass
+
+
+# Phrase -> season-total column for each stat type it applies to
+STAT_PHRASES = {
+    r'batting averages?|averages?|avg|ba': {'batting': 'batting_average'},
+    r'home runs?|homers?|hrs?': {'batting': 'home_runs'},
+    r'rbis?|runs batted in': {'batting': 'rbis'},
+    r'at[ -]bats?|abs?': {'batting': 'at_bats'},
+    r'hits allowed': {'pitching': 'hits_allowed'},
+    r'hits': {'batting': 'hits', 'pitching': 'hits_allowed'},
+    r'runs allowed': {'pitching': 'runs_allowed'},
+    r'runs': {'batting': 'runs', 'pitching': 'runs_allowed'},
+    r'games|appearances': {'batting': 'games', 'pitching': 'games'},
+    r'era|earned run average': {'pitching': 'era'},
+    r'earned runs': {'pitching': 'earned_runs'},
+    r'strikeouts per nine|strikeouts per 9|k/9|k per 9': {'pitching': 'strikeouts_per_nine'},
+    r'strikeouts?|ks|k': {'pitching': 'strikeouts'},
+    r'innings pitched|innings|ip': {'pitching': 'innings_pitched'},
+    r'walks|bb': {'pitching': 'walks'},
+}
+
+_PHRASE_PATTERN = re.compile(r'\b(' + '|'.join(sorted(
+    (alternative for phrases in STAT_PHRASES for alternative in phrases.split('|')),
+    key=len, reverse=True
+)) + r')(?![\w/])')
+
+
+def _phrase_columns(phrase):
+    return next(
+        columns for pattern, columns in STAT_PHRASES.items()
+        if re.fullmatch(pattern, phrase)
+    )
+
+STAT_TYPE_WORDS = {
+    'pitching': re.compile(r'\bpitch(?:ers?|ing)\b|\bstarters?\b|\brelievers?\b'),
+    'batting': re.compile(r'\bbatt(?:ers?|ing)\b|\bhitt(?:ers?|ing)\b|\bsluggers?\b')
+}
+
+# Columns where a smaller value ranks higher ("best ERA" means lowest)
+LOWER_IS_BETTER = {'era', 'earned_runs', 'hits_allowed', 'runs_allowed', 'walks'}
+
+ASCENDING_WORDS = re.compile(r'\b(?:lowest|fewest|(?<!at )least|smallest)\b')
+DESCENDING_WORDS = re.compile(r'\b(?:highest|most|largest)\b')
+WORST_WORDS = re.compile(r'\b(?:worst|bottom)\b')
+LIMIT_PATTERN = re.compile(
+    r'\b(?:top|bottom|first|best|worst)\s+(\d{1,3})\b'
+    r'|(?<![/\w])(\d{1,3})\s+(?:players|hitters|batters|pitchers|seasons|leaders)\b'
+)
+
+_MINIMUM_BEFORE = re.compile(
+    r'(?:(at least|minimum of|minimum|min\.?|more than|over)\s+(\d+(?:\.\d+)?)'
+    r'|(\d+(?:\.\d+)?)\s*\+|(\d+(?:\.\d+)?)\s+or more)\s*$'
+)
+
+YEAR = r'(1[89]\d\d|20\d\d)'
+SEASON_RANGE = re.compile(
+    rf'(?:from|between)?\s*\b{YEAR}\s*(?:-|–|to|through|and)\s*{YEAR}\b'
+)
+SEASONS_SINCE = re.compile(rf'\bsince\s+{YEAR}\b')
+LAST_N_SEASONS = re.compile(r'\b(?:last|past|over(?: the)?(?: last| past)?)\s+(\d+)\s+(?:seasons|years)\b')
+SINGLE_YEAR = re.compile(rf'\b{YEAR}\b')
+
+# MLB Stats API abbreviations by club nickname
+TEAM_NICKNAMES = {
+    'diamondbacks': 'AZ', 'braves': 'ATL', 'orioles': 'BAL', 'red sox': 'BOS',
+    'cubs': 'CHC', 'white sox': 'CWS', 'reds': 'CIN', 'guardians': 'CLE',
+    'rockies': 'COL', 'tigers': 'DET', 'astros': 'HOU', 'royals': 'KC',
+    'angels': 'LAA', 'dodgers': 'LAD', 'marlins': 'MIA', 'brewers': 'MIL',
+    'twins': 'MIN', 'mets': 'NYM', 'yankees': 'NYY', 'athletics': 'OAK',
+    'phillies': 'PHI', 'pirates': 'PIT', 'padres': 'SD', 'giants': 'SF',
+    'mariners': 'SEA', 'cardinals': 'STL', 'rays': 'TB', 'rangers': 'TEX',
+    'blue jays': 'TOR', 'nationals': 'WSH'
+}
+TEAM_PATTERN = re.compile(r'\b(' + '|'.join(TEAM_NICKNAMES) + r')\b')
+TEAM_ABBREVIATION = re.compile(r'\b(?:for|on|with)\s+(?:the\s+)?([a-z]{2,3})\b')
+
+
+def normalize_text(text):
+    return ' '.join(text.lower().split())
+
+
+def _seasons(text, current_year):
+    match = SEASON_RANGE.search(text)
+    if match:
+        first, last = sorted(int(year) for year in match.groups())
+        return first, last
+    match = SEASONS_SINCE.search(text)
+    if match:
+        return int(match.group(1)), current_year
+    match = LAST_N_SEASONS.search(text)
+    if match:
+        return current_year - int(match.group(1)) + 1, current_year
+    if re.search(r'\b(?:this|current) (?:season|year)\b', text):
+        return current_year, current_year
+    if re.search(r'\blast (?:season|year)\b', text):
+        return current_year - 1, current_year - 1
+    years = [int(year) for year in SINGLE_YEAR.findall(text)]
+    if years:
+        return min(years), max(years)
+    return None, None
+
+
+def _team(text):
+    match = TEAM_PATTERN.search(text)
+    if match:
+        return TEAM_NICKNAMES[match.group(1)]
+    abbreviations = set(TEAM_NICKNAMES.values())
+    for candidate in TEAM_ABBREVIATION.findall(text):
+        if candidate.upper() in abbreviations:
+            return candidate.upper()
+    return None
+
+
+def _stat_type(text, mentions):
+    for stat_type, pattern in STAT_TYPE_WORDS.items():
+        if pattern.search(text):
+            return stat_type
+    for columns in mentions:
+        if len(columns) == 1:
+            return next(iter(columns))
+    return 'batting'
+
+
+def _descending(text, sort):
+    """'lowest'/'highest' are literal; 'best' (the default) and 'worst' depend on the stat."""
+    if ASCENDING_WORDS.search(text):
+        return False
+    if DESCENDING_WORDS.search(text):
+        return True
+    return (sort in LOWER_IS_BETTER) == bool(WORST_WORDS.search(text))
+
+
+def _minimum(text, start, column):
+    """The minimum stated just before the phrase at `start` ("at least 300"), or None."""
+    match = _MINIMUM_BEFORE.search(text[:start])
+    if not match:
+        return None
+    value = float(next(group for group in match.groups()[1:] if group))
+    strict = match.group(1) in ('more than', 'over')
+    if column != 'innings_pitched':
+        value = int(value) + (1 if strict else 0)
+    return value
+
+
+def parse_query(text, default_limit, max_limit, current_year=None):
+    """QueryPlan for a question; raises QueryNotUnderstood."""
+    return _parse(normalize_text(text), default_limit, max_limit, current_year or date.today().year)
+
+
+@lru_cache(maxsize=1024)
+def _parse(text, default_limit, max_limit, current_year):
+    matches = list(_PHRASE_PATTERN.finditer(text))
+    stat_type = _stat_type(text, [_phrase_columns(m.group(1)) for m in matches])
+    minimum_args = {column: arg for arg, column in MINIMUM_FILTERS[stat_type].items()}
+
+    minimums, sort = {}, None
+    for match in matches:
+        column = _phrase_columns(match.group(1)).get(stat_type)
+        if column is None:
+            raise QueryNotUnderstood(f'"{match.group(1)}" is not a {stat_type} stat')
+        value = _minimum(text, match.start(), column)
+        if value is not None:
+            if column not in minimum_args:
+                raise QueryNotUnderstood(f'Cannot filter on a minimum of {column}')
+            minimums[minimum_args[column]] = value
+        elif sort is None:
+            sort = column
+
+    season_from, season_to = _seasons(text, current_year)
+    team = _team(text)
+    if not (matches or season_from or team or any(p.search(text) for p in STAT_TYPE_WORDS.values())):
+        raise QueryNotUnderstood('No stat, season or team found in the question')
+
+    descending = True
+    if sort:
+        descending = _descending(text, sort)
+
+    limit = default_limit
+    match = LIMIT_PATTERN.search(text)
+    if match:
+        limit = int(match.group(1) or match.group(2))
+    return QueryPlan(
+        stat_type=stat_type,
+        season_from=season_from,
+        season_to=season_to,
+        team=team,
+        minimums=tuple(sorted(minimums.items())),
+        sort=sort,
+        descending=descending,
+        limit=max(1, min(limit, max_limit))
+    )
@@ -0,0 +1,221 @@
+"""Columnar Parquet store of pitch-level Statcast events.
+
+A season holds several hundred thousand pitches, far more than the
+per-game BattingStats/PitchingStats rows, so pitch and batted-ball events
+are kept out of the SQL database in Parquet files under
+STATCAST_STORE_PATH, partitioned Hive-style by season and month
+(season=2024/month=6/...). Writing a load replaces the season/month
+partitions it contains, so a month is always (re)loaded whole. A load is
+written to a staging directory first and its partitions are moved into
+place only once it has been written completely, so a failed load leaves
+the previous data intact.
+
+Reads push the season, month and pitch-type predicates down: whole
+partitions are skipped by path, and Parquet row-group statistics skip the
+rest. Only the two columns an aggregate needs are read, through
+memory-mapped files. Averages are computed per file as partial sums and
+counts and merged, which lets STATCAST_STORE_WORKERS > 1 spread the files
+of a scan over a process pool. The pool is started once per store, with
+spawned rather than forked workers, since scans run in threaded request
+handlers.
+"""
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice, repeat
+from flask import current_app
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+    from pyarrow import fs
+except ImportError:  # pragma: no cover - exercised only without pyarrow
+    pa = None
+
+# Metric -> the player it is grouped by: batted-ball metrics by batter,
+# pitch metrics by pitcher
+METRICS = {
+    'exit_velocity': 'batter_id',
+    'launch_angle': 'batter_id',
+    'velocity': 'pitcher_id',
+    'spin_rate': 'pitcher_id'
+}
+
+# Events per record batch handed to the Parquet writer, and per row group
+WRITE_BATCH_ROWS = 64 * 1024
+
+
+def pitch_schema():
+    return pa.schema([
+        ('season', pa.int16()),
+        ('month', pa.int8()),
+        ('game_id', pa.int64()),
+        ('game_date', pa.date32()),
+        ('pitcher_id', pa.int32()),
+        ('batter_id', pa.int32()),
+        ('pitch_type', pa.string()),
+        ('events', pa.string()),
+        ('velocity', pa.float32()),
+        ('spin_rate', pa.float32()),
+        ('exit_velocity', pa.float32()),
+        ('launch_angle', pa.float32())
+    ])
+
+
+def _partitioning():
+    return ds.partitioning(
+        pa.schema([('season', pa.int16()), ('month', pa.int8())]), flavor='hive'
+    )
+
+
+def _filesystem():
+    return fs.LocalFileSystem(use_mmap=True)
+
+
+def _row_filter(metric, pitch_type=None):
+    """Predicate on the columns stored in the files (not the partition keys)."""
+    expression = pc.field(metric).is_valid()
+    if pitch_type:
+        expression &= pc.field('pitch_type') == pitch_type
+    return expression
+
+
+def _partials(path, metric, row_filter):
+    """(player, sum, count) of `metric` in one Parquet file; runs in pool workers."""
+    group = METRICS[metric]
+    table = ds.dataset(path, format='parquet', filesystem=_filesystem()).to_table(
+        columns=[group, metric], filter=row_filter
+    )
+    return table.group_by(group).aggregate([(metric, 'sum'), (metric, 'count')])
+
+
+class PitchStore:
+    def __init__(self, path, workers=1):
+        self.path = path
+        self.workers = workers
+        self._pools = {}
+        self._lock = threading.Lock()
+
+    def write(self, events):
+        """Write pitch event dicts (see pitch_schema); returns how many were written.
+
+        Every season/month partition the events fall in is replaced.
+        """
+        schema = pitch_schema()
+        events = iter(events)
+        written = 0
+
+        def batches():
+            nonlocal written
+            while True:
+                chunk = list(islice(events, WRITE_BATCH_ROWS))
+                if not chunk:
+                    return
+                written += len(chunk)
+                yield pa.RecordBatch.from_pylist(chunk, schema=schema)
+
+        # Dataset discovery skips '.'-prefixed entries, so readers never see the staging files
+        os.makedirs(self.path, exist_ok=True)
+        staging = tempfile.mkdtemp(prefix='.staging-', dir=self.path)
+        try:
+            ds.write_dataset(
+                batches(), staging, schema=schema, format='parquet',
+                partitioning=_partitioning(), existing_data_behavior='error',
+                max_rows_per_group=WRITE_BATCH_ROWS, filesystem=_filesystem()
+            )
+            for season in os.listdir(staging):
+                for month in os.listdir(os.path.join(staging, season)):
+                    self._replace(os.path.join(season, month), staging)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+        return written
+
+    def _replace(self, partition, staging):
+        """Move a staged season=/month= directory over the live one."""
+        target = os.path.join(self.path, partition)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        if os.path.exists(target):
+            os.rename(target, os.path.join(staging, 'replaced'))
+        os.rename(os.path.join(staging, partition), target)
+        shutil.rmtree(os.path.join(staging, 'replaced'), ignore_errors=True)
+
+    def dataset(self):
+        return ds.dataset(
+            self.path, format='parquet', partitioning=_partitioning(), filesystem=_filesystem()
+        )
+
+    def files(self, season, month=None):
+        """Paths of the Parquet files in the season (and month) partitions."""
+        expression = pc.field('season') == season
+        if month:
+            expression &= pc.field('month') == month
+        return [fragment.path for fragment in self.dataset().get_fragments(filter=expression)]
+
+    def averages(self, metric, season, month=None, pitch_type=None, workers=None):
+        """Table of (player id, average metric, events) over a season's events."""
+        group = METRICS[metric]
+        paths = self.files(season, month)
+        workers = min(workers or self.workers, len(paths))
+        arguments = (paths, repeat(metric), repeat(_row_filter(metric, pitch_type)))
+        if workers > 1:
+            partials = list(self._pool(workers).map(_partials, *arguments))
+        else:
+            partials = list(map(_partials, *arguments))
+        if not partials:
+            return pa.table({group: pa.array([], pa.int32()), metric: [], 'events': []})
+
+        merged = pa.concat_tables(partials).group_by(group).aggregate([
+            (f'{metric}_sum', 'sum'), (f'{metric}_count', 'sum')
+        ])
+        events = merged[f'{metric}_count_sum']
+        return pa.table({
+            group: merged[group],
+            metric: pc.divide(pc.cast(merged[f'{metric}_sum_sum'], pa.float64()), events),
+            'events': events
+        })
+
+    def _pool(self, workers):
+        with self._lock:
+            if workers not in self._pools:
+                self._pools[workers] = ProcessPoolExecutor(
+                    workers, mp_context=multiprocessing.get_context('spawn')
+                )
+            return self._pools[workers]
+
+    def close(self):
+        """Shut down the worker processes."""
+        with self._lock:
+            for pool in self._pools.values():
+                pool.shutdown()
+            self._pools.clear()
+
+    def leaders(self, metric, season, descending=True, min_events=None, limit=10, **filters):
+        """[(rank, player id, average, events)] ranked by the average metric."""
+        table = self.averages(metric, season, **filters)
+        if min_events:
+            table = table.filter(pc.field('events') >= min_events)
+        table = table.sort_by([
+            (metric, 'descending' if descending else 'ascending'), (METRICS[metric], 'ascending')
+        ])
+
+        ranked, previous = [], None
+        for position, row in enumerate(table.slice(0, limit).to_pylist(), start=1):
+            rank = ranked[-1][0] if row[metric] == previous else position
+            ranked.append((rank, row[METRICS[metric]], row[metric], row['events']))
+            previous = row[metric]
+        return ranked
+
+
+def pitch_store(app=None):
+    """The app's store, or None without pyarrow or STATCAST_STORE_PATH."""
+    return (app or current_app).extensions.get('pitch_store')
+
+
+def init_app(app):
+    path = app.config['STATCAST_STORE_PATH']
+    if path and pa is not None:
+        app.extensions['pitch_store'] = PitchStore(path, app.config['STATCAST_STORE_WORKERS'])
@@ -0,0 +1,168 @@
+"""In-memory player-name search index.
+
+Names are folded (accents stripped, lower-cased, punctuation dropped) so
+"Hernandez" finds "Teoscar Hernández". A search first takes players with
+a name token starting with every query token, found by bisecting one
+sorted token list, which ranks as a trie would. If that leaves room
+under the limit, it tops up with fuzzy matches. Those are scored by
+trigram similarity, the same measure pg_trgm uses, so typos like
+"freemen" still find "Freeman".
+
+The index is rebuilt on the next search after writers invalidate the
+'players' cache scope (response_cache.stats_invalidated), when that
+scope's generation token moves under a shared cache, or when the player
+table changes under another process's writes (checked at most every
+COLUMNAR_VERSION_CHECK_INTERVAL seconds).
+"""
+import heapq
+import re
+import threading
+import time
+import unicodedata
+from bisect import bisect_left
+from collections import Counter
+from sqlalchemy import func
+from app import db
+from app.models import Player
+from app.services.columnar import database_changed
+from app.services.response_cache import scope_generations, stats_invalidated
+
+INDEX_SCOPES = ('players',)
+
+# pg_trgm's default similarity threshold
+SIMILARITY_THRESHOLD = 0.3
+
+
+def fold(text):
+    """Accent-insensitive, lower-case form of a name with single spaces."""
+    text = unicodedata.normalize('NFKD', text)
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return ' '.join(re.sub(r'[^\w\s]', '', text.lower()).split())
+
+
+def trigrams(folded):
+    """pg_trgm-style trigrams: each word padded with two leading and one trailing space."""
+    grams = set()
+    for word in folded.split():
+        padded = f'  {word} '
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def players_version():
+    """Row count and latest update time of the player table."""
+    return tuple(db.session.query(func.count(Player.id), func.max(Player.updated_at)).one())
+
+
+class PlayerNameIndex:
+    def __init__(self, players, version=None):
+        """`players` is an iterable of (id, name) pairs."""
+        self.version = version
+        self.checked_at = time.monotonic()
+        self.ids, self.names, self.gram_counts = [], [], []
+        tokens, self.postings = [], {}
+        for position, (player_id, name) in enumerate(players):
+            folded = fold(name)
+            self.ids.append(player_id)
+            self.names.append(folded)
+            tokens.extend((token, position) for token in set(folded.split()))
+            grams = trigrams(folded)
+            self.gram_counts.append(len(grams))
+            for gram in grams:
+                self.postings.setdefault(gram, []).append(position)
+        tokens.sort()
+        self.tokens = [token for token, _ in tokens]
+        self.token_positions = [position for _, position in tokens]
+
+    def _prefixed(self, prefix):
+        """Positions of players with a name token starting with `prefix`."""
+        start = bisect_left(self.tokens, prefix)
+        end = bisect_left(self.tokens, prefix + '\uffff', start)
+        return set(self.token_positions[start:end])
+
+    def _prefix_rank(self, position, query):
+        """Sort key: exact name, then whole-word matches ("smith" ranks Will Smith
+        over Smithson Ruiz), then names starting with the query, then shortest."""
+        name = self.names[position]
+        words = name.split()
+        whole_words = sum(token in words for token in query.split())
+        return (name != query, -whole_words, not name.startswith(query), len(name), name)
+
+    def _similar(self, query_grams, exclude):
+        shared = Counter()
+        for gram in query_grams:
+            shared.update(self.postings.get(gram, ()))
+        matches = []
+        for position, count in shared.items():
+            if position in exclude:
+                continue
+            similarity = count / (len(query_grams) + self.gram_counts[position] - count)
+            if similarity >= SIMILARITY_THRESHOLD:
+                matches.append((similarity, position))
+        return matches
+
+    def search(self, query, limit=10):
+        """Player IDs best matching `query`, best first."""
+        query = fold(query)
+        if not query:
+            return []
+
+        candidates = None
+        for token in query.split():
+            found = self._prefixed(token)
+            candidates = found if candidates is None else candidates & found
+        ranked = heapq.nsmallest(
+            limit, candidates, key=lambda position: self._prefix_rank(position, query)
+        )
+
+        if len(ranked) < limit:
+            fuzzy = sorted(
+                self._similar(trigrams(query), set(ranked)),
+                key=lambda match: (-match[0], self.names[match[1]])
+            )
+            ranked += [position for _, position in fuzzy[:limit - len(ranked)]]
+
+        return [self.ids[position] for position in ranked]
+
+
+class PlayerSearch:
+    """Per-app holder of the index, kept in app.extensions['player_index']."""
+
+    def __init__(self, app):
+        self.app = app
+        self.index = None
+        self.generation = None
+        self._lock = threading.Lock()
+        stats_invalidated.connect(self.mark_stale, sender=app)
+
+    def mark_stale(self, sender, scopes=()):
+        if any(scope in INDEX_SCOPES for scope in scopes):
+            self.index = None
+
+    def _is_fresh(self, index, generation):
+        if index is None or generation != self.generation:
+            return False
+        return not database_changed(
+            index, players_version, self.app.config['COLUMNAR_VERSION_CHECK_INTERVAL']
+        )
+
+    def current(self):
+        """The index, rebuilt first if players changed since it was built."""
+        generation = scope_generations(INDEX_SCOPES)
+        outdated = self.index
+        if self._is_fresh(outdated, generation):
+            return outdated
+        with self._lock:
+            if self.index is None or self.index is outdated:  # not rebuilt meanwhile
+                # Read the version first: a write landing mid-build leaves it outdated
+                version = players_version()
+                self.index = PlayerNameIndex(db.session.query(Player.id, Player.name), version)
+                self.generation = generation
+            return self.index
+
+def search_player_ids(app, query, limit=10):
+    return app.extensions['player_index'].current().search(query, limit)
+
+
+def init_app(app):
+    app.extensions['player_index'] = PlayerSearch(app)
@@ -0,0 +1,111 @@
+"""Structured leaderboard plans and their compiled SQL statements.
+
+A QueryPlan is the normalized form of a leaderboard question: stat type,
+season range, the get_statistics filters (team and the MINIMUM_FILTERS
+minimums), sort column/direction and limit. Two plans that differ only in
+their values (seasons, team, minimums, limit) share a shape, and each
+shape is compiled once into a SELECT over the season-totals tables with
+bound parameters for those values, so SQLAlchemy's compiled cache is hit
+on every later execution.
+"""
+from functools import lru_cache
+from typing import NamedTuple, Optional, Tuple
+from sqlalchemy import Integer, and_, bindparam
+from app import db
+from app.models import Team
+from app.services.aggregates import (
+    MINIMUM_FILTERS, SEASON_MODELS, keyset_order, ranked_order, season_totals_query
+)
+
+COLUMN_HEADERS = {
+    'player_id': ('ID', 90),
+    'name': ('Player', 200),
+    'team': ('Team', 130),
+    'position': ('Position', 100),
+    'season': ('Season', 100),
+    'games': ('Games', 100),
+    'at_bats': ('AB', 100),
+    'hits': ('H', 100),
+    'runs': ('R', 100),
+    'rbis': ('RBI', 100),
+    'home_runs': ('HR', 100),
+    'batting_average': ('AVG', 100),
+    'innings_pitched': ('IP', 100),
+    'hits_allowed': ('H', 100),
+    'runs_allowed': ('R', 100),
+    'earned_runs': ('ER', 100),
+    'walks': ('BB', 100),
+    'strikeouts': ('K', 100),
+    'era': ('ERA', 100),
+    'strikeouts_per_nine': ('K/9', 100)
+}
+
+
+class QueryPlan(NamedTuple):
+    stat_type: str
+    season_from: Optional[int]
+    season_to: Optional[int]
+    team: Optional[str]
+    minimums: Tuple[Tuple[str, float], ...]  # sorted (MINIMUM_FILTERS arg, value) pairs
+    sort: Optional[str]
+    descending: bool
+    limit: int
+
+    @property
+    def shape(self):
+        return (
+            self.stat_type, self.season_from is not None, self.team is not None,
+            tuple(arg for arg, _ in self.minimums), self.sort, self.descending
+        )
+
+    @property
+    def params(self):
+        params = {'limit': self.limit, **dict(self.minimums)}
+        if self.season_from is not None:
+            params.update(season_from=self.season_from, season_to=self.season_to)
+        if self.team is not None:
+            params['team'] = self.team
+        return params
+
+    def to_dict(self):
+        plan = self._asdict()
+        plan['minimums'] = dict(self.minimums)
+        return plan
+
+
+@lru_cache(maxsize=256)
+def compiled_statement(shape):
+    """SELECT for a plan shape; values are bound at execution time."""
+    stat_type, has_seasons, has_team, minimum_args, sort, descending = shape
+    season_model = SEASON_MODELS[stat_type]
+
+    criteria = []
+    if has_seasons:
+        criteria.append(season_model.season.between(
+            bindparam('season_from', type_=Integer), bindparam('season_to', type_=Integer)
+        ))
+    if has_team:
+        criteria.append(Team.abbreviation == bindparam('team'))
+    for arg in minimum_args:
+        column = getattr(season_model, MINIMUM_FILTERS[stat_type][arg])
+        criteria.append(column >= bindparam(arg))
+
+    statement = season_totals_query(stat_type).statement
+    if criteria:
+        statement = statement.where(and_(*criteria))
+    if sort:
+        statement = ranked_order(statement, stat_type, sort, descending)
+    else:
+        statement = keyset_order(statement, stat_type)
+    return statement.limit(bindparam('limit', type_=Integer))
+
+
+def execute_plan(plan):
+    """Rows of the plan as dicts, plus column metadata for the results grid."""
+    result = db.session.execute(compiled_statement(plan.shape), plan.params)
+    columns = [
+        {'field': name, 'headerName': COLUMN_HEADERS[name][0],
+         'width': COLUMN_HEADERS[name][1], 'sortable': True}
+        for name in result.keys()
+    ]
+    return [dict(row) for row in result.mappings()], columns
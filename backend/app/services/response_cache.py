@@ -0,0 +1,178 @@
+"""Response caching for the read-only stats endpoints.
+
+conditional_response answers If-None-Match/If-Modified-Since from a cheap
+version query before the view runs. cached_response keeps rendered bodies
+for requests that do need one.
+
+Cache keys are built from the request path and its sorted, non-empty query
+args, plus a generation token for each data scope the response depends on
+(a season, all seasons, or the player table). Writers call
+invalidate_seasons/invalidate after committing, which swaps in new tokens,
+so stale entries are never read again and simply age out. Under
+conditional_response the key also carries the version the database
+reported, so writes by other processes miss the cache even when the
+tokens are per-process (SimpleCache). invalidate also
+sends stats_invalidated, for in-process consumers such as the columnar
+snapshot.
+"""
+import hashlib
+import threading
+from datetime import datetime, timezone
+from functools import wraps
+from uuid import uuid4
+from blinker import Namespace
+from flask import Response, current_app, g, request
+from app import cache
+
+_counters = {'hits': 0, 'misses': 0}
+_counters_lock = threading.Lock()
+
+stats_invalidated = Namespace().signal('stats-invalidated')
+
+
+def _count(name):
+    with _counters_lock:
+        _counters[name] += 1
+
+
+def cache_stats():
+    """Hit/miss counts for this process."""
+    with _counters_lock:
+        return dict(_counters)
+
+
+def _generation(scope):
+    key = f'generation:{scope}'
+    token = cache.get(key)
+    if token is None:
+        # Never set, or evicted: start a fresh token rather than fall back to a
+        # constant one, under which entries from before an invalidation live on
+        cache.add(key, uuid4().hex, timeout=0)
+        token = cache.get(key) or '0'  # NullCache keeps nothing
+    return token
+
+
+def scope_generations(scopes):
+    return tuple(_generation(scope) for scope in scopes)
+
+
+def invalidate(*scopes):
+    for scope in scopes:
+        cache.set(f'generation:{scope}', uuid4().hex, timeout=0)
+    stats_invalidated.send(current_app._get_current_object(), scopes=scopes)
+
+
+def invalidate_seasons(seasons):
+    invalidate('season:all', *(f'season:{season}' for season in set(seasons)))
+
+
+def canonical_args(args):
+    return '&'.join(
+        f'{key}={value}'
+        for key, value in sorted(args.items(multi=True))
+        if value != ''
+    )
+
+
+def season_scopes():
+    """Responses filtered to one season only change when that season does."""
+    season = request.args.get('season', type=int)
+    return ['season:all'] if season is None else [f'season:{season}']
+
+
+def player_scopes():
+    return ['players']
+
+
+def statcast_scopes():
+    """Responses from the Parquet pitch store (plus player names)."""
+    return ['statcast', 'players']
+
+
+def all_season_scopes():
+    """Responses that read across seasons and players (comparisons, career totals)."""
+    return ['season:all', 'players']
+
+
+def cached_response(scopes):
+    """Cache successful (200), non-streamed responses of a view, keyed as
+    described above.
+
+    `scopes` is called per request and returns the scope names the
+    response depends on.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            generations = '.'.join(scope_generations(scopes()))
+            key = f'response:{request.path}?{canonical_args(request.args)}#{generations}'
+            if g.get('data_version') is not None:
+                key += f'#{g.data_version}'
+
+            cached = cache.get(key)
+            if cached is not None:
+                _count('hits')
+                body, mimetype = cached
+                return Response(body, mimetype=mimetype)
+
+            _count('misses')
+            response = current_app.make_response(view(*args, **kwargs))
+            if response.status_code == 200 and not response.is_streamed:
+                cache.set(key, (response.get_data(), response.mimetype))
+            return response
+        return wrapper
+    return decorator
+
+
+def _etag_matches(etag):
+    """If-None-Match check that also accepts the ':<encoding>' suffix
+    Flask-Compress appends to the ETag of compressed responses."""
+    tags = request.if_none_match
+    return tags.star_tag or any(
+        tag.split(':')[0] == etag for tag in tags.as_set(include_weak=True)
+    )
+
+
+def conditional_response(version):
+    """Add ETag/Last-Modified to 200 responses and answer 304 without the view.
+
+    `version` is called with the view's arguments and returns a row of
+    values identifying the data in scope, e.g. (max updated_at, ...,
+    count); datetimes in it are taken as naive UTC and the newest one
+    becomes Last-Modified. Returning None skips the conditional handling.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            values = version(*args, **kwargs)
+            if values is None:
+                return view(*args, **kwargs)
+
+            g.data_version = tuple(values)
+            fingerprint = f'{request.path}?{canonical_args(request.args)}|{tuple(values)}'
+            etag = hashlib.sha1(fingerprint.encode()).hexdigest()
+            timestamps = [value for value in values if isinstance(value, datetime)]
+            last_modified = max(timestamps).replace(tzinfo=timezone.utc, microsecond=0) \
+                if timestamps else None
+
+            if request.if_none_match:
+                not_modified = _etag_matches(etag)
+            else:
+                not_modified = bool(
+                    last_modified and request.if_modified_since
+                    and last_modified <= request.if_modified_since
+                )
+
+            if not_modified:
+                response = Response(status=304)
+            else:
+                response = current_app.make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag, weak=True)
+            if last_modified:
+                response.last_modified = last_modified
+            return response
+        return wrapper
+    return decorator
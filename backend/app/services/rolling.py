@@ -0,0 +1,151 @@
+"""Rolling game-log splits: trailing-window series per player and
+last-N-days leaderboards.
+
+Both read the in-memory GameLog (game_logs.py) when it is available and
+the database otherwise; the two paths return the same rows in the same
+order. The SQL leaderboard narrows the game rows by Game.date
+(ix_game_date) before aggregating them per player.
+"""
+from bisect import bisect_left
+from datetime import date, timedelta
+from itertools import accumulate
+from flask import current_app
+from sqlalchemy import Integer, func, select
+from app import db
+from app.models import Game, Player, Team
+from app.services.aggregates import (
+    MINIMUM_FILTERS, RATE_STATS, STAT_MODELS, season_aggregate_select
+)
+from app.services.game_logs import game_columns, game_log, game_log_query, np
+from app.services.windows import ranked_rows
+
+
+def latest_game_date():
+    return db.session.query(func.max(Game.date)).scalar()
+
+
+def integer_columns(stat_type):
+    stat_model = STAT_MODELS[stat_type]
+    return {'games'} | {
+        name for name in game_columns(stat_type)
+        if isinstance(stat_model.__table__.c[name].type, Integer)
+    }
+
+
+def _plain(value, integer):
+    """A JSON-ready number: NaN becomes None and integer totals become ints."""
+    value = float(value)
+    if value != value:
+        return None
+    return int(value) if integer else value
+
+
+def _totals_row(stat_type, totals, position):
+    integers = integer_columns(stat_type)
+    return {name: _plain(values[position], name in integers) for name, values in totals.items()}
+
+
+def _players(player_ids):
+    query = db.session.query(
+        Player.id, Player.name, Team.abbreviation.label('team'), Player.position
+    ).outerjoin(Team, Player.team_id == Team.id).filter(Player.id.in_(player_ids))
+    return {row.id: row for row in query}
+
+
+def hot_query(stat_type, as_of, days, sort, descending=True, team=None, **minimums):
+    """Per-player totals over the `days` days ending `as_of`, ranked, from SQL."""
+    stat_model = STAT_MODELS[stat_type]
+    start = max(as_of - timedelta(days=days - 1), date(as_of.year, 1, 1))
+    games = select(Game.id).where(Game.date.between(start, as_of))
+    totals = season_aggregate_select(
+        stat_type, stat_model.season == as_of.year, stat_model.game_id.in_(games)
+    ).subquery()
+    return ranked_rows(totals, stat_type, sort, descending, team, **minimums)
+
+
+def hot_leaders(stat_type, as_of, days, sort, descending=True, limit=10, team=None, **minimums):
+    """Leaders over the `days` days ending `as_of` (e.g. hottest hitters last 7 days)."""
+    log = game_log(current_app, stat_type, as_of.year)
+    if log is None:
+        return [row._asdict() for row in hot_query(
+            stat_type, as_of, days, sort, descending, team, **minimums
+        ).limit(limit)]
+
+    player_ids, totals = log.last_days(as_of, days)
+    keep = np.ones(len(player_ids), dtype=bool)
+    for arg, column in MINIMUM_FILTERS[stat_type].items():
+        if minimums.get(arg):
+            keep &= totals[column] >= minimums[arg]
+    if team:
+        on_team = db.session.query(Player.id).join(Team, Player.team_id == Team.id) \
+            .filter(Team.abbreviation == team)
+        keep &= np.isin(player_ids, [player_id for (player_id,) in on_team])
+
+    player_ids = player_ids[keep]
+    totals = {name: values[keep] for name, values in totals.items()}
+    key = -totals[sort] if descending else totals[sort]
+    order = np.lexsort((player_ids, key))
+    ordered_keys = key[order]
+    ranks = np.searchsorted(ordered_keys, ordered_keys, side='left') + 1
+
+    top = order[:limit]
+    players = _players(player_ids[top].tolist())
+    rows = []
+    for rank, position in zip(ranks[:limit].tolist(), top.tolist()):
+        player = players[int(player_ids[position])]
+        rows.append({
+            'rank': rank, 'player_id': player.id, 'name': player.name, 'team': player.team,
+            'position': player.position, 'season': as_of.year,
+            **_totals_row(stat_type, totals, position)
+        })
+    return rows
+
+
+def _python_rolling(stat_type, rows, window, unit):
+    """Totals over each game's trailing window, from prefix sums in plain Python."""
+    names = game_columns(stat_type)
+    cumulative = {'games': list(range(len(rows) + 1))}
+    counted = {}
+    for position, name in enumerate(names, start=3):
+        cumulative[name] = list(accumulate((row[position] or 0 for row in rows), initial=0))
+        counted[name] = list(accumulate((row[position] is not None for row in rows), initial=0))
+    days = [row.date.toordinal() for row in rows]
+
+    series = []
+    for index in range(len(rows)):
+        if unit == 'games':
+            start = max(index - window + 1, 0)
+        else:
+            start = bisect_left(days, days[index] - window + 1)
+        totals = {name: values[index + 1] - values[start] for name, values in cumulative.items()}
+        for name, values in counted.items():
+            if values[index + 1] == values[start]:
+                totals[name] = None
+        for name, (numerator, denominator, scale) in RATE_STATS[stat_type].items():
+            divisor = totals[denominator]
+            recorded = divisor and totals[numerator] is not None
+            totals[name] = totals[numerator] * scale / divisor if recorded else None
+        series.append(totals)
+    return series
+
+
+def player_rolling(stat_type, player_id, season, window, unit='days'):
+    """One row per game the player appeared in, with totals over the trailing
+    `window` days (or games) up to and including it."""
+    log = game_log(current_app, stat_type, season)
+    if log is None:
+        rows = game_log_query(stat_type, season, player_id).all()
+        return [
+            {'date': row.date.isoformat(), 'game_id': row.game_id, **totals}
+            for row, totals in zip(rows, _python_rolling(stat_type, rows, window, unit))
+        ]
+
+    index, totals = log.rolling(player_id, window, unit)
+    return [
+        {
+            'date': date.fromordinal(int(log.days[row])).isoformat(),
+            'game_id': int(log.game_ids[row]),
+            **_totals_row(stat_type, totals, position)
+        }
+        for position, row in enumerate(index.tolist())
+    ]
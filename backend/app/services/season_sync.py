@@ -0,0 +1,238 @@
+"""League-wide season sync from the MLB Stats API.
+
+sync_season pages through every player's game log for a season and stat
+group (stats?stats=gameLog&playerPool=All), MLB_API_PAGE_SIZE splits per
+request, instead of making one request per player. For each page it
+bulk-creates any players, teams and games it references that are
+missing, then upserts the per-game rows with bulk_upsert_game_stats.
+sync_players does the same for a few players' game logs, for the queued
+sync jobs.
+
+The offset of the next page is committed to a SyncCheckpoint after every
+page, so an interrupted sync picks up where it stopped. Season totals are
+rebuilt once, after the last page.
+"""
+from collections import Counter
+from datetime import date
+from flask import current_app
+from sqlalchemy import Integer, insert
+from app import db
+from app.models import Player, Team, Game, SyncCheckpoint
+from app.services.aggregates import STAT_MODELS
+from app.services.ingest import bulk_upsert_game_stats
+from app.services.mlb_api import MLBAPIService
+from app.services.response_cache import invalidate, invalidate_seasons
+from app.services.season_totals import rebuild_season_totals
+
+SOURCE = 'season_game_logs'
+
+# Game-log stat field for each per-game stats column
+STAT_FIELDS = {
+    'batting': {
+        'at_bats': 'atBats',
+        'hits': 'hits',
+        'runs': 'runs',
+        'rbis': 'rbi',
+        'home_runs': 'homeRuns',
+        'batting_average': 'avg'
+    },
+    'pitching': {
+        'innings_pitched': 'inningsPitched',
+        'hits_allowed': 'hits',
+        'runs_allowed': 'runs',
+        'earned_runs': 'earnedRuns',
+        'walks': 'baseOnBalls',
+        'strikeouts': 'strikeOuts',
+        'era': 'era'
+    }
+}
+
+
+def _number(value):
+    """Stat values arrive as numbers or strings like '.250'; '-.--' means none."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def innings(value):
+    """Innings in baseball notation ('6.1' is 6 1/3) as a true number of innings."""
+    number = _number(value)
+    if number is None:
+        return None
+    whole, outs = divmod(round(number * 10), 10)
+    return whole + outs / 3
+
+
+def game_record(stat_type, season, split, team_ids=None):
+    """A bulk_upsert_game_stats record for one game-log split.
+
+    `team_ids` maps MLB team IDs to local ones (see store_references).
+    """
+    stat = split.get('stat', {})
+    columns = STAT_MODELS[stat_type].__table__.c
+    record = {
+        'player_id': split['player']['id'],
+        'game_id': split['game']['gamePk'],
+        'season': season,
+        'team_id': (team_ids or {}).get(split.get('team', {}).get('id'))
+    }
+    for column, field in STAT_FIELDS[stat_type].items():
+        value = stat.get(field)
+        if column == 'innings_pitched':
+            record[column] = innings(value)
+        else:
+            number = _number(value)
+            # Counting stats go to Integer columns, which PostgreSQL COPY won't fill from '4.0'
+            is_count = number is not None and isinstance(columns[column].type, Integer)
+            record[column] = int(number) if is_count else number
+    return record
+
+
+def _insert_missing(model, rows):
+    """Insert the rows whose id is not in the table yet; returns how many."""
+    rows = list({row['id']: row for row in rows}.values())
+    if not rows:
+        return 0
+    existing = {
+        row_id for (row_id,) in
+        db.session.query(model.id).filter(model.id.in_([row['id'] for row in rows]))
+    }
+    missing = [row for row in rows if row['id'] not in existing]
+    if missing:
+        db.session.execute(insert(model), missing)
+    return len(missing)
+
+
+def _team_ids(splits):
+    """Map the MLB team IDs in `splits` to local team IDs, creating missing teams.
+
+    Teams already stored under another ID (e.g. by the import scripts) are
+    matched by name.
+    """
+    teams = {}
+    for split in splits:
+        for key in ('team', 'opponent'):
+            if split.get(key):
+                teams[split[key]['id']] = split[key]
+    by_name = dict(db.session.query(Team.name, Team.id).filter(
+        Team.name.in_([team['name'] for team in teams.values()])
+    ))
+    _insert_missing(Team, [
+        {'id': team_id, 'name': team['name'], 'abbreviation': team.get('abbreviation')}
+        for team_id, team in teams.items() if team['name'] not in by_name
+    ])
+    return {team_id: by_name.get(team['name'], team_id) for team_id, team in teams.items()}
+
+
+def store_references(splits):
+    """Create the teams, players and games the splits refer to that are missing.
+
+    Returns the number of new players and the MLB-to-local team ID map.
+    """
+    team_ids = _team_ids(splits)
+    new_players = _insert_missing(Player, [
+        {
+            'id': split['player']['id'],
+            'name': split['player']['fullName'],
+            'team_id': team_ids.get(split.get('team', {}).get('id')),
+            'position': split.get('position', {}).get('abbreviation')
+        }
+        for split in splits
+    ])
+
+    games = []
+    for split in splits:
+        team_id = team_ids.get(split.get('team', {}).get('id'))
+        opponent_id = team_ids.get(split.get('opponent', {}).get('id'))
+        home, away = (team_id, opponent_id) if split.get('isHome') else (opponent_id, team_id)
+        games.append({
+            'id': split['game']['gamePk'],
+            'date': date.fromisoformat(split['date']),
+            'home_team_id': home,
+            'away_team_id': away
+        })
+    _insert_missing(Game, games)
+    return new_players, team_ids
+
+
+def store_game_logs(stat_type, season, splits, refresh_totals=True):
+    """Store game-log splits as per-game rows, creating what they refer to first.
+
+    Returns the rows written.
+    """
+    splits = [split for split in splits if split.get('game') and split.get('player')]
+    if not splits:
+        return 0
+    new_players, team_ids = store_references(splits)
+    written = bulk_upsert_game_stats(
+        stat_type, (game_record(stat_type, season, split, team_ids) for split in splits),
+        refresh_totals=refresh_totals
+    )
+    if new_players:
+        invalidate('players')
+    return written
+
+
+def sync_players(player_ids, season, stat_type):
+    """Sync the game logs of the given players for a season.
+
+    Backs the queued sync jobs: players are fetched in batches through the
+    people endpoint, and players not stored yet are created. Returns a
+    Counter of the game lines stored per player ID.
+    """
+    player_ids = set(player_ids)
+    names = dict(db.session.query(Player.id, Player.name).filter(Player.id.in_(player_ids)))
+    fetched = MLBAPIService.get_players_stats(player_ids, season, stat_type, stats_type='gameLog')
+    splits = [
+        {'player': {'id': player_id, 'fullName': names.get(player_id) or data['fullName']}, **split}
+        for player_id, data in fetched.items()
+        for group in data.get('stats', [])
+        for split in group.get('splits', [])
+    ]
+    store_game_logs(stat_type, season, splits)
+    return Counter(
+        split['player']['id'] for split in splits if split.get('game') and split.get('player')
+    )
+
+
+def checkpoint_for(source, season, stat_type):
+    checkpoint = SyncCheckpoint.query.filter_by(
+        source=source, season=season, stat_type=stat_type
+    ).first()
+    if checkpoint is None:
+        checkpoint = SyncCheckpoint(source=source, season=season, stat_type=stat_type)
+        db.session.add(checkpoint)
+    return checkpoint
+
+
+def sync_season(season, stat_type, page_size=None, restart=False):
+    """Sync every player's game log for a season. Returns the rows written.
+
+    Resumes from the last completed page unless `restart` is set or the
+    previous run finished.
+    """
+    page_size = page_size or current_app.config['MLB_API_PAGE_SIZE']
+    checkpoint = checkpoint_for(SOURCE, season, stat_type)
+    if restart or checkpoint.completed:
+        checkpoint.cursor, checkpoint.completed = None, False
+    offset = int(checkpoint.cursor or 0)
+    db.session.commit()
+
+    written = 0
+    while True:
+        page = MLBAPIService.get_season_game_logs(season, stat_type, offset, page_size)
+        written += store_game_logs(stat_type, season, page, refresh_totals=False)
+
+        offset += page_size
+        checkpoint.cursor = str(offset)
+        db.session.commit()
+        if len(page) < page_size:
+            break
+
+    rebuild_season_totals(stat_type, season=season)
+    checkpoint.completed = True
+    db.session.commit()
+    invalidate_seasons([season])
+    return written
@@ -0,0 +1,88 @@
+"""Maintenance of the materialized season-totals tables.
+
+Writers of per-game stats rows call refresh_season_totals with the
+player/season pairs they touched, inside the same transaction, so only
+those season lines are recomputed. rebuild_season_totals recomputes whole
+seasons and backs the `flask rebuild-season-totals` command. Both also
+recompute the same player-seasons' split totals (splits.py).
+"""
+from datetime import datetime
+from sqlalchemy import delete, insert, literal, tuple_
+from app import db
+from app.services.aggregates import (
+    AGGREGATES, SEASON_MODELS, STAT_MODELS, season_aggregate_select
+)
+from app.services.splits import SPLIT_MODELS, replace_split_totals
+
+# Keeps the tuple IN (...) lists well under SQLite's bound-parameter limit
+REFRESH_CHUNK_SIZE = 400
+
+
+def _columns(stat_type):
+    return ['player_id', 'season', *AGGREGATES[stat_type](), 'updated_at']
+
+
+def _replace(stat_type, stat_criteria, season_criteria):
+    """Delete the matching season rows and re-insert them from the game rows."""
+    season_model = SEASON_MODELS[stat_type]
+    source = season_aggregate_select(stat_type, *stat_criteria) \
+        .add_columns(literal(datetime.utcnow()).label('updated_at'))
+
+    db.session.execute(delete(season_model).where(*season_criteria))
+    result = db.session.execute(
+        insert(season_model).from_select(_columns(stat_type), source)
+    )
+    return result.rowcount
+
+
+def player_seasons(records):
+    """Distinct (player_id, season) pairs from dicts or objects with those fields."""
+    pairs = set()
+    for record in records:
+        if isinstance(record, dict):
+            pairs.add((record['player_id'], record['season']))
+        else:
+            pairs.add((record.player_id, record.season))
+    return pairs
+
+
+def refresh_season_totals(stat_type, pairs):
+    """Recompute the season lines for the given (player_id, season) pairs.
+
+    Does not commit; callers commit together with the game rows they wrote.
+    """
+    stat_model = STAT_MODELS[stat_type]
+    season_model = SEASON_MODELS[stat_type]
+    split_model = SPLIT_MODELS[stat_type]
+    pairs = sorted(set(pairs))
+
+    refreshed = 0
+    for start in range(0, len(pairs), REFRESH_CHUNK_SIZE):
+        chunk = pairs[start:start + REFRESH_CHUNK_SIZE]
+        stat_criteria = [tuple_(stat_model.player_id, stat_model.season).in_(chunk)]
+        refreshed += _replace(
+            stat_type,
+            stat_criteria,
+            [tuple_(season_model.player_id, season_model.season).in_(chunk)]
+        )
+        replace_split_totals(
+            stat_type, stat_criteria, [tuple_(split_model.player_id, split_model.season).in_(chunk)]
+        )
+    return refreshed
+
+
+def rebuild_season_totals(stat_type, season=None):
+    """Recompute every season line, or every line for one season."""
+    stat_model = STAT_MODELS[stat_type]
+    season_model = SEASON_MODELS[stat_type]
+    split_model = SPLIT_MODELS[stat_type]
+
+    if season is None:
+        replace_split_totals(stat_type, [], [])
+        return _replace(stat_type, [], [])
+    replace_split_totals(stat_type, [stat_model.season == season], [split_model.season == season])
+    return _replace(
+        stat_type,
+        [stat_model.season == season],
+        [season_model.season == season]
+    )
@@ -0,0 +1,157 @@
+"""Home/away, opponent and month splits of the per-game stats rows.
+
+A player's side in a game comes from comparing their team for that game
+(the stats row's team_id) with Game.home_team_id and Game.away_team_id;
+the opponent is the other of the two teams and the month is Game.date's.
+Rows without a team_id (synced before it was recorded) are left out of
+the venue and opponent splits rather than guessed from the player's
+current team, which is wrong for traded players; re-run sync-season for
+those seasons to fill it in. Each split is one grouped aggregation of the game
+rows joined to Game, shaped like season_aggregate_select plus the split
+name and value.
+
+The results are materialized into PlayerSplitBatting/PlayerSplitPitching
+for the same player-seasons, and in the same transaction, as the season
+totals (season_totals.py calls replace_split_totals), so split pages and
+split leaderboards read a few pre-summed rows instead of game rows.
+"""
+from datetime import datetime
+from sqlalchemy import String, and_, case, cast, delete, extract, insert, literal, select
+from sqlalchemy import literal_column
+from app import db
+from app.models import Game, Team, PlayerSplitBatting, PlayerSplitPitching
+from app.services.aggregates import AGGREGATES, STAT_MODELS
+
+SPLIT_MODELS = {
+    'batting': PlayerSplitBatting,
+    'pitching': PlayerSplitPitching
+}
+
+SPLITS = ('venue', 'opponent', 'month')
+
+# Splits whose stored value is a number (team id, month) rather than a name
+NUMERIC_SPLITS = ('opponent', 'month')
+
+VENUES = ('home', 'away')
+
+
+def split_values(stat_type):
+    """{split: SQL expression for a game row's value as text}; NULL when unknown."""
+    stat_model = STAT_MODELS[stat_type]
+    team = stat_model.team_id
+    at_home, away = team == Game.home_team_id, team == Game.away_team_id
+    # Literal SQL rather than bound parameters, so each expression renders
+    # identically in SELECT and GROUP BY
+    return {
+        'venue': case((at_home, literal_column("'home'")), (away, literal_column("'away'"))),
+        'opponent': cast(case((at_home, Game.away_team_id), (away, Game.home_team_id)), String),
+        'month': cast(extract('month', Game.date), String)
+    }
+
+
+def split_aggregate_select(stat_type, split, *criteria):
+    """SELECT player_id, season, split, value and the aggregates from the game rows.
+
+    The column order matches the split-totals table, as for the season totals.
+    """
+    stat_model = STAT_MODELS[stat_type]
+    value = split_values(stat_type)[split]
+    statement = select(
+        stat_model.player_id,
+        stat_model.season,
+        literal(split).label('split'),
+        value.label('value'),
+        *(expression.label(name) for name, expression in AGGREGATES[stat_type]().items())
+    ).join(Game, stat_model.game_id == Game.id).where(and_(value.isnot(None), *criteria))
+    return statement.group_by(stat_model.player_id, stat_model.season, value)
+
+
+def _columns(stat_type):
+    return ['player_id', 'season', 'split', 'value', *AGGREGATES[stat_type](), 'updated_at']
+
+
+def replace_split_totals(stat_type, stat_criteria, split_criteria):
+    """Delete the matching split rows and re-insert every split from the game rows.
+
+    Does not commit. Returns the number of split rows written.
+    """
+    split_model = SPLIT_MODELS[stat_type]
+    now = literal(datetime.utcnow()).label('updated_at')
+    db.session.execute(delete(split_model).where(*split_criteria))
+    written = 0
+    for split in SPLITS:
+        source = split_aggregate_select(stat_type, split, *stat_criteria).add_columns(now)
+        written += db.session.execute(
+            insert(split_model).from_select(_columns(stat_type), source)
+        ).rowcount
+    return written
+
+
+def _typed(split, value):
+    return int(value) if split in NUMERIC_SPLITS else value
+
+
+def _sort_key(row):
+    return SPLITS.index(row.split), _typed(row.split, row.value)
+
+
+def player_splits(stat_type, player_id, season, split=None):
+    """{split: [rows]} of the player's season, each row with its value and totals.
+
+    Opponent rows also carry the opponent's abbreviation as 'team'.
+    """
+    split_model = SPLIT_MODELS[stat_type]
+    query = db.session.query(
+        split_model.split, split_model.value,
+        *[getattr(split_model, name) for name in AGGREGATES[stat_type]()]
+    ).filter(split_model.player_id == player_id, split_model.season == season)
+    if split:
+        query = query.filter(split_model.split == split)
+    rows = sorted(query, key=_sort_key)
+
+    opponents = {row.value for row in rows if row.split == 'opponent'}
+    teams = dict(db.session.query(Team.id, Team.abbreviation).filter(
+        Team.id.in_([int(value) for value in opponents])
+    )) if opponents else {}
+
+    splits = {name: [] for name in ([split] if split else SPLITS)}
+    for row in rows:
+        data = row._asdict()
+        del data['split']
+        data['value'] = _typed(row.split, row.value)
+        if row.split == 'opponent':
+            data['team'] = teams.get(data['value'])
+        splits[row.split].append(data)
+    return splits
+
+
+def split_rows(stat_type, split, value, season=None, season_from=None, season_to=None):
+    """Subquery of player-season totals for one split value, for windows.ranked_rows."""
+    split_model = SPLIT_MODELS[stat_type]
+    criteria = [split_model.split == split, split_model.value == str(value)]
+    if season:
+        criteria.append(split_model.season == season)
+    if season_from:
+        criteria.append(split_model.season >= season_from)
+    if season_to:
+        criteria.append(split_model.season <= season_to)
+    return select(
+        split_model.player_id, split_model.season,
+        *[getattr(split_model, name) for name in AGGREGATES[stat_type]()]
+    ).where(*criteria).subquery()
+
+
+def split_value(split, text):
+    """Parse home/away, a month 1-12 or an opponent's abbreviation (as its team id).
+
+    Raises ValueError for anything else.
+    """
+    if split == 'venue' and text in VENUES:
+        return text
+    if split == 'month' and text and text.isdigit() and 1 <= int(text) <= 12:
+        return int(text)
+    if split == 'opponent' and text:
+        team = db.session.query(Team.id).filter(Team.abbreviation == text.upper()).first()
+        if team is not None:
+            return team.id
+    raise ValueError(text)
@@ -0,0 +1,101 @@
+"""Coalescing and negative caching for upstream (MLB API) lookups.
+
+lookup() runs a fetch at most once at a time per key in this process:
+callers arriving while it is in flight wait for and share its result (or
+its exception) instead of sending the same request again. Results the
+caller deems empty (no search results, no roster, no stats for a
+player/season) are remembered in the app cache for
+MLB_API_NEGATIVE_CACHE_TTL seconds, so the next lookup of a known-empty
+key skips the network. Errors are never cached.
+"""
+import threading
+from concurrent.futures import Future
+from flask import current_app
+from app import cache
+
+_counters = {'calls': 0, 'coalesced': 0, 'negative_hits': 0, 'negative_stores': 0}
+_counters_lock = threading.Lock()
+
+
+def _count(name):
+    with _counters_lock:
+        _counters[name] += 1
+
+
+def upstream_stats():
+    """Upstream call, coalescing and negative-cache counts for this process."""
+    with _counters_lock:
+        return dict(_counters)
+
+
+class SingleFlight:
+    """Shares one in-flight call per key between concurrent callers."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fetch):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = Future()
+
+        if not leader:
+            _count('coalesced')
+            return call.result()
+
+        _count('calls')
+        try:
+            result = fetch()
+        except BaseException as e:
+            call.set_exception(e)
+            raise
+        else:
+            call.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+
+_flights = SingleFlight()
+
+
+def negative_key(key):
+    return 'negative:' + ':'.join(str(part) for part in key)
+
+
+def is_known_empty(key):
+    if cache.get(negative_key(key)) is None:
+        return False
+    _count('negative_hits')
+    return True
+
+
+def remember_empty(key):
+    _count('negative_stores')
+    cache.set(negative_key(key), True, timeout=current_app.config['MLB_API_NEGATIVE_CACHE_TTL'])
+
+
+def coalesced(key, fetch):
+    """fetch() for `key`, shared with concurrent callers of the same key."""
+    return _flights.do(key, fetch)
+
+
+def lookup(key, fetch, is_empty, empty):
+    """fetch() for `key` (a tuple), coalesced and negatively cached.
+
+    Returns `empty` without calling fetch when the key is known to be empty.
+    """
+    if is_known_empty(key):
+        return empty
+
+    def fetch_and_remember():
+        result = fetch()
+        if is_empty(result):
+            remember_empty(key)
+        return result
+
+    return coalesced(key, fetch_and_remember)
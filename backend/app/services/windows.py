@@ -0,0 +1,145 @@
+"""Multi-season leaderboards computed with SQL window functions.
+
+All three read the season-totals tables and leave the ranking to the
+database:
+
+- running_totals_query: each player-season with the player's totals over
+  the trailing `window` seasons (SUM() OVER a RANGE frame on season), or
+  career-to-date when no window is given. The window runs over every
+  season stored, so a season_from filter does not cut earlier seasons
+  out of the totals.
+- career_totals_query: one row per player, summed over the season range.
+- best_seasons_query: each player's `per_player` best seasons by a column
+  (ROW_NUMBER() partitioned by player), i.e. top-N-per-group.
+
+Rate stats are derived from the summed counting stats (aggregates.RATE_STATS),
+and every row carries RANK() by the sort column across the whole result.
+"""
+from sqlalchemy import and_, func, select
+from app import db
+from app.models import Player, Team
+from app.services.aggregates import (
+    AGGREGATES, MINIMUM_FILTERS, RATE_STATS, SEASON_MODELS, with_rates
+)
+
+
+def counting_columns(stat_type):
+    return [name for name in AGGREGATES[stat_type]() if name not in RATE_STATS[stat_type]]
+
+
+def _totals(stat_type, total):
+    """{column: expression} with `total` applied to each counting column, rates derived."""
+    season_model = SEASON_MODELS[stat_type]
+    return with_rates(stat_type, {
+        name: total(getattr(season_model, name)) for name in counting_columns(stat_type)
+    })
+
+
+def _rank_key(column, descending):
+    return (column.desc() if descending else column.asc()).nulls_last()
+
+
+def ranked_rows(rows, stat_type, sort, descending, team=None, ties=(), **minimums):
+    """Player info, `rows` (a subquery keyed by player_id) and RANK() by `sort`.
+
+    Rows tied on `sort` are ordered by the `ties` columns, then player_id.
+    """
+    key = rows.c[sort]
+    filters = [rows.c[column] >= minimums[arg]
+               for arg, column in MINIMUM_FILTERS[stat_type].items() if minimums.get(arg)]
+    if team:
+        filters.append(Team.abbreviation == team)
+    query = db.session.query(
+        func.rank().over(order_by=_rank_key(key, descending)).label('rank'),
+        rows.c.player_id,
+        Player.name,
+        Team.abbreviation.label('team'),
+        Player.position,
+        *[column for column in rows.c if column.name != 'player_id']
+    ).join(Player, rows.c.player_id == Player.id) \
+     .outerjoin(Team, Player.team_id == Team.id)
+    if filters:
+        query = query.filter(and_(*filters))
+    return query.order_by(
+        _rank_key(key, descending), *(rows.c[name] for name in ties), rows.c.player_id
+    )
+
+
+def _season_range(season_model, season_from, season_to):
+    criteria = []
+    if season_from:
+        criteria.append(season_model.season >= season_from)
+    if season_to:
+        criteria.append(season_model.season <= season_to)
+    return criteria
+
+
+def running_totals_query(stat_type, sort, descending=True, window=None, season_from=None,
+                         season_to=None, team=None, **minimums):
+    """Player-seasons with trailing-`window` (or career-to-date) totals, ranked by `sort`."""
+    season_model = SEASON_MODELS[stat_type]
+    frame = (-(window - 1), 0) if window else (None, 0)
+
+    def over(expression):
+        return expression.over(
+            partition_by=season_model.player_id, order_by=season_model.season, range_=frame
+        )
+
+    # Rates are derived a level up, so each sum is windowed once
+    running = select(
+        season_model.player_id,
+        season_model.season,
+        over(func.count()).label('seasons'),
+        *(over(func.sum(getattr(season_model, name))).label(name)
+          for name in counting_columns(stat_type))
+    ).subquery()
+    totals = with_rates(stat_type, {name: running.c[name] for name in counting_columns(stat_type)})
+
+    in_range = select(
+        running.c.player_id,
+        running.c.season,
+        running.c.seasons,
+        *(expression.label(name) for name, expression in totals.items())
+    ).where(and_(True, *_season_range(running.c, season_from, season_to)))
+    return ranked_rows(in_range.subquery(), stat_type, sort, descending, team,
+                   ties=['season'], **minimums)
+
+
+def career_totals_query(stat_type, sort, descending=True, season_from=None, season_to=None,
+                        team=None, **minimums):
+    """One row per player totalled over the season range, ranked by `sort`."""
+    season_model = SEASON_MODELS[stat_type]
+    totals = _totals(stat_type, func.sum)
+    career = select(
+        season_model.player_id,
+        func.min(season_model.season).label('first_season'),
+        func.max(season_model.season).label('last_season'),
+        func.count().label('seasons'),
+        *(expression.label(name) for name, expression in totals.items())
+    ).where(and_(True, *_season_range(season_model, season_from, season_to))) \
+     .group_by(season_model.player_id)
+    return ranked_rows(career.subquery(), stat_type, sort, descending, team, **minimums)
+
+
+def best_seasons_query(stat_type, sort, descending=True, per_player=1, season_from=None,
+                       season_to=None, team=None, **minimums):
+    """Each player's `per_player` best seasons by `sort`, ranked across players."""
+    season_model = SEASON_MODELS[stat_type]
+    key = getattr(season_model, sort)
+    columns = [getattr(season_model, name) for name in AGGREGATES[stat_type]()]
+    criteria = _season_range(season_model, season_from, season_to) + [
+        getattr(season_model, column) >= minimums[arg]
+        for arg, column in MINIMUM_FILTERS[stat_type].items() if minimums.get(arg)
+    ]
+    seasons = select(
+        season_model.player_id,
+        season_model.season,
+        func.row_number().over(
+            partition_by=season_model.player_id,
+            order_by=(_rank_key(key, descending), season_model.season)
+        ).label('player_rank'),
+        *columns
+    ).where(and_(True, *criteria)).subquery()
+
+    best = select(seasons).where(seasons.c.player_rank <= per_player).subquery()
+    return ranked_rows(best, stat_type, sort, descending, team, ties=['season'])
@@ -0,0 +1,48 @@
+"""Flask JSON provider backed by orjson when it is installed.
+
+orjson encodes the plain dict/list rows the API builds several times
+faster than the standard library. Output matches Flask's default provider
+(sorted keys, compact separators, HTTP dates for datetimes, the same
+fallbacks for Decimal, UUID and dataclasses), except that non-ASCII text
+is written as UTF-8 instead of \\u escapes. Without orjson the default
+provider is used unchanged.
+"""
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+
+if orjson is not None:
+    OPTIONS = (
+        orjson.OPT_SORT_KEYS
+        | orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_SERIALIZE_NUMPY
+    )
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    def dumps_bytes(self, obj):
+        """UTF-8 encoded JSON for `obj`."""
+        if orjson is None:
+            return self.dumps(obj).encode()
+        return orjson.dumps(obj, default=self.default, option=OPTIONS)
+
+    def dumps(self, obj, **kwargs):
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        return self.dumps_bytes(obj).decode()
+
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # Skip the str round trip: the response body is the encoded bytes
+        if orjson is None or self._app.debug:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.dumps_bytes(obj), mimetype=self.mimetype)
@@ -0,0 +1,8 @@
+"""Page size of the list endpoints."""
+from flask import current_app, request
+
+
+def page_limit():
+    """?limit= (ITEMS_PER_PAGE when absent) clamped to 1..MAX_ITEMS_PER_PAGE."""
+    limit = request.args.get('limit', current_app.config['ITEMS_PER_PAGE'], type=int)
+    return max(1, min(limit, current_app.config['MAX_ITEMS_PER_PAGE']))
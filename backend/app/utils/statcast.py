@@ -1,12 +1,27 @@
+import calendar
 import requests
-from datetime import datetime
+from datetime import date, datetime
 from flask import current_app
-from app.models import Player, Team, Game, BattingStats, PitchingStats
-from app import db
+from app.services.http_cache import response_cache
+from app.services.ingest import bulk_upsert_game_stats
+from app.services.pitch_store import pitch_store
+from app.services.response_cache import invalidate
+from app.utils.streaming import READERS, content_format, decode_chunks
 
-def get_statcast_data(stat_type, season=None, start_date=None, end_date=None, team_ids=None, player_ids=None):
+# Bytes read from the HTTP body at a time when streaming
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# API resource per kind of data: per-game lines or pitch-level events
+RESOURCES = {'batting': 'batting', 'pitching': 'pitching', 'pitches': 'pitches'}
+
+# Months with regular-season or postseason games
+SEASON_MONTHS = range(3, 12)
+
+def _statcast_request(stat_type, season=None, start_date=None, end_date=None, team_ids=None, player_ids=None):
     """
-    Fetch data from Statcast API and process it for our application.
+    Open a streamed request against the Statcast API.
+    
+    Returns the response's content type, encoding and an iterator of body chunks.
     """
     headers = {
         'Authorization': f'Bearer {current_app.config["STATCAST_API_KEY"]}'
@@ -26,29 +41,67 @@ def get_statcast_data(stat_type, season=None, start_date=None, end_date=None, te
         params['player_ids'] = ','.join(player_ids)
     
     # Determine endpoint based on stat type
-    endpoint = f"{current_app.config['STATCAST_API_URL']}/{'batting' if stat_type == 'batting' else 'pitching'}"
+    endpoint = f"{current_app.config['STATCAST_API_URL']}/{RESOURCES.get(stat_type, 'pitching')}"
     
-    try:
-        response = requests.get(endpoint, headers=headers, params=params)
+    def open_response():
+        response = requests.get(endpoint, headers=headers, params=params, stream=True)
         response.raise_for_status()
-        data = response.json()
-        
-        # Process and format the data
-        return process_statcast_data(data, stat_type)
+        return response
+    
+    # (content_type, encoding, byte chunks), through the on-disk cache when enabled
+    cache = response_cache()
+    if cache is not None:
+        return cache.stream(endpoint, params, open_response, STREAM_CHUNK_SIZE)
+    response = open_response()
+    return (
+        response.headers.get('Content-Type'),
+        response.encoding,
+        response.iter_content(chunk_size=STREAM_CHUNK_SIZE)
+    )
+
+def stream_statcast_data(stat_type, season=None, start_date=None, end_date=None, team_ids=None, player_ids=None):
+    """
+    Fetch Statcast data and yield processed records as the body arrives.
+    
+    JSON arrays, NDJSON and CSV bodies are decoded incrementally (chosen by
+    Content-Type), so memory use does not depend on the size of the range.
+    """
+    try:
+        content_type, encoding, chunks = _statcast_request(
+            stat_type, season, start_date, end_date, team_ids, player_ids
+        )
+        reader = READERS[content_format(content_type)]
+        text_chunks = decode_chunks(chunks, encoding or 'utf-8')
+        yield from process_statcast_records(reader(text_chunks), stat_type, season)
     except requests.exceptions.RequestException as e:
         current_app.logger.error(f"Error fetching Statcast data: {str(e)}")
         raise
 
-def process_statcast_data(data, stat_type):
+def get_statcast_data(stat_type, season=None, start_date=None, end_date=None, team_ids=None, player_ids=None):
     """
-    Process raw Statcast data into our application's format.
+    Fetch data from Statcast API and process it for our application.
+    """
+    return list(stream_statcast_data(stat_type, season, start_date, end_date, team_ids, player_ids))
+
+def sync_statcast_data(stat_type, season=None, start_date=None, end_date=None, team_ids=None, player_ids=None):
+    """
+    Stream Statcast data straight into the batched database writer.
+    """
+    records = stream_statcast_data(stat_type, season, start_date, end_date, team_ids, player_ids)
+    return update_local_database(stat_type, records)
+
+def process_statcast_records(data, stat_type, season=None):
     """
-    processed_data = []
+    Lazily process raw Statcast records into our application's format.
     
+    `season` fills in records that do not carry their own.
+    """
     for item in data:
         if stat_type == 'batting':
             processed_item = {
                 'player_id': item.get('player_id'),
+                'game_id': item.get('game_id'),
+                'season': item.get('season', season),
                 'name': item.get('player_name'),
                 'team': item.get('team'),
                 'games': item.get('games'),
@@ -64,6 +117,8 @@ def process_statcast_data(data, stat_type):
         else:  # pitching
             processed_item = {
                 'player_id': item.get('player_id'),
+                'game_id': item.get('game_id'),
+                'season': item.get('season', season),
                 'name': item.get('player_name'),
                 'team': item.get('team'),
                 'games': item.get('games'),
@@ -78,39 +133,69 @@ def process_statcast_data(data, stat_type):
                 'spin_rate': item.get('spin_rate')
             }
         
-        processed_data.append(processed_item)
+        yield processed_item
+
+def _number(value, kind):
+    """CSV bodies carry every value as text; empty means missing."""
+    if value is None or value == '':
+        return None
+    return kind(value)
+
+def process_statcast_pitches(data):
+    """
+    Lazily map raw pitch records (Baseball Savant column names) to pitch store events.
+    """
+    for item in data:
+        game_date = date.fromisoformat(str(item['game_date'])[:10])
+        yield {
+            'season': game_date.year,
+            'month': game_date.month,
+            'game_id': _number(item.get('game_pk'), int),
+            'game_date': game_date,
+            'pitcher_id': _number(item.get('pitcher'), int),
+            'batter_id': _number(item.get('batter'), int),
+            'pitch_type': item.get('pitch_type') or None,
+            'events': item.get('events') or None,
+            'velocity': _number(item.get('release_speed'), float),
+            'spin_rate': _number(item.get('release_spin_rate'), float),
+            'exit_velocity': _number(item.get('launch_speed'), float),
+            'launch_angle': _number(item.get('launch_angle'), float)
+        }
+
+def load_statcast_pitches(season, months=SEASON_MONTHS):
+    """
+    Stream a season's pitches into the Parquet pitch store, one month per request.
     
-    return processed_data
+    Each month loaded replaces that month's partition. Returns the events written.
+    """
+    store = pitch_store()
+    if store is None:
+        raise RuntimeError('The pitch store needs pyarrow and STATCAST_STORE_PATH')
+
+    written = 0
+    for month in months:
+        last_day = calendar.monthrange(season, month)[1]
+        content_type, encoding, chunks = _statcast_request(
+            'pitches', season, date(season, month, 1).isoformat(),
+            date(season, month, last_day).isoformat()
+        )
+        reader = READERS[content_format(content_type)]
+        records = reader(decode_chunks(chunks, encoding or 'utf-8'))
+        written += store.write(process_statcast_pitches(records))
+    invalidate('statcast')
+    return written
+
+def process_statcast_data(data, stat_type, season=None):
+    """
+    Process raw Statcast data into our application's format.
+    """
+    return list(process_statcast_records(data, stat_type, season))
 
 def update_local_database(stat_type, data):
     """
     Update local database with new Statcast data.
-    """
-    for item in data:
-        if stat_type == 'batting':
-            stats = BattingStats(
-                player_id=item['player_id'],
-                game_id=item['game_id'],
-                at_bats=item['at_bats'],
-                hits=item['hits'],
-                runs=item['runs'],
-                rbis=item['rbis'],
-                home_runs=item['home_runs'],
-                batting_average=item['batting_average']
-            )
-        else:  # pitching
-            stats = PitchingStats(
-                player_id=item['player_id'],
-                game_id=item['game_id'],
-                innings_pitched=item['innings_pitched'],
-                hits_allowed=item['hits_allowed'],
-                runs_allowed=item['runs_allowed'],
-                earned_runs=item['earned_runs'],
-                walks=item['walks'],
-                strikeouts=item['strikeouts'],
-                era=item['era']
-            )
-        
-        db.session.add(stats)
     
-    db.session.commit() 
\ No newline at end of file
+    Rows are upserted in committed batches (see app.services.ingest), so
+    `data` can be a generator of any size.
+    """
+    return bulk_upsert_game_stats(stat_type, data)
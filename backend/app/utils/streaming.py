@@ -0,0 +1,122 @@
+"""Incremental decoders and encoders for HTTP bodies too large to buffer.
+
+Each reader takes an iterable of text chunks (as produced by
+decode_chunks) and yields one record at a time, so only the current chunk
+and a partially received record are held in memory. The writers do the
+reverse for responses, yielding text as records are produced.
+"""
+import codecs
+import csv
+import json
+
+CONTENT_FORMATS = {
+    'application/x-ndjson': 'ndjson',
+    'application/jsonl': 'ndjson',
+    'text/csv': 'csv',
+    'application/json': 'json'
+}
+
+
+def content_format(content_type, default='json'):
+    """Map a Content-Type header to one of the reader names below."""
+    media_type = (content_type or '').split(';')[0].strip().lower()
+    return CONTENT_FORMATS.get(media_type, default)
+
+
+def decode_chunks(byte_chunks, encoding='utf-8'):
+    """Decode byte chunks to text without splitting multi-byte characters."""
+    decoder = codecs.getincrementaldecoder(encoding)()
+    for chunk in byte_chunks:
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+    tail = decoder.decode(b'', final=True)
+    if tail:
+        yield tail
+
+
+def iter_lines(text_chunks):
+    pending = ''
+    for chunk in text_chunks:
+        pending += chunk
+        *lines, pending = pending.split('\n')
+        yield from lines
+    if pending:
+        yield pending
+
+
+def iter_json_array(text_chunks):
+    """Yield the elements of a top-level JSON array of objects."""
+    decoder = json.JSONDecoder()
+    buffer = ''
+    opened = False
+
+    for chunk in text_chunks:
+        buffer += chunk
+        position = 0
+        while True:
+            while position < len(buffer) and buffer[position] in ' \t\r\n,':
+                position += 1
+            if position == len(buffer):
+                break
+            if not opened:
+                if buffer[position] != '[':
+                    raise ValueError('Expected a JSON array')
+                opened = True
+                position += 1
+                continue
+            if buffer[position] == ']':
+                return
+            try:
+                item, position = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                # The element continues in the next chunk
+                break
+            yield item
+        buffer = buffer[position:]
+
+    if opened:
+        raise ValueError('Unterminated JSON array')
+
+
+def iter_ndjson(text_chunks):
+    for line in iter_lines(text_chunks):
+        if line.strip():
+            yield json.loads(line)
+
+
+def _csv_value(value):
+    if value == '':
+        return None
+    for cast in (int, float):
+        try:
+            return cast(value)
+        except ValueError:
+            pass
+    return value
+
+
+def iter_csv(text_chunks):
+    for row in csv.DictReader(iter_lines(text_chunks)):
+        yield {key: _csv_value(value) for key, value in row.items()}
+
+
+READERS = {
+    'json': iter_json_array,
+    'ndjson': iter_ndjson,
+    'csv': iter_csv
+}
+
+
+def write_ndjson(records, dumps=json.dumps):
+    for record in records:
+        yield dumps(record) + '\n'
+
+
+def write_json_envelope(records, dumps=json.dumps, **fields):
+    """Yield `{**fields, "data": [records...]}` as JSON, one record at a time."""
+    head = dumps(fields)
+    yield (head[:-1] + ', ' if fields else '{') + '"data": ['
+    for index, record in enumerate(records):
+        yield (',' if index else '') + dumps(record)
+    yield ']}'
@@ -0,0 +1,88 @@
+"""Rows/sec for the bulk ingestion path on a synthetic season.
+
+    python -m benchmarks.ingest --rows 1000000
+
+Uses a throwaway SQLite file unless BENCH_DATABASE_URL points elsewhere
+(for example an empty PostgreSQL database, to measure the COPY path).
+"""
+import argparse
+import os
+import tempfile
+import time
+from datetime import date, timedelta
+from sqlalchemy import insert
+from app import create_app, db
+from app.models import Player, Game
+from app.services.ingest import bulk_upsert_game_stats
+from app.services.season_totals import rebuild_season_totals
+from config import Config
+
+
+def synthetic_season(rows, players):
+    """One batting line per player per game, generated lazily."""
+    for i in range(rows):
+        yield {
+            'player_id': i % players + 1,
+            'game_id': i // players + 1,
+            'season': 2024,
+            'at_bats': 4,
+            'hits': i % 3,
+            'runs': i % 2,
+            'rbis': i % 2,
+            'home_runs': 1 if i % 25 == 0 else 0,
+            'batting_average': None
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--players', type=int, default=1500)
+    parser.add_argument('--chunk-size', type=int, default=None)
+    args = parser.parse_args()
+
+    database_url = os.environ.get('BENCH_DATABASE_URL')
+    workdir = tempfile.TemporaryDirectory()
+
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = database_url or f'sqlite:///{workdir.name}/bench.db'
+
+    app = create_app(BenchConfig)
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+
+        games = -(-args.rows // args.players)
+        db.session.execute(insert(Player), [
+            {'id': i + 1, 'name': f'Player {i + 1}'} for i in range(args.players)
+        ])
+        db.session.execute(insert(Game), [
+            {'id': i + 1, 'date': date(2024, 3, 28) + timedelta(days=i % 186)}
+            for i in range(games)
+        ])
+        db.session.commit()
+
+        started = time.perf_counter()
+        written = bulk_upsert_game_stats(
+            'batting',
+            synthetic_season(args.rows, args.players),
+            chunk_size=args.chunk_size,
+            refresh_totals=False
+        )
+        load_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        season_rows = rebuild_season_totals('batting', season=2024)
+        db.session.commit()
+        rebuild_seconds = time.perf_counter() - started
+
+        print(f'{db.engine.dialect.name}: {written} rows in {load_seconds:.1f}s '
+              f'({written / load_seconds:,.0f} rows/sec)')
+        print(f'season totals rebuild: {season_rows} rows in {rebuild_seconds:.2f}s')
+
+        db.drop_all()
+    workdir.cleanup()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""Leaderboard latency: columnar snapshot vs the SQL path.
+
+    python -m benchmarks.leaderboard --seasons 15 --players 1500
+
+Season-totals rows are written straight into PlayerSeasonBatting in a
+throwaway SQLite file (or BENCH_DATABASE_URL), then each query is timed
+through leaderboard_rows/leaderboard_percentiles with the snapshot
+switched off and on. Needs numpy.
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from sqlalchemy import insert
+from app import create_app, db
+from app.models import Player, Team, PlayerSeasonBatting
+from app.services.leaderboard import leaderboard_percentiles, leaderboard_rows
+from config import Config
+
+QUERIES = {
+    'top 10 AVG in one season': lambda last: leaderboard_rows(
+        'batting', {'season': last, 'min_at_bats': 300}, 'batting_average', True, limit=10),
+    'top 10 HR over all seasons': lambda last: leaderboard_rows(
+        'batting', {}, 'home_runs', True, limit=10),
+    'one team, one season': lambda last: leaderboard_rows(
+        'batting', {'season': last, 'team': 'T07'}, limit=50),
+    'HR percentiles, all seasons': lambda last: leaderboard_percentiles(
+        'batting', 'home_runs', [50.0, 90.0, 99.0], {}),
+}
+
+
+def synthetic_totals(seasons, players, first_season=2000):
+    rng = random.Random(7)
+    for season in range(first_season, first_season + seasons):
+        for player_id in range(1, players + 1):
+            at_bats = rng.randint(0, 650)
+            hits = int(at_bats * rng.uniform(0.18, 0.33))
+            yield {
+                'player_id': player_id, 'season': season,
+                'games': min(162, at_bats // 4), 'at_bats': at_bats, 'hits': hits,
+                'runs': hits // 2, 'rbis': hits // 2, 'home_runs': rng.randint(0, hits // 4 + 1),
+                'batting_average': hits / at_bats if at_bats else None
+            }
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--seasons', type=int, default=15)
+    parser.add_argument('--players', type=int, default=1500)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    database_url = os.environ.get('BENCH_DATABASE_URL')
+    workdir = tempfile.TemporaryDirectory()
+
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = database_url or f'sqlite:///{workdir.name}/bench.db'
+        CACHE_TYPE = 'NullCache'
+        COLUMNAR_SNAPSHOT = False
+        COLUMNAR_BACKGROUND_REFRESH = False
+
+    app = create_app(BenchConfig)
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        db.session.execute(insert(Team), [
+            {'id': i + 1, 'name': f'Team {i}', 'abbreviation': f'T{i:02d}'} for i in range(30)
+        ])
+        db.session.execute(insert(Player), [
+            {'id': i + 1, 'name': f'Player {i + 1}', 'team_id': i % 30 + 1}
+            for i in range(args.players)
+        ])
+        db.session.execute(insert(PlayerSeasonBatting), list(synthetic_totals(args.seasons, args.players)))
+        db.session.commit()
+        last = 2000 + args.seasons - 1
+
+        started = time.perf_counter()
+        app.config['COLUMNAR_SNAPSHOT'] = True
+        app.extensions['columnar'].refresh()
+        load_ms = (time.perf_counter() - started) * 1000
+        print(f'{db.engine.dialect.name}: {args.seasons * args.players:,} season rows, '
+              f'snapshot load {load_ms:.0f} ms')
+
+        for name, query in QUERIES.items():
+            app.config['COLUMNAR_SNAPSHOT'] = False
+            sql_ms = timed(lambda: query(last), args.repeat)
+            app.config['COLUMNAR_SNAPSHOT'] = True
+            snapshot_ms = timed(lambda: query(last), args.repeat)
+            print(f'{name:30} sql {sql_ms:8.2f} ms   columnar {snapshot_ms:7.2f} ms   '
+                  f'{sql_ms / snapshot_ms:5.1f}x')
+
+        db.drop_all()
+    workdir.cleanup()
+
+
+if __name__ == '__main__':
+    main()
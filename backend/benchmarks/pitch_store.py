@@ -0,0 +1,67 @@
+"""Full-season aggregate scans over the Parquet pitch store.
+
+    python -m benchmarks.pitch_store --pitches 700000 --workers 4
+
+Writes a synthetic season of pitch events (every third one a batted ball)
+to a throwaway directory and times the average-exit-velocity leaderboard
+and a one-month, one-pitch-type scan, in one process and in a pool.
+"""
+import argparse
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+from app.services.pitch_store import PitchStore
+from benchmarks.leaderboard import timed
+
+
+def synthetic_pitches(pitches, batters=700, pitchers=800, seed=7):
+    """Pitch events spread over a season's days, generated lazily."""
+    rng = random.Random(seed)
+    opening_day = date(2024, 3, 28)
+    for i in range(pitches):
+        day = opening_day + timedelta(days=i * 186 // pitches)
+        batted = i % 3 == 0
+        yield {
+            'season': day.year, 'month': day.month, 'game_id': 745000 + i // 300,
+            'game_date': day, 'pitcher_id': 1 + i % pitchers, 'batter_id': 1 + i % batters,
+            'pitch_type': rng.choice(('FF', 'SI', 'SL', 'CH', 'CU')),
+            'events': 'field_out' if batted else None,
+            'velocity': rng.gauss(92, 4), 'spin_rate': rng.gauss(2300, 200),
+            'exit_velocity': rng.gauss(89, 12) if batted else None,
+            'launch_angle': rng.gauss(12, 25) if batted else None
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pitches', type=int, default=700_000)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        store = PitchStore(workdir)
+        started = time.perf_counter()
+        written = store.write(synthetic_pitches(args.pitches))
+        print(f'wrote {written:,} pitches in {time.perf_counter() - started:.1f}s, '
+              f'{len(store.files(2024))} files')
+
+        scans = {
+            'exit velocity, min 100 BBE': lambda workers: store.leaders(
+                'exit_velocity', 2024, min_events=100, workers=workers),
+            'four-seam velocity, June': lambda workers: store.leaders(
+                'velocity', 2024, month=6, pitch_type='FF', workers=workers),
+        }
+        # The pool outlives a scan; start its workers before timing
+        store.averages('velocity', 2024, workers=args.workers)
+        for name, scan in scans.items():
+            single = timed(lambda: scan(1), args.repeat)
+            pooled = timed(lambda: scan(args.workers), args.repeat)
+            print(f'{name:28} 1 process {single:7.1f} ms   '
+                  f'{args.workers} processes {pooled:7.1f} ms')
+        store.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+"""Player-name search latency: in-memory index vs ILIKE '%q%'.
+
+    python -m benchmarks.player_search --players 25000
+
+Synthetic first/last name combinations (with accented surnames) are
+written to a throwaway SQLite file (or BENCH_DATABASE_URL). Queries mix
+prefixes of the kind typed into the search box, unaccented full names
+and one-letter typos; p50/p99 are reported per approach.
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from sqlalchemy import insert
+from app import create_app, db
+from app.models import Player
+from app.services.player_index import PlayerNameIndex, fold
+from config import Config
+
+FIRST_NAMES = [
+    'Aaron', 'Adrián', 'Albert', 'Andrés', 'Bobby', 'Carlos', 'Christian', 'Clayton',
+    'Corey', 'Dansby', 'Eugenio', 'Félix', 'Francisco', 'Freddie', 'Gleyber', 'Héctor',
+    'Iván', 'José', 'Juan', 'Julio', 'Justin', 'Kyle', 'Luis', 'Manny', 'Max', 'Miguel',
+    'Mookie', 'Nolan', 'Óscar', 'Pete', 'Rafael', 'Ramón', 'Ronald', 'Shohei', 'Teoscar',
+    'Trea', 'Vladimir', 'Walker', 'Will', 'Yordan'
+]
+LAST_NAMES = [
+    'Acuña', 'Alonso', 'Álvarez', 'Arenado', 'Betts', 'Bichette', 'Buehler', 'Castillo',
+    'Correa', 'Díaz', 'Freeman', 'García', 'González', 'Guerrero', 'Harper', 'Hernández',
+    'Judge', 'Kershaw', 'Lindor', 'López', 'Machado', 'Martínez', 'Muñoz', 'Núñez',
+    'Ohtani', 'Ortiz', 'Peña', 'Pérez', 'Ramírez', 'Rodríguez', 'Sánchez', 'Scherzer',
+    'Seager', 'Smith', 'Soto', 'Suárez', 'Tatís', 'Trout', 'Turner', 'Verlander'
+]
+
+
+def synthetic_names(count, rng):
+    """`count` names; pairs repeat with a generational suffix once exhausted."""
+    suffixes = ['', ' Jr.', ' II', ' III', ' IV', ' Sr.']
+    pairs = [(first, last) for first in FIRST_NAMES for last in LAST_NAMES]
+    names = []
+    for i in range(count):
+        first, last = pairs[i % len(pairs)]
+        middle = chr(ord('A') + rng.randrange(26))
+        names.append(f'{first} {middle}. {last}{suffixes[(i // len(pairs)) % len(suffixes)]}')
+    return names
+
+
+def typo(text, rng):
+    i = rng.randrange(1, len(text))
+    return text[:i] + rng.choice('aeiou') + text[i + 1:]
+
+
+def sample_queries(names, count, rng):
+    queries = []
+    for _ in range(count):
+        name = fold(rng.choice(names))
+        last = name.split()[-1] if len(name.split()[-1]) > 3 else name.split()[-2]
+        kind = rng.randrange(3)
+        if kind == 0:
+            queries.append(name[:rng.randint(2, 8)])
+        elif kind == 1:
+            queries.append(f'{name.split()[0]} {last}')
+        else:
+            queries.append(typo(last, rng))
+    return queries
+
+
+def percentiles(samples):
+    ordered = sorted(samples)
+    return statistics.median(ordered), ordered[int(len(ordered) * 0.99) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--players', type=int, default=25_000)
+    parser.add_argument('--queries', type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(11)
+    database_url = os.environ.get('BENCH_DATABASE_URL')
+    workdir = tempfile.TemporaryDirectory()
+
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = database_url or f'sqlite:///{workdir.name}/bench.db'
+        COLUMNAR_SNAPSHOT = False
+
+    app = create_app(BenchConfig)
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        names = synthetic_names(args.players, rng)
+        db.session.execute(insert(Player), [
+            {'id': i + 1, 'name': name} for i, name in enumerate(names)
+        ])
+        db.session.commit()
+        queries = sample_queries(names, args.queries, rng)
+
+        started = time.perf_counter()
+        index = PlayerNameIndex(db.session.query(Player.id, Player.name))
+        print(f'{args.players:,} players, index built in {(time.perf_counter() - started) * 1000:.0f} ms')
+
+        timings = {'index': [], 'ilike': []}
+        for query in queries:
+            started = time.perf_counter()
+            index.search(query, 10)
+            timings['index'].append((time.perf_counter() - started) * 1000)
+
+            started = time.perf_counter()
+            Player.query.filter(Player.name.ilike(f'%{query}%')).limit(10).all()
+            timings['ilike'].append((time.perf_counter() - started) * 1000)
+            db.session.expunge_all()
+
+        for name, samples in timings.items():
+            p50, p99 = percentiles(samples)
+            print(f'{name:6} p50 {p50:7.3f} ms   p99 {p99:7.3f} ms')
+
+        db.drop_all()
+    workdir.cleanup()
+
+
+if __name__ == '__main__':
+    main()
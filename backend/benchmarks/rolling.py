@@ -0,0 +1,84 @@
+"""Last-N-days leaderboards and rolling series over a full season of game logs.
+
+    python -m benchmarks.rolling --games 162 --players 1500
+
+Writes a synthetic season (see benchmarks.ingest) to a throwaway SQLite
+file (or BENCH_DATABASE_URL) and times the hottest-hitters leaderboard and
+one player's rolling series from SQL and from the in-memory game log.
+"""
+import argparse
+import os
+import tempfile
+import time
+from datetime import date, timedelta
+from sqlalchemy import insert
+from app import create_app, db
+from app.models import Player, Team, Game
+from app.services.game_logs import game_log
+from app.services.ingest import bulk_upsert_game_stats
+from app.services.rolling import hot_leaders, latest_game_date, player_rolling
+from benchmarks.ingest import synthetic_season
+from benchmarks.leaderboard import timed
+from config import Config
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--games', type=int, default=162)
+    parser.add_argument('--players', type=int, default=1500)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    database_url = os.environ.get('BENCH_DATABASE_URL')
+    workdir = tempfile.TemporaryDirectory()
+
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = database_url or f'sqlite:///{workdir.name}/bench.db'
+        CACHE_TYPE = 'NullCache'
+        COLUMNAR_SNAPSHOT = False
+        UPSTREAM_CACHE_PATH = None
+
+    app = create_app(BenchConfig)
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        db.session.execute(insert(Team), [
+            {'id': i + 1, 'name': f'Team {i}', 'abbreviation': f'T{i:02d}'} for i in range(30)
+        ])
+        db.session.execute(insert(Player), [
+            {'id': i + 1, 'name': f'Player {i + 1}', 'team_id': i % 30 + 1}
+            for i in range(args.players)
+        ])
+        db.session.execute(insert(Game), [
+            {'id': i + 1, 'date': date(2024, 3, 28) + timedelta(days=i * 186 // args.games)}
+            for i in range(args.games)
+        ])
+        db.session.commit()
+        rows = bulk_upsert_game_stats(
+            'batting', synthetic_season(args.games * args.players, args.players)
+        )
+        as_of = latest_game_date()
+        print(f'{db.engine.dialect.name}: {rows:,} game rows, as of {as_of}')
+
+        queries = {
+            'hottest last 7 days': lambda: hot_leaders('batting', as_of, 7, 'hits'),
+            'hottest last 30 days': lambda: hot_leaders(
+                'batting', as_of, 30, 'batting_average', min_at_bats=50),
+            '14-day series, 1 player': lambda: player_rolling('batting', 1, 2024, 14),
+        }
+        sql = {name: timed(query, args.repeat) for name, query in queries.items()}
+
+        app.config['COLUMNAR_SNAPSHOT'] = True
+        started = time.perf_counter()
+        game_log(app, 'batting', 2024)
+        print(f'game log load: {time.perf_counter() - started:.2f}s')
+        for name, query in queries.items():
+            arrays = timed(query, args.repeat)
+            print(f'{name:26} sql {sql[name]:8.1f} ms   arrays {arrays:6.1f} ms')
+
+        db.drop_all()
+    workdir.cleanup()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""Rows/sec serializing per-game stat lines: ORM to_dict() merging vs Core rows.
+
+    python -m benchmarks.serialization --rows 100000
+
+"before" loads BattingStats objects with their players, merges
+player.to_dict() and stat.to_dict() per row and encodes with Flask's
+default (stdlib) JSON provider. "after" selects the same columns as plain
+Core rows, takes row._asdict() and encodes with FastJSONProvider (orjson
+when installed). Fetch, build and encode are timed separately.
+"""
+import argparse
+import os
+import tempfile
+import time
+from datetime import date, timedelta
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import insert
+from sqlalchemy.orm import joinedload
+from app import create_app, db
+from app.api.statistics import stat_columns
+from app.models import Player, Game, BattingStats
+from app.utils.fast_json import FastJSONProvider, orjson
+from benchmarks.ingest import synthetic_season
+from config import Config
+
+
+def orm_path(provider):
+    stats = BattingStats.query.options(joinedload(BattingStats.player)).all()
+    built = time.perf_counter()
+    rows = [{**stat.player.to_dict(), **stat.to_dict()} for stat in stats]
+    encoded = time.perf_counter()
+    provider.dumps({'success': True, 'data': rows})
+    return built, encoded
+
+
+def core_path(provider):
+    query = db.session.query(
+        Player.name,
+        Player.position,
+        *stat_columns(BattingStats)
+    ).join(Player, Player.id == BattingStats.player_id)
+    results = query.all()
+    built = time.perf_counter()
+    rows = [row._asdict() for row in results]
+    encoded = time.perf_counter()
+    provider.dumps_bytes({'success': True, 'data': rows})
+    return built, encoded
+
+
+def measure(path, provider, repeat):
+    """Best-of-`repeat` (fetch, build, encode) seconds."""
+    best = None
+    for _ in range(repeat):
+        db.session.expunge_all()
+        started = time.perf_counter()
+        built, encoded = path(provider)
+        finished = time.perf_counter()
+        timings = (built - started, encoded - built, finished - encoded)
+        best = timings if best is None or sum(timings) < sum(best) else best
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--players', type=int, default=1500)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    database_url = os.environ.get('BENCH_DATABASE_URL')
+    workdir = tempfile.TemporaryDirectory()
+
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = database_url or f'sqlite:///{workdir.name}/bench.db'
+        COLUMNAR_SNAPSHOT = False
+        UPSTREAM_CACHE_PATH = None
+
+    app = create_app(BenchConfig)
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        games = -(-args.rows // args.players)
+        db.session.execute(insert(Player), [
+            {'id': i + 1, 'name': f'Player {i + 1}', 'position': 'SS'} for i in range(args.players)
+        ])
+        db.session.execute(insert(Game), [
+            {'id': i + 1, 'date': date(2024, 3, 28) + timedelta(days=i % 186)} for i in range(games)
+        ])
+        db.session.execute(insert(BattingStats), list(synthetic_season(args.rows, args.players)))
+        db.session.commit()
+
+        print(f'{args.rows:,} rows, orjson {"installed" if orjson else "missing"}')
+        paths = {
+            'before (ORM + to_dict + json)': (orm_path, DefaultJSONProvider(app)),
+            'after (Core rows + fast json)': (core_path, FastJSONProvider(app))
+        }
+        for name, (path, provider) in paths.items():
+            fetch, build, encode = measure(path, provider, args.repeat)
+            total = fetch + build + encode
+            print(f'{name:31} fetch {fetch * 1000:6.0f} ms  build {build * 1000:5.0f} ms  '
+                  f'encode {encode * 1000:5.0f} ms  {args.rows / total:9,.0f} rows/s')
+
+        db.drop_all()
+    workdir.cleanup()
+
+
+if __name__ == '__main__':
+    main()
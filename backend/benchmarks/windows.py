@@ -0,0 +1,86 @@
+"""Multi-season window queries over 50 seasons of season totals.
+
+    python -m benchmarks.windows --seasons 50 --players 1500
+
+Writes synthetic PlayerSeasonBatting rows (see benchmarks.leaderboard) to
+a throwaway SQLite file (or BENCH_DATABASE_URL) and times each window
+query, plus the same career-to-date leaderboard computed in Python from
+every season row as a baseline.
+"""
+import argparse
+import os
+import tempfile
+from collections import defaultdict
+from sqlalchemy import insert
+from app import create_app, db
+from app.models import Player, Team, PlayerSeasonBatting
+from app.services.aggregates import season_totals_query
+from app.services.leaderboard import leaderboard_rows
+from app.services.windows import best_seasons_query, career_totals_query, running_totals_query
+from benchmarks.leaderboard import synthetic_totals, timed
+from config import Config
+
+
+def python_career_to_date(last):
+    """Top 10 career-to-date home run totals as of `last`, summed in Python."""
+    totals = defaultdict(int)
+    for row in season_totals_query('batting', season_to=last):
+        totals[row.player_id] += row.home_runs or 0
+    return sorted(totals.items(), key=lambda item: -item[1])[:10]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--seasons', type=int, default=50)
+    parser.add_argument('--players', type=int, default=1500)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    database_url = os.environ.get('BENCH_DATABASE_URL')
+    workdir = tempfile.TemporaryDirectory()
+
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = database_url or f'sqlite:///{workdir.name}/bench.db'
+        CACHE_TYPE = 'NullCache'
+        COLUMNAR_SNAPSHOT = False
+        UPSTREAM_CACHE_PATH = None
+
+    app = create_app(BenchConfig)
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        db.session.execute(insert(Team), [
+            {'id': i + 1, 'name': f'Team {i}', 'abbreviation': f'T{i:02d}'} for i in range(30)
+        ])
+        db.session.execute(insert(Player), [
+            {'id': i + 1, 'name': f'Player {i + 1}', 'team_id': i % 30 + 1}
+            for i in range(args.players)
+        ])
+        db.session.execute(insert(PlayerSeasonBatting), list(synthetic_totals(args.seasons, args.players)))
+        db.session.commit()
+        first, last = 2000, 2000 + args.seasons - 1
+        print(f'{db.engine.dialect.name}: {args.seasons * args.players:,} season rows, '
+              f'{first}-{last}')
+
+        queries = {
+            'top 10 single seasons, last 15': lambda: leaderboard_rows(
+                'batting', {'season_from': last - 14, 'season_to': last}, 'home_runs', limit=10),
+            'career totals, all seasons': lambda: career_totals_query(
+                'batting', 'home_runs').limit(10).all(),
+            'career-to-date, final season': lambda: running_totals_query(
+                'batting', 'home_runs', season_from=last).limit(10).all(),
+            '3-season rolling, all seasons': lambda: running_totals_query(
+                'batting', 'home_runs', window=3, min_at_bats=1200).limit(10).all(),
+            'best season per player': lambda: best_seasons_query(
+                'batting', 'batting_average', min_at_bats=300).limit(10).all(),
+            'career-to-date in Python': lambda: python_career_to_date(last),
+        }
+        for name, query in queries.items():
+            print(f'{name:32} {timed(query, args.repeat):8.1f} ms')
+
+        db.drop_all()
+    workdir.cleanup()
+
+
+if __name__ == '__main__':
+    main()
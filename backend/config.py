@@ -11,12 +11,68 @@ class Config:
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     
     # Cache configuration
-    CACHE_TYPE = "SimpleCache"  # Using simple cache for local development
+    CACHE_TYPE = os.environ.get('CACHE_TYPE') or "SimpleCache"  # Using simple cache for local development; RedisCache in prod
+    CACHE_REDIS_URL = os.environ.get('REDIS_URL')
     CACHE_DEFAULT_TIMEOUT = 300
     
+    # Response compression (Flask-Compress) for large JSON payloads
+    COMPRESS_ALGORITHM = ['br', 'gzip']
+    COMPRESS_MIMETYPES = ['application/json', 'text/csv']
+    COMPRESS_MIN_SIZE = 2048
+    COMPRESS_STREAMS = False  # compressing a stream would buffer it whole
+    
     # API configuration
     STATCAST_API_KEY = os.environ.get('STATCAST_API_KEY')
     STATCAST_API_URL = os.environ.get('STATCAST_API_URL') or 'https://api.statcast.com/v1'
     
+    # MLB Stats API client
+    MLB_API_TIMEOUT = float(os.environ.get('MLB_API_TIMEOUT') or 10)
+    MLB_API_MAX_RETRIES = 3
+    MLB_API_BACKOFF_FACTOR = 0.5
+    MLB_API_POOL_SIZE = 10
+    MLB_API_RATE_LIMIT = float(os.environ.get('MLB_API_RATE_LIMIT') or 20)  # requests/sec
+    MLB_API_MAX_WORKERS = 8
+    MLB_API_BATCH_SIZE = 50  # players per people?personIds= request
+    MLB_API_PAGE_SIZE = 1000  # game-log splits per page in a full-season sync
+    MLB_API_NEGATIVE_CACHE_TTL = 3600  # seconds to remember lookups that came back empty
+    
+    # On-disk cache of raw MLB/Statcast responses (SQLite file, off unless set); past seasons never expire
+    UPSTREAM_CACHE_PATH = os.environ.get('UPSTREAM_CACHE_PATH') or None
+    UPSTREAM_CACHE_TTL = int(os.environ.get('UPSTREAM_CACHE_TTL') or 900)  # current-season entries
+    UPSTREAM_CACHE_MAX_BYTES = int(os.environ.get('UPSTREAM_CACHE_MAX_BYTES') or 2 * 1024 ** 3)
+    UPSTREAM_CACHE_OFFLINE = os.environ.get('UPSTREAM_CACHE_OFFLINE', '0') == '1'  # replay only
+    
+    # Parquet store of pitch-level Statcast events (needs pyarrow), partitioned by season/month
+    STATCAST_STORE_PATH = os.environ.get('STATCAST_STORE_PATH', os.path.join(basedir, 'statcast_store'))
+    STATCAST_STORE_WORKERS = int(os.environ.get('STATCAST_STORE_WORKERS') or 1)  # processes per scan
+    
+    # Bulk ingestion: rows written (and committed) per batch
+    INGEST_CHUNK_SIZE = int(os.environ.get('INGEST_CHUNK_SIZE') or 5000)
+    
+    # Queued sync jobs (flask sync-worker)
+    SYNC_JOB_LEASE = 900  # seconds before a running job of a crashed worker is reclaimed
+    SYNC_JOB_RETRY_AFTER = 3600  # seconds a finished job answers for its player/season
+    
     # Pagination
-    ITEMS_PER_PAGE = 50 
\ No newline at end of file
+    ITEMS_PER_PAGE = 50
+    MAX_ITEMS_PER_PAGE = 1000
+    STREAM_BATCH_SIZE = 1000  # rows fetched per round trip when streaming
+    
+    # Player comparison (/api/players/compare)
+    COMPARE_MAX_PLAYERS = 25
+    COMPARE_SYNC_MAX_SEASONS = 5  # wider ranges never queue backfills
+    
+    # Columnar (NumPy) snapshot of the season totals for leaderboard reads
+    COLUMNAR_SNAPSHOT = os.environ.get('COLUMNAR_SNAPSHOT', '1') != '0'
+    COLUMNAR_BACKGROUND_REFRESH = True  # rebuild off the request path; serve SQL meanwhile
+    COLUMNAR_VERSION_CHECK_INTERVAL = 2.0  # seconds between database checks for other writers
+
+class TestConfig(Config):
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+    CACHE_TYPE = "NullCache"
+    COLUMNAR_SNAPSHOT = False
+    COLUMNAR_BACKGROUND_REFRESH = False
+    COLUMNAR_VERSION_CHECK_INTERVAL = 0
+    UPSTREAM_CACHE_PATH = None
+    STATCAST_STORE_PATH = None
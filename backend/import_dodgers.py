@@ -1,4 +1,5 @@
 from app import create_app, db
+from app.services.response_cache import invalidate
 from app.models import Team, Player, Game, BattingStats, PitchingStats
 from datetime import datetime
 
@@ -61,6 +62,7 @@ def import_dodgers_stats():
                 db.session.add(player)
         
         db.session.commit()
+        invalidate('players')
         print("Dodgers roster imported successfully!")
 
 if __name__ == '__main__':
@@ -1,4 +1,6 @@
 from app import create_app, db
+from app.services.response_cache import invalidate_seasons
+from app.services.season_totals import refresh_season_totals
 from app.models import Team, Player, Game, BattingStats
 from datetime import datetime
 
@@ -38,7 +40,10 @@ def import_dodgers_stats():
             )
             db.session.add(batting_stats)
         
+        db.session.flush()
+        refresh_season_totals('batting', [(player.id, 2024) for player in players])
         db.session.commit()
+        invalidate_seasons([2024])
         print("Test batting statistics imported successfully!")
 
 if __name__ == '__main__':
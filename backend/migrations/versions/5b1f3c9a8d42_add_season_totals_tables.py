@@ -0,0 +1,54 @@
+"""Add season totals tables
+
+Revision ID: 5b1f3c9a8d42
+Revises: 2673e8ca78fe
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b1f3c9a8d42'
+down_revision = '2673e8ca78fe'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Populate with `flask rebuild-season-totals` after upgrading
+    op.create_table(
+        'player_season_batting',
+        sa.Column('player_id', sa.Integer(), sa.ForeignKey('player.id'), primary_key=True),
+        sa.Column('season', sa.Integer(), primary_key=True),
+        sa.Column('games', sa.Integer()),
+        sa.Column('at_bats', sa.Integer()),
+        sa.Column('hits', sa.Integer()),
+        sa.Column('runs', sa.Integer()),
+        sa.Column('rbis', sa.Integer()),
+        sa.Column('home_runs', sa.Integer()),
+        sa.Column('batting_average', sa.Float()),
+        sa.Column('updated_at', sa.DateTime())
+    )
+
+    op.create_table(
+        'player_season_pitching',
+        sa.Column('player_id', sa.Integer(), sa.ForeignKey('player.id'), primary_key=True),
+        sa.Column('season', sa.Integer(), primary_key=True),
+        sa.Column('games', sa.Integer()),
+        sa.Column('innings_pitched', sa.Float()),
+        sa.Column('hits_allowed', sa.Integer()),
+        sa.Column('runs_allowed', sa.Integer()),
+        sa.Column('earned_runs', sa.Integer()),
+        sa.Column('walks', sa.Integer()),
+        sa.Column('strikeouts', sa.Integer()),
+        sa.Column('era', sa.Float()),
+        sa.Column('strikeouts_per_nine', sa.Float()),
+        sa.Column('updated_at', sa.DateTime())
+    )
+
+
+def downgrade():
+    op.drop_table('player_season_pitching')
+    op.drop_table('player_season_batting')
@@ -0,0 +1,40 @@
+"""Add indexes for the stats filter shapes
+
+Revision ID: 8e2d4a6c1f73
+Revises: 5b1f3c9a8d42
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '8e2d4a6c1f73'
+down_revision = '5b1f3c9a8d42'
+branch_labels = None
+depends_on = None
+
+# (index name, table, columns)
+INDEXES = [
+    ('ix_player_team_id', 'player', ['team_id']),
+    ('ix_team_abbreviation', 'team', ['abbreviation']),
+    ('ix_batting_stats_player_id_season', 'batting_stats', ['player_id', 'season']),
+    ('ix_pitching_stats_player_id_season', 'pitching_stats', ['player_id', 'season']),
+    ('ix_player_season_batting_season_games', 'player_season_batting', ['season', 'games']),
+    ('ix_player_season_batting_season_at_bats', 'player_season_batting', ['season', 'at_bats']),
+    ('ix_player_season_batting_season_hits', 'player_season_batting', ['season', 'hits']),
+    ('ix_player_season_batting_season_home_runs', 'player_season_batting', ['season', 'home_runs']),
+    ('ix_player_season_pitching_season_games', 'player_season_pitching', ['season', 'games']),
+    ('ix_player_season_pitching_season_innings_pitched', 'player_season_pitching', ['season', 'innings_pitched']),
+    ('ix_player_season_pitching_season_strikeouts', 'player_season_pitching', ['season', 'strikeouts']),
+]
+
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
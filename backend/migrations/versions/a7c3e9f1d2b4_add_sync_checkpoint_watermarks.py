@@ -0,0 +1,26 @@
+"""Add watermark columns to sync_checkpoint
+
+Revision ID: a7c3e9f1d2b4
+Revises: f2a6d8c4b1e3
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7c3e9f1d2b4'
+down_revision = 'f2a6d8c4b1e3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('sync_checkpoint', sa.Column('last_game_date', sa.Date(), nullable=True))
+    op.add_column('sync_checkpoint', sa.Column('last_updated', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('sync_checkpoint', 'last_updated')
+    op.drop_column('sync_checkpoint', 'last_game_date')
@@ -0,0 +1,23 @@
+"""Add game date index for date-range and rolling queries
+
+Revision ID: b8d4f0a2c6e7
+Revises: a7c3e9f1d2b4
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'b8d4f0a2c6e7'
+down_revision = 'a7c3e9f1d2b4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_game_date', 'game', ['date'])
+
+
+def downgrade():
+    op.drop_index('ix_game_date', table_name='game')
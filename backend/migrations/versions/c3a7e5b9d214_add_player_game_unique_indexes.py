@@ -0,0 +1,27 @@
+"""Add (player_id, game_id) unique indexes for stats upserts
+
+Revision ID: c3a7e5b9d214
+Revises: 8e2d4a6c1f73
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3a7e5b9d214'
+down_revision = '8e2d4a6c1f73'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('uq_batting_stats_player_id_game_id', 'batting_stats',
+                    ['player_id', 'game_id'], unique=True)
+    op.create_index('uq_pitching_stats_player_id_game_id', 'pitching_stats',
+                    ['player_id', 'game_id'], unique=True)
+
+
+def downgrade():
+    op.drop_index('uq_pitching_stats_player_id_game_id', table_name='pitching_stats')
+    op.drop_index('uq_batting_stats_player_id_game_id', table_name='batting_stats')
@@ -0,0 +1,80 @@
+"""Add per-game team and player split totals tables
+
+Revision ID: c5e1a9d3f7b2
+Revises: b8d4f0a2c6e7
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5e1a9d3f7b2'
+down_revision = 'b8d4f0a2c6e7'
+branch_labels = None
+depends_on = None
+
+STATS_TABLES = ('batting_stats', 'pitching_stats')
+
+
+def _split_key():
+    return [
+        sa.Column('player_id', sa.Integer(), sa.ForeignKey('player.id'), primary_key=True),
+        sa.Column('season', sa.Integer(), primary_key=True),
+        sa.Column('split', sa.String(10), primary_key=True),
+        sa.Column('value', sa.String(10), primary_key=True),
+        sa.Column('games', sa.Integer())
+    ]
+
+
+def upgrade():
+    # Batch mode so SQLite, which cannot add a foreign key in place, copies the table
+    for table in STATS_TABLES:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.add_column(sa.Column('team_id', sa.Integer()))
+            batch_op.create_foreign_key(f'fk_{table}_team_id_team', 'team', ['team_id'], ['id'])
+
+    # Populate with `flask rebuild-season-totals` after upgrading. Existing game
+    # rows have no team_id and stay out of the home/away and opponent splits
+    # until their season is synced again (`flask sync-season`)
+    op.create_table(
+        'player_split_batting',
+        *_split_key(),
+        sa.Column('at_bats', sa.Integer()),
+        sa.Column('hits', sa.Integer()),
+        sa.Column('runs', sa.Integer()),
+        sa.Column('rbis', sa.Integer()),
+        sa.Column('home_runs', sa.Integer()),
+        sa.Column('batting_average', sa.Float()),
+        sa.Column('updated_at', sa.DateTime())
+    )
+    op.create_index('ix_player_split_batting_season_split_value', 'player_split_batting',
+                    ['season', 'split', 'value'])
+
+    op.create_table(
+        'player_split_pitching',
+        *_split_key(),
+        sa.Column('innings_pitched', sa.Float()),
+        sa.Column('hits_allowed', sa.Integer()),
+        sa.Column('runs_allowed', sa.Integer()),
+        sa.Column('earned_runs', sa.Integer()),
+        sa.Column('walks', sa.Integer()),
+        sa.Column('strikeouts', sa.Integer()),
+        sa.Column('era', sa.Float()),
+        sa.Column('strikeouts_per_nine', sa.Float()),
+        sa.Column('updated_at', sa.DateTime())
+    )
+    op.create_index('ix_player_split_pitching_season_split_value', 'player_split_pitching',
+                    ['season', 'split', 'value'])
+
+
+def downgrade():
+    op.drop_index('ix_player_split_pitching_season_split_value', table_name='player_split_pitching')
+    op.drop_table('player_split_pitching')
+    op.drop_index('ix_player_split_batting_season_split_value', table_name='player_split_batting')
+    op.drop_table('player_split_batting')
+    for table in STATS_TABLES:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_constraint(f'fk_{table}_team_id_team', type_='foreignkey')
+            batch_op.drop_column('team_id')
@@ -0,0 +1,37 @@
+"""Add sync_job table
+
+Revision ID: d9f1b7c3e5a6
+Revises: c3a7e5b9d214
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd9f1b7c3e5a6'
+down_revision = 'c3a7e5b9d214'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'sync_job',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('stat_type', sa.String(length=10), nullable=False),
+        sa.Column('season', sa.Integer(), nullable=False),
+        sa.Column('player_id', sa.Integer()),
+        sa.Column('team', sa.String(length=10)),
+        sa.Column('status', sa.String(length=10), nullable=False),
+        sa.Column('error', sa.Text()),
+        sa.Column('created_at', sa.DateTime()),
+        sa.Column('updated_at', sa.DateTime())
+    )
+    op.create_index('ix_sync_job_status', 'sync_job', ['status'])
+
+
+def downgrade():
+    op.drop_index('ix_sync_job_status', table_name='sync_job')
+    op.drop_table('sync_job')
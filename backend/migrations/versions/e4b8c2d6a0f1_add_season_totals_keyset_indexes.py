@@ -0,0 +1,27 @@
+"""Add (season, player_id) indexes for leaderboard keyset pagination
+
+Revision ID: e4b8c2d6a0f1
+Revises: d9f1b7c3e5a6
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4b8c2d6a0f1'
+down_revision = 'd9f1b7c3e5a6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_player_season_batting_season_player_id', 'player_season_batting',
+                    ['season', 'player_id'])
+    op.create_index('ix_player_season_pitching_season_player_id', 'player_season_pitching',
+                    ['season', 'player_id'])
+
+
+def downgrade():
+    op.drop_index('ix_player_season_pitching_season_player_id', table_name='player_season_pitching')
+    op.drop_index('ix_player_season_batting_season_player_id', table_name='player_season_batting')
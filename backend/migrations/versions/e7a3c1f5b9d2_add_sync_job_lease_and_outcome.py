@@ -0,0 +1,28 @@
+"""Add sync_job claimed_at and rows_written
+
+Revision ID: e7a3c1f5b9d2
+Revises: c5e1a9d3f7b2
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e7a3c1f5b9d2'
+down_revision = 'c5e1a9d3f7b2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('sync_job') as batch_op:
+        batch_op.add_column(sa.Column('rows_written', sa.Integer()))
+        batch_op.add_column(sa.Column('claimed_at', sa.DateTime()))
+
+
+def downgrade():
+    with op.batch_alter_table('sync_job') as batch_op:
+        batch_op.drop_column('claimed_at')
+        batch_op.drop_column('rows_written')
@@ -0,0 +1,36 @@
+"""Add sync_checkpoint table
+
+Revision ID: f2a6d8c4b1e3
+Revises: e4b8c2d6a0f1
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2a6d8c4b1e3'
+down_revision = 'e4b8c2d6a0f1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'sync_checkpoint',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('source', sa.String(length=32), nullable=False),
+        sa.Column('season', sa.Integer(), nullable=False),
+        sa.Column('stat_type', sa.String(length=10), nullable=False),
+        sa.Column('cursor', sa.String(length=64)),
+        sa.Column('completed', sa.Boolean(), nullable=False),
+        sa.Column('created_at', sa.DateTime()),
+        sa.Column('updated_at', sa.DateTime()),
+        sa.UniqueConstraint('source', 'season', 'stat_type',
+                            name='uq_sync_checkpoint_source_season_stat_type')
+    )
+
+
+def downgrade():
+    op.drop_table('sync_checkpoint')
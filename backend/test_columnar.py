@@ -0,0 +1,139 @@
+from datetime import date
+import pytest
+from app import create_app, db
+from app.models import Player, Game
+from app.services.ingest import bulk_upsert_game_stats
+from config import TestConfig
+from test_statistics_api import seed_players
+
+pytest.importorskip('numpy')
+
+
+def seed_home_runs(home_runs, season=2024, at_bats=4):
+    """One player per value in `home_runs`, with that many homers in one game."""
+    game = Game(date=date(season, 4, 1))
+    db.session.add(game)
+    db.session.flush()
+    players = [Player(name=f'Slugger {i}') for i in range(len(home_runs))]
+    db.session.add_all(players)
+    db.session.commit()
+    bulk_upsert_game_stats('batting', [{
+        'player_id': player.id, 'game_id': game.id, 'season': season,
+        'at_bats': at_bats, 'hits': hr, 'runs': hr, 'rbis': hr, 'home_runs': hr
+    } for player, hr in zip(players, home_runs)])
+    return [player.id for player in players]
+
+
+def both_paths(app, client, url):
+    """The response JSON from the SQL path, then from the snapshot."""
+    app.config['COLUMNAR_SNAPSHOT'] = False
+    sql = client.get(url).get_json()
+    app.config['COLUMNAR_SNAPSHOT'] = True
+    return sql, client.get(url).get_json()
+
+
+@pytest.mark.parametrize('url', [
+    '/api/stats/batting?season=2024&sort=-home_runs&limit=3',
+    '/api/stats/batting?sort=home_runs&limit=4',
+    '/api/stats/batting?sort=-batting_average&min_hits=1',
+    '/api/stats/batting?limit=2',
+    '/api/stats/pitching?team=T01',
+    '/api/stats/batting?season_from=2024&season_to=2025&sort=-home_runs',
+])
+def test_snapshot_matches_sql(app, client, url):
+    seed_players(3)
+    seed_home_runs([5, 0, 5, 9])
+
+    sql, snapshot = both_paths(app, client, url)
+
+    assert sql['data']
+    assert snapshot == sql
+
+
+def test_ties_and_nulls_rank_like_sql(app, client):
+    seed_home_runs([2, 0, 0, 0, 1])
+    [hitless] = seed_home_runs([0], at_bats=0)  # NULL batting average
+
+    sql, snapshot = both_paths(app, client, '/api/stats/batting?sort=batting_average')
+
+    averages = [row['batting_average'] for row in snapshot['data']]
+    assert averages == [0.0, 0.0, 0.0, 0.25, 0.5, None]
+    assert snapshot['data'][-1]['player_id'] == hitless
+    assert snapshot == sql
+    assert snapshot['next_cursor'] is None
+
+
+def test_percentiles_match_sql(app, client):
+    seed_home_runs([0, 3, 5, 9, 12])
+
+    url = '/api/stats/batting/percentiles?column=home_runs&q=50&q=90&season=2024'
+    sql, snapshot = both_paths(app, client, url)
+
+    assert sql['data']['percentiles'] == {'50': 5.0, '90': 10.8}
+    assert snapshot == sql
+
+
+def test_fresh_snapshot_answers_without_reading_rows(app, client, query_counter):
+    seed_home_runs([1, 2, 3])
+    app.config['COLUMNAR_SNAPSHOT'] = True
+    client.get('/api/stats/batting?sort=-home_runs')  # loads the snapshot
+    query_counter.clear()
+
+    response = client.get('/api/stats/batting?sort=-home_runs&limit=2')
+
+    assert [row['home_runs'] for row in response.get_json()['data']] == [3, 2]
+    assert not any('ORDER BY' in statement for statement in query_counter)
+
+
+def test_ingest_makes_the_snapshot_stale(app, client):
+    seed_home_runs([1, 2])
+    app.config['COLUMNAR_SNAPSHOT'] = True
+    first = client.get('/api/stats/batting?sort=-home_runs&limit=1').get_json()
+
+    [slugger] = seed_home_runs([40])
+    second = client.get('/api/stats/batting?sort=-home_runs&limit=1').get_json()
+
+    assert first['data'][0]['home_runs'] == 2
+    assert second['data'][0]['player_id'] == slugger
+
+
+def test_unknown_sort_column_is_rejected(client):
+    response = client.get('/api/stats/batting?sort=-era')
+
+    assert response.status_code == 400
+
+
+def test_sort_cannot_follow_a_cursor(client):
+    seed_players(3)
+    first = client.get('/api/stats/batting?limit=1').get_json()
+
+    response = client.get(f'/api/stats/batting?sort=hits&cursor={first["next_cursor"]}')
+
+    assert response.status_code == 400
+
+
+def test_writes_by_another_process_are_served(tmp_path):
+    class SharedConfig(TestConfig):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{tmp_path}/shared.db'
+        CACHE_TYPE = 'SimpleCache'  # per-process generation tokens
+        COLUMNAR_SNAPSHOT = True
+
+    # Two apps on one database stand in for the web and sync-worker processes
+    web, worker = create_app(SharedConfig), create_app(SharedConfig)
+    line = {'player_id': 1, 'game_id': 1, 'season': 2024, 'at_bats': 4, 'hits': 1}
+    with web.app_context():
+        db.create_all()
+        db.session.add(Player(id=1, name='Mookie Betts'))
+        db.session.add(Game(id=1, date=date(2024, 4, 1)))
+        db.session.commit()
+        bulk_upsert_game_stats('batting', [line])
+    client = web.test_client()
+    urls = ['/api/stats/batting', '/api/stats/batting?sort=-hits', '/api/stats/batting?limit=5']
+    assert [client.get(url).get_json()['data'][0]['hits'] for url in urls] == [1, 1, 1]
+
+    with worker.app_context():
+        bulk_upsert_game_stats('batting', [{**line, 'hits': 4}])
+
+    assert [client.get(url).get_json()['data'][0]['hits'] for url in urls] == [4, 4, 4]
+    with web.app_context():
+        db.drop_all()
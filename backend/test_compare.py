@@ -0,0 +1,87 @@
+from sqlalchemy import insert
+from app import db
+from app.models import Player, Team, PlayerSeasonBatting, SyncJob
+
+
+def seed(players, seasons=(2023, 2024)):
+    db.session.add(Team(id=1, name='Los Angeles Dodgers', abbreviation='LAD'))
+    db.session.execute(insert(Player), [
+        {'id': i, 'name': f'Player {i}', 'team_id': 1, 'position': 'SS'} for i in range(1, players + 1)
+    ])
+    lines = [
+        {'player_id': i, 'season': season, 'games': 100, 'at_bats': 400, 'hits': 100 + i,
+         'runs': 50, 'rbis': 50, 'home_runs': i, 'batting_average': (100 + i) / 400}
+        for i in range(1, players + 1) for season in seasons
+    ]
+    if lines:
+        db.session.execute(insert(PlayerSeasonBatting), lines)
+    db.session.commit()
+
+
+def test_players_are_returned_in_request_order_with_their_seasons(client):
+    seed(3)
+
+    response = client.get('/api/players/compare?ids=3,1,3&season_from=2024&season_to=2024')
+
+    data = response.get_json()['data']
+    assert response.status_code == 200
+    assert [entry['player'] for entry in data] == [
+        {'id': 3, 'name': 'Player 3', 'team': 'LAD', 'position': 'SS'},
+        {'id': 1, 'name': 'Player 1', 'team': 'LAD', 'position': 'SS'}
+    ]
+    assert [(line['season'], line['hits']) for line in data[0]['seasons']] == [(2024, 103)]
+
+
+def test_query_count_does_not_grow_with_players(client, query_counter):
+    seed(20)
+    query_counter.clear()
+
+    client.get('/api/players/compare?ids=1,2')
+    two = len(query_counter)
+    query_counter.clear()
+    response = client.get('/api/players/compare?ids=' + ','.join(str(i) for i in range(1, 21)))
+
+    assert len(response.get_json()['data']) == 20
+    assert all(len(entry['seasons']) == 2 for entry in response.get_json()['data'])
+    assert len(query_counter) == two == 2
+
+
+def test_missing_seasons_are_queued_in_one_batch(client, query_counter):
+    seed(2, seasons=())
+    db.session.add(SyncJob(stat_type='batting', season=2024, player_id=1))
+    db.session.commit()
+    query_counter.clear()
+
+    response = client.get('/api/players/compare?ids=1,2&season_from=2023&season_to=2024')
+
+    assert response.status_code == 202
+    assert len(response.get_json()['job_ids']) == 4
+    assert SyncJob.query.count() == 4
+    assert sum(statement.startswith('INSERT') for statement in query_counter) == 1
+
+
+def test_players_without_upstream_lines_are_not_queued_again(client):
+    seed(2, seasons=())
+    db.session.add_all(
+        SyncJob(stat_type='batting', season=season, player_id=1, status='empty', rows_written=0)
+        for season in (2023, 2024)
+    )
+    db.session.commit()
+
+    retired = client.get('/api/players/compare?ids=1&season_from=2023&season_to=2024')
+    both = client.get('/api/players/compare?ids=1,2&season_from=2023&season_to=2024')
+
+    assert retired.status_code == 200
+    assert retired.get_json()['data'][0]['seasons'] == []
+    assert both.status_code == 202
+    assert len(both.get_json()['job_ids']) == 2
+    assert SyncJob.query.count() == 4
+
+
+def test_unknown_players_and_bad_requests_are_rejected(client):
+    seed(1)
+
+    assert client.get('/api/players/compare?ids=1,99').status_code == 404
+    assert client.get('/api/players/compare?ids=a,b').status_code == 400
+    assert client.get('/api/players/compare?ids=' + ','.join(map(str, range(30)))).status_code == 400
+    assert client.get('/api/players/compare?ids=1&season_from=2024&season_to=2020').status_code == 400
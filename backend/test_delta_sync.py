@@ -0,0 +1,111 @@
+from datetime import date, datetime
+import pytest
+from app import db
+from app.models import BattingStats, PitchingStats, PlayerSeasonBatting, SyncCheckpoint
+from app.services.delta_sync import delta_sync
+from app.services.mlb_api import MLBAPIService
+
+DODGERS = {'id': 119, 'name': 'Los Angeles Dodgers', 'abbreviation': 'LAD'}
+GIANTS = {'id': 137, 'name': 'San Francisco Giants', 'abbreviation': 'SF'}
+
+
+def scheduled(game_pk, day, state='Final'):
+    return {'gamePk': game_pk, 'officialDate': day, 'season': '2024', 'gameType': 'R',
+            'status': {'abstractGameState': state}}
+
+
+def boxscore(hits=1):
+    """A Dodgers batter, and a Giants pitcher who also batted."""
+    return {'teams': {
+        'home': {'team': DODGERS, 'players': {'ID1': {
+            'person': {'id': 1, 'fullName': 'Home Batter'}, 'position': {'abbreviation': 'CF'},
+            'stats': {'batting': {'atBats': 4, 'hits': hits, 'runs': 1, 'rbi': 0, 'homeRuns': 0},
+                      'pitching': {}}
+        }}},
+        'away': {'team': GIANTS, 'players': {'ID2': {
+            'person': {'id': 2, 'fullName': 'Away Pitcher'}, 'position': {'abbreviation': 'P'},
+            'stats': {'batting': {'atBats': 2, 'hits': 0, 'runs': 0, 'rbi': 0, 'homeRuns': 0},
+                      'pitching': {'inningsPitched': '6.1', 'hits': 5, 'runs': 2,
+                                   'earnedRuns': 2, 'baseOnBalls': 1, 'strikeOuts': 7}}
+        }}}
+    }}
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    state = {'schedule': [], 'changes': [], 'boxscores': {}, 'calls': []}
+
+    def get_schedule(start, end):
+        state['calls'].append(('schedule', start, end))
+        return [game for game in state['schedule'] if start.isoformat() <= game['officialDate'] <= end.isoformat()]
+
+    def get_game_changes(updated_since):
+        state['calls'].append(('changes', updated_since))
+        return state['changes']
+
+    def get_boxscores(game_pks):
+        game_pks = list(game_pks)
+        state['calls'].append(('boxscores', sorted(game_pks)))
+        return {game_pk: state['boxscores'][game_pk] for game_pk in game_pks}
+
+    monkeypatch.setattr(MLBAPIService, 'get_schedule', staticmethod(get_schedule))
+    monkeypatch.setattr(MLBAPIService, 'get_game_changes', staticmethod(get_game_changes))
+    monkeypatch.setattr(MLBAPIService, 'get_boxscores', staticmethod(get_boxscores))
+    return state
+
+
+def test_first_run_syncs_final_games_from_season_start(app, upstream):
+    upstream['schedule'] = [scheduled(1, '2024-04-01'), scheduled(2, '2024-04-02', 'Live')]
+    upstream['boxscores'] = {1: boxscore()}
+
+    counts = delta_sync(2024, today=date(2024, 4, 2))
+
+    assert counts == {'games': 1, 'batting': 2, 'pitching': 1}
+    assert upstream['calls'][0] == ('schedule', date(2024, 3, 1), date(2024, 4, 2))
+    assert BattingStats.query.count() == 2
+    pitching = PitchingStats.query.one()
+    assert (pitching.player_id, pitching.strikeouts) == (2, 7)
+    assert pitching.innings_pitched == pytest.approx(6 + 1 / 3)
+    assert db.session.get(PlayerSeasonBatting, (1, 2024)).hits == 1
+
+    checkpoint = SyncCheckpoint.query.one()
+    assert checkpoint.last_game_date == date(2024, 4, 1)
+    assert checkpoint.last_updated is not None
+
+
+def test_next_run_starts_at_the_watermark_and_applies_corrections(app, upstream):
+    upstream['schedule'] = [scheduled(1, '2024-04-01'), scheduled(2, '2024-04-02', 'Live')]
+    upstream['boxscores'] = {1: boxscore()}
+    delta_sync(2024, today=date(2024, 4, 2))
+    last_run = SyncCheckpoint.query.one().last_updated
+    upstream['calls'].clear()
+
+    # Game 2 went final and game 1 had a scoring change
+    upstream['schedule'][1] = scheduled(2, '2024-04-02')
+    upstream['changes'] = [scheduled(1, '2024-04-01')]
+    upstream['boxscores'] = {1: boxscore(hits=2), 2: boxscore()}
+    counts = delta_sync(2024, today=date(2024, 4, 3))
+
+    assert upstream['calls'][:2] == [
+        ('schedule', date(2024, 4, 1), date(2024, 4, 3)),
+        ('changes', last_run)
+    ]
+    assert counts['games'] == 2
+    assert BattingStats.query.count() == 4
+    assert BattingStats.query.filter_by(player_id=1, game_id=1).one().hits == 2
+    totals = db.session.get(PlayerSeasonBatting, (1, 2024))
+    assert (totals.games, totals.hits) == (2, 3)
+    assert SyncCheckpoint.query.one().last_game_date == date(2024, 4, 2)
+
+
+def test_other_seasons_in_changes_are_ignored(app, upstream):
+    db.session.add(SyncCheckpoint(source='daily_games', season=2024, stat_type='all',
+                                  last_game_date=date(2024, 9, 30),
+                                  last_updated=datetime(2024, 9, 30)))
+    db.session.commit()
+    upstream['changes'] = [dict(scheduled(9, '2023-09-30'), season='2023')]
+
+    counts = delta_sync(2024, today=date(2024, 10, 1))
+
+    assert counts == {'games': 0, 'batting': 0, 'pitching': 0}
+    assert ('boxscores', []) in upstream['calls']
@@ -0,0 +1,69 @@
+import csv
+import io
+import pytest
+from app import db
+from app.models import Player, Team
+from test_statistics_api import seed_players
+
+
+def test_csv_export_streams_season_totals(client, app):
+    app.config['STREAM_BATCH_SIZE'] = 2
+    seed_players(5)
+
+    response = client.get('/api/statistics/export?stat_type=batting&season=2024')
+
+    assert response.is_streamed
+    assert response.mimetype == 'text/csv'
+    rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+    assert [row['player_id'] for row in rows] == ['1', '2', '3', '4', '5']
+    assert rows[0]['at_bats'] == '4'
+
+
+def test_csv_export_of_game_logs(client):
+    seed_players(2)
+
+    response = client.get('/api/statistics/export?stat_type=pitching&level=game&team=T01')
+
+    [row] = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+    assert (row['team'], row['date'], row['strikeouts']) == ('T01', '2024-04-01', '7')
+
+
+def test_game_logs_use_the_team_of_each_game(client):
+    seed_players(1)
+    # Traded since: the game row keeps the team the player played for
+    db.session.add(Team(id=99, name='New Club', abbreviation='NEW'))
+    db.session.get(Player, 1).team_id = 99
+    db.session.commit()
+
+    response = client.get('/api/statistics/export?level=game&team=T00&start_date=2024-04-01')
+
+    [row] = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+    assert row['team'] == 'T00'
+
+
+def test_filters_the_level_cannot_apply_are_rejected(client):
+    season = client.get('/api/statistics/export?start_date=2024-04-01')
+    game = client.get('/api/statistics/export?level=game&min_at_bats=100')
+
+    assert (season.status_code, game.status_code) == (400, 400)
+    assert game.get_json()['error'] == 'min_at_bats cannot be used with level=game'
+
+
+@pytest.mark.parametrize('file_format', ['parquet', 'arrow'])
+def test_columnar_exports_round_trip(client, app, file_format):
+    pa = pytest.importorskip('pyarrow')
+    import pyarrow.parquet as pq
+    app.config['STREAM_BATCH_SIZE'] = 2
+    seed_players(5)
+
+    response = client.get(f'/api/statistics/export?stat_type=batting&format={file_format}')
+
+    data = io.BytesIO(response.get_data())
+    table = pq.read_table(data) if file_format == 'parquet' else pa.ipc.open_stream(data).read_all()
+    assert table.num_rows == 5
+    assert table.column('hits').to_pylist() == [1] * 5
+    assert table.schema.field('batting_average').type == pa.float64()
+
+
+def test_unknown_format_is_rejected(client):
+    assert client.get('/api/statistics/export?format=xlsx').status_code == 400
@@ -0,0 +1,190 @@
+import itertools
+import json
+import random
+import zlib
+from datetime import date
+import pytest
+from app import create_app, db
+from app.services import http_cache
+from app.services.http_cache import OfflineCacheMiss, ResponseCache, canonical_request
+from app.services.http_client import PooledClient
+from app.services.mlb_api import MLBAPIService
+from config import TestConfig
+
+PAST = date.today().year - 1
+CURRENT = date.today().year
+
+
+class FakeResponse:
+    def __init__(self, body, content_type='application/json'):
+        self.content = body
+        self.headers = {'Content-Type': content_type}
+        self.encoding = 'utf-8'
+
+    def iter_content(self, chunk_size):
+        return (self.content[i:i + chunk_size] for i in range(0, len(self.content), chunk_size))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+
+@pytest.fixture
+def disk_cache(tmp_path):
+    return ResponseCache(str(tmp_path / 'upstream.db'), max_bytes=10_000, ttl=60)
+
+
+def test_requests_are_keyed_independently_of_parameter_order():
+    assert canonical_request('u', {'b': 2, 'a': 1}) == canonical_request('u', {'a': 1, 'b': 2})
+
+
+def test_bodies_are_stored_compressed_and_read_back(disk_cache):
+    body = json.dumps({'people': [{'id': 1}] * 200}).encode()
+    fetches = []
+
+    def fetch():
+        fetches.append(1)
+        return FakeResponse(body)
+
+    for _ in range(2):
+        assert disk_cache.get_json_body('u', {'season': PAST}, fetch) == body
+
+    assert len(fetches) == 1
+    assert disk_cache.stats()['bytes'] < len(body) / 10
+
+
+def test_past_seasons_never_expire_and_current_ones_do(disk_cache):
+    now = 1_000.0
+    assert disk_cache.expires_at({'season': PAST}, now) is None
+    assert disk_cache.expires_at({'hydrate': f'stats(type=[season],season={PAST})'}, now) is None
+    assert disk_cache.expires_at({'endDate': f'{PAST}-10-01'}, now) is None
+    assert disk_cache.expires_at({'season': CURRENT}, now) == now + 60
+    assert disk_cache.expires_at({'query': 'judge'}, now) == now + 60
+
+
+def test_expired_entries_are_refetched_unless_offline(disk_cache):
+    disk_cache.ttl = -1
+    disk_cache.get_json_body('u', {'season': CURRENT}, lambda: FakeResponse(b'{"v": 1}'))
+
+    assert disk_cache.get(canonical_request('u', {'season': CURRENT})) is None
+    disk_cache.offline = True
+    assert disk_cache.get(canonical_request('u', {'season': CURRENT}))[1] == b'{"v": 1}'
+
+
+def test_least_recently_read_entries_are_evicted(disk_cache):
+    disk_cache.max_bytes = 3 * len(zlib.compress(bytes(range(256)) * 4))
+    for key in 'abc':
+        disk_cache.put(key, {}, None, zlib.compress(bytes(range(256)) * 4))
+    disk_cache.get('a')
+
+    disk_cache.put('d', {}, None, zlib.compress(bytes(range(256)) * 4))
+
+    assert disk_cache.get('b') is None
+    assert all(disk_cache.get(key) for key in 'acd')
+    assert disk_cache.stats()['evictions'] == 1
+
+
+def test_streams_are_recorded_once_fully_read(disk_cache):
+    body = b'player_id,hits\r\n' + b'1,2\r\n' * 100
+    content_type, _, chunks = disk_cache.stream('s', {}, lambda: FakeResponse(body, 'text/csv'), 7)
+    assert content_type == 'text/csv'
+    assert disk_cache.get('s') is None
+    assert b''.join(chunks) == body
+
+    disk_cache.offline = True
+    content_type, _, chunks = disk_cache.stream('s', {}, pytest.fail, 7)
+    assert (content_type, b''.join(chunks)) == ('text/csv', body)
+
+
+def test_streams_are_stored_and_replayed_in_chunks(disk_cache, monkeypatch):
+    monkeypatch.setattr(http_cache, 'STORE_CHUNK_BYTES', 16_000)
+    disk_cache.max_bytes = 1_000_000
+    body = random.Random(7).randbytes(100_000)
+    _, _, chunks = disk_cache.stream('s', {}, lambda: FakeResponse(body), 512)
+    assert b''.join(chunks) == body
+    rows = disk_cache._db.execute('SELECT COUNT(*), SUM(LENGTH(data)) FROM chunk').fetchone()
+
+    _, _, chunks = disk_cache.stream('s', {}, pytest.fail, 512)
+    replayed = list(chunks)
+
+    assert rows[0] > 1 and rows[1] == disk_cache.stats()['bytes']
+    assert max(map(len, replayed)) <= 512 and b''.join(replayed) == body
+    assert disk_cache.get('s')[1] == body
+
+
+def chunk_rows(disk_cache):
+    return disk_cache._db.execute('SELECT COUNT(*) FROM chunk').fetchone()[0]
+
+
+class FailingResponse(FakeResponse):
+    def iter_content(self, chunk_size):
+        yield from itertools.islice(super().iter_content(chunk_size), 4)
+        raise ConnectionError('upstream went away')
+
+
+def test_an_unfinished_stream_is_not_cached(disk_cache, monkeypatch):
+    monkeypatch.setattr(http_cache, 'STORE_CHUNK_BYTES', 1)
+    body = random.Random(7).randbytes(100_000)
+    _, _, chunks = disk_cache.stream('s', {}, lambda: FakeResponse(body), 512)
+    for _ in range(100):
+        next(chunks)
+    assert chunk_rows(disk_cache) > 0
+    chunks.close()
+
+    _, _, failing = disk_cache.stream('s', {}, lambda: FailingResponse(body), 512)
+    with pytest.raises(ConnectionError):
+        b''.join(failing)
+
+    assert disk_cache.get('s') is None
+    assert chunk_rows(disk_cache) == 0
+    _, _, chunks = disk_cache.stream('s', {}, lambda: FakeResponse(b'3,4\r\n'), 7)
+    assert b''.join(chunks) == b'3,4\r\n' and disk_cache.get('s')[1] == b'3,4\r\n'
+
+
+def test_concurrent_misses_on_one_url_both_complete(disk_cache, monkeypatch):
+    monkeypatch.setattr(http_cache, 'STORE_CHUNK_BYTES', 1)
+    disk_cache.max_bytes = 1_000_000
+    bodies = [random.Random(seed).randbytes(20_000) for seed in (1, 2)]
+    streams = [disk_cache.stream('s', {}, lambda body=body: FakeResponse(body), 512)[2]
+               for body in bodies]
+
+    received = [bytearray(), bytearray()]
+    for pair in itertools.zip_longest(*streams, fillvalue=b''):
+        for buffer, chunk in zip(received, pair):
+            buffer += chunk
+
+    assert list(map(bytes, received)) == bodies
+    assert disk_cache.get('s')[1] == bodies[1]
+    assert disk_cache.stats()['bytes'] == disk_cache._db.execute(
+        'SELECT SUM(LENGTH(data)) FROM chunk'
+    ).fetchone()[0]
+
+
+def test_offline_misses_do_not_touch_the_network(disk_cache):
+    disk_cache.offline = True
+
+    with pytest.raises(OfflineCacheMiss):
+        disk_cache.get_json_body('u', {}, pytest.fail)
+
+
+def test_mlb_requests_replay_from_the_cache(tmp_path, monkeypatch):
+    class DiskCacheConfig(TestConfig):
+        UPSTREAM_CACHE_PATH = str(tmp_path / 'upstream.db')
+
+    calls = []
+
+    def get(client, url, **kwargs):
+        calls.append(url)
+        return FakeResponse(b'{"people": [{"id": 7}]}')
+
+    monkeypatch.setattr(PooledClient, 'get', get)
+    app = create_app(DiskCacheConfig)
+    with app.app_context():
+        db.create_all()
+        for _ in range(2):
+            MLBAPIService._make_request('people', {'personIds': 7, 'season': PAST})
+
+        assert len(calls) == 1
+        assert app.test_client().get('/api/cache/stats').get_json()['data']['disk']['hits'] == 1
@@ -0,0 +1,78 @@
+import gzip
+from datetime import date
+from app import db
+from app.models import Player, Game
+from app.services.ingest import bulk_upsert_game_stats
+
+
+def seed(players=1, hits=2):
+    db.session.add_all(Player(id=i, name=f'Player {i}') for i in range(1, players + 1))
+    db.session.add(Game(id=1, date=date(2024, 4, 1)))
+    db.session.commit()
+    write_games(players, hits)
+
+
+def write_games(players, hits):
+    bulk_upsert_game_stats('batting', [{
+        'player_id': i, 'game_id': 1, 'season': 2024,
+        'at_bats': 4, 'hits': hits, 'runs': 0, 'rbis': 0, 'home_runs': 0
+    } for i in range(1, players + 1)])
+
+
+def test_matching_etag_returns_304_without_body(client, query_counter):
+    seed()
+    first = client.get('/api/stats/batting?season=2024')
+    query_counter.clear()
+
+    second = client.get('/api/stats/batting?season=2024',
+                        headers={'If-None-Match': first.headers['ETag']})
+
+    assert first.status_code == 200
+    assert second.status_code == 304
+    assert second.data == b''
+    assert len(query_counter) == 1
+
+
+def test_new_rows_change_the_etag(client):
+    seed()
+    first = client.get('/api/stats/batting?season=2024')
+
+    write_games(1, hits=3)
+    second = client.get('/api/stats/batting?season=2024',
+                        headers={'If-None-Match': first.headers['ETag']})
+
+    assert second.status_code == 200
+    assert second.get_json()['data'][0]['hits'] == 3
+    assert second.headers['ETag'] != first.headers['ETag']
+
+
+def test_if_modified_since_on_player_stats(client):
+    seed()
+    first = client.get('/api/stats/player/1?season=2024')
+
+    second = client.get('/api/stats/player/1?season=2024',
+                        headers={'If-Modified-Since': first.headers['Last-Modified']})
+
+    assert second.status_code == 304
+
+
+def test_large_leaderboards_are_compressed(client):
+    seed(players=200)
+
+    response = client.get('/api/stats/batting?season=2024&limit=500', headers={'Accept-Encoding': 'gzip'})
+
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert b'"Player 200"' in gzip.decompress(response.data)
+
+
+def test_etag_of_compressed_response_still_matches(client):
+    seed(players=200)
+    first = client.get('/api/stats/batting?season=2024&limit=500', headers={'Accept-Encoding': 'gzip'})
+
+    second = client.get('/api/stats/batting?season=2024&limit=500', headers={
+        'Accept-Encoding': 'gzip',
+        'If-None-Match': first.headers['ETag']
+    })
+
+    assert first.headers['ETag'].endswith(':gzip"')
+    assert second.status_code == 304
@@ -0,0 +1,50 @@
+from datetime import date
+from app import db
+from app.models import Player, Game, BattingStats, PlayerSeasonBatting
+from app.utils.statcast import update_local_database
+from app.services.ingest import bulk_upsert_game_stats
+
+
+def seed_games(players=3, games=4):
+    db.session.add_all(Player(name=f'Player {i}') for i in range(players))
+    db.session.add_all(Game(date=date(2024, 4, day + 1)) for day in range(games))
+    db.session.commit()
+
+
+def batting_records(players, games, hits=1):
+    for game_id in range(1, games + 1):
+        for player_id in range(1, players + 1):
+            yield {
+                'player_id': player_id, 'game_id': game_id, 'season': 2024,
+                'at_bats': 4, 'hits': hits, 'runs': 0, 'rbis': 0, 'home_runs': 0
+            }
+
+
+def test_bulk_upsert_writes_in_chunks_and_refreshes_totals(app):
+    seed_games()
+
+    written = bulk_upsert_game_stats('batting', batting_records(3, 4), chunk_size=5)
+
+    assert written == 12
+    assert BattingStats.query.count() == 12
+    assert [row.games for row in PlayerSeasonBatting.query] == [4, 4, 4]
+
+
+def test_rows_are_upserted_on_player_and_game(app):
+    seed_games()
+    update_local_database('batting', batting_records(3, 4))
+
+    update_local_database('batting', batting_records(3, 2, hits=3))
+
+    assert BattingStats.query.count() == 12
+    totals = PlayerSeasonBatting.query.all()
+    assert {row.hits for row in totals} == {3 + 3 + 1 + 1}
+
+
+def test_backfill_can_skip_totals_refresh(app):
+    seed_games()
+
+    bulk_upsert_game_stats('batting', batting_records(3, 4), refresh_totals=False)
+
+    assert BattingStats.query.count() == 12
+    assert PlayerSeasonBatting.query.count() == 0
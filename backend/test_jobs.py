@@ -0,0 +1,144 @@
+from collections import Counter
+from datetime import datetime, timedelta
+from app import db
+from app.models import BattingStats, Player, PlayerSeasonBatting, SyncJob
+from app.services import jobs
+from app.services.mlb_api import MLBAPIService
+
+
+def record_syncs(monkeypatch, lines=None):
+    """Record sync_players calls; each call stores `lines` ({player_id: game lines})."""
+    calls = []
+
+    def sync_players(player_ids, season, stat_type):
+        calls.append((set(player_ids), season, stat_type))
+        return Counter(lines or {})
+
+    monkeypatch.setattr(jobs, 'sync_players', sync_players)
+    return calls
+
+
+def test_cache_miss_returns_pending_job(client):
+    db.session.add(Player(id=10, name='Will Smith'))
+    db.session.commit()
+
+    response = client.get('/api/stats/player/10?type=batting&season=2024')
+
+    body = response.get_json()
+    assert response.status_code == 202
+    assert body['status'] == 'pending'
+    assert body['data']['player']['name'] == 'Will Smith'
+    job = client.get(f'/api/jobs/{body["job_id"]}').get_json()['data']
+    assert (job['player_id'], job['season'], job['status']) == (10, 2024, 'pending')
+
+
+def test_identical_misses_share_one_job(client):
+    first = client.get('/api/stats/batting?season=2024&team=LAD').get_json()
+    second = client.get('/api/stats/batting?season=2024&team=LAD').get_json()
+    other = client.get('/api/stats/pitching?season=2024&team=LAD').get_json()
+
+    assert first['job_id'] == second['job_id']
+    assert other['job_id'] != first['job_id']
+    assert SyncJob.query.count() == 2
+
+
+def test_worker_batches_jobs_per_season(app, monkeypatch):
+    calls = record_syncs(monkeypatch, {1: 3, 2: 1})
+    for player_id in (1, 2):
+        jobs.enqueue_sync_job('batting', 2024, player_id=player_id)
+    jobs.enqueue_sync_job('batting', 2023, player_id=1)
+
+    handled = jobs.run_pending_jobs()
+
+    assert handled == 3
+    assert sorted(calls, key=lambda call: call[1]) == [
+        ({1}, 2023, 'batting'),
+        ({1, 2}, 2024, 'batting')
+    ]
+    assert {job.status for job in SyncJob.query} == {'done'}
+
+
+def test_jobs_without_upstream_lines_are_not_queued_again(client, monkeypatch):
+    record_syncs(monkeypatch, {1: 3})
+    db.session.add(Player(id=2, name='Call Up'))
+    db.session.commit()
+    first = client.get('/api/stats/player/2?season=2024').get_json()
+
+    jobs.run_pending_jobs()
+    response = client.get('/api/stats/player/2?season=2024')
+
+    job = db.session.get(SyncJob, first['job_id'])
+    assert (job.status, job.rows_written) == ('empty', 0)
+    assert response.status_code == 200
+    assert response.get_json()['data']['stats'] == []
+    assert SyncJob.query.count() == 1
+
+
+def test_finished_jobs_are_retried_after_a_while(app, monkeypatch):
+    record_syncs(monkeypatch)
+    job = jobs.enqueue_sync_job('batting', 2024, player_id=2)
+    jobs.run_pending_jobs()
+
+    job.updated_at = datetime.utcnow() - timedelta(seconds=app.config['SYNC_JOB_RETRY_AFTER'] + 1)
+    db.session.commit()
+
+    assert jobs.enqueue_sync_job('batting', 2024, player_id=2).id != job.id
+
+
+def test_jobs_of_a_crashed_worker_are_reclaimed(app, monkeypatch):
+    calls = record_syncs(monkeypatch)
+    lapsed, held = (jobs.enqueue_sync_job('batting', 2024, player_id=i) for i in (1, 2))
+    lease = timedelta(seconds=app.config['SYNC_JOB_LEASE'] + 1)
+    lapsed.status, lapsed.claimed_at = 'running', datetime.utcnow() - lease
+    held.status, held.claimed_at = 'running', datetime.utcnow()
+    db.session.commit()
+
+    assert jobs.run_pending_jobs() == 1
+    assert calls == [({1}, 2024, 'batting')]
+    assert (lapsed.status, held.status) == ('empty', 'running')
+
+
+def test_failed_sync_marks_jobs_failed(app, monkeypatch):
+    def fail(*args):
+        raise RuntimeError('upstream down')
+    monkeypatch.setattr(jobs, 'sync_players', fail)
+    job = jobs.enqueue_sync_job('pitching', 2024, player_id=1)
+
+    jobs.run_pending_jobs()
+
+    assert (job.status, job.error) == ('failed', 'upstream down')
+
+
+def test_worker_stores_fetched_game_logs(app, monkeypatch):
+    requests = []
+
+    def people(endpoint, params=None):
+        requests.append((endpoint, params['hydrate']))
+        return {'people': [{'id': 10, 'fullName': 'Will Smith', 'stats': [{'splits': [
+            {
+                'date': f'2024-04-0{game}',
+                'isHome': game == 1,
+                'team': {'id': 119, 'name': 'Los Angeles Dodgers', 'abbreviation': 'LAD'},
+                'opponent': {'id': 137, 'name': 'San Francisco Giants', 'abbreviation': 'SF'},
+                'game': {'gamePk': 700000 + game},
+                'stat': {'atBats': 4, 'hits': game, 'runs': 0, 'rbi': 1, 'homeRuns': 0, 'avg': '.250'}
+            }
+            for game in (1, 2)
+        ]}]}]}
+
+    monkeypatch.setattr(MLBAPIService, '_make_request', staticmethod(people))
+    job = jobs.enqueue_sync_job('batting', 2024, player_id=10)
+
+    jobs.run_pending_jobs()
+
+    assert (job.status, job.error, job.rows_written) == ('done', None, 2)
+    assert db.session.get(Player, 10).name == 'Will Smith'
+    assert requests == [('people', 'stats(group=[hitting],type=[gameLog],season=2024)')]
+    assert [(row.game_id, row.hits) for row in BattingStats.query.order_by(BattingStats.game_id)] == [
+        (700001, 1), (700002, 2)
+    ]
+    assert db.session.get(PlayerSeasonBatting, (10, 2024)).hits == 3
+
+
+def test_unknown_job_is_404(client):
+    assert client.get('/api/jobs/999').status_code == 404
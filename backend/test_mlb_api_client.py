@@ -0,0 +1,111 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+import pytest
+from app.services.http_client import TokenBucket
+from app.services.mlb_api import MLBAPIService
+
+LATENCY = 0.1
+
+
+class StubMLBHandler(BaseHTTPRequestHandler):
+    """Answers after LATENCY seconds with one person per requested ID; fails the first N calls."""
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.calls += 1
+            failing = server.calls <= server.failures
+        time.sleep(LATENCY)
+
+        if failing:
+            body, status = b'{}', 503
+        else:
+            query = parse_qs(urlparse(self.path).query)
+            people = [
+                {'id': int(player_id), 'stats': [{'splits': []}]}
+                for player_id in query.get('personIds', query.get('playerId', ['0']))[0].split(',')
+            ]
+            body, status = json.dumps({'people': people}).encode(), 200
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def mlb_server(app, monkeypatch):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubMLBHandler)
+    server.lock = threading.Lock()
+    server.calls = 0
+    server.failures = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(MLBAPIService, 'BASE_URL', f'http://127.0.0.1:{server.server_port}/api/v1')
+    app.config.update(MLB_API_BACKOFF_FACTOR=0.01, MLB_API_RATE_LIMIT=None)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_roster_batches_are_fetched_in_parallel(app, mlb_server):
+    app.config['MLB_API_BATCH_SIZE'] = 1
+    roster = list(range(1, 17))
+
+    started = time.perf_counter()
+    for player_id in roster:
+        MLBAPIService.get_player_stats(player_id, 2024, 'batting')
+    serial = time.perf_counter() - started
+
+    started = time.perf_counter()
+    fetched = MLBAPIService.get_players_stats(roster, 2024, 'batting')
+    parallel = time.perf_counter() - started
+
+    assert sorted(fetched) == roster
+    assert parallel < serial / 3
+
+
+def test_server_errors_are_retried(app, mlb_server):
+    mlb_server.failures = 2
+
+    response = MLBAPIService.get_player_stats(7, 2024, 'batting')
+
+    assert response['people'][0]['id'] == 7
+    assert mlb_server.calls == 3
+
+
+def test_players_are_batched_per_request(app, mlb_server):
+    fetched = MLBAPIService.get_players_stats(range(1, 121), 2024, 'batting')
+
+    assert len(fetched) == 120
+    assert mlb_server.calls == 3
+    assert fetched[5] == {'fullName': None, 'stats': [{'splits': []}]}
+
+
+def test_boxscores_are_fetched_once_per_game(app, mlb_server):
+    boxscores = MLBAPIService.get_boxscores([101, 102, 101, 103])
+
+    assert list(boxscores) == [101, 102, 103]
+    assert mlb_server.calls == 3
+
+
+def test_client_is_shared_per_app(app):
+    assert MLBAPIService._client() is MLBAPIService._client()
+
+
+def test_token_bucket_limits_rate():
+    bucket = TokenBucket(rate=50, capacity=1)
+
+    started = time.perf_counter()
+    for _ in range(6):
+        bucket.acquire()
+
+    assert time.perf_counter() - started >= 5 / 50 * 0.9
+
@@ -0,0 +1,115 @@
+from datetime import date
+import pytest
+from app import db
+from app.models import Team, Player, Game
+from app.services.ingest import bulk_upsert_game_stats
+from app.services.nlp import QueryNotUnderstood, parse_query
+from app.services.query_plan import compiled_statement
+
+
+def parse(text):
+    return parse_query(text, 50, 1000, current_year=2024)
+
+
+@pytest.fixture
+def seeded(app):
+    """Two seasons of batting lines for three Dodgers and one Yankee."""
+    dodgers = Team(name='Los Angeles Dodgers', abbreviation='LAD')
+    yankees = Team(name='New York Yankees', abbreviation='NYY')
+    db.session.add_all([dodgers, yankees])
+    db.session.flush()
+    players = [
+        Player(id=1, name='Mookie Betts', team_id=dodgers.id),
+        Player(id=2, name='Freddie Freeman', team_id=dodgers.id),
+        Player(id=3, name='Will Smith', team_id=dodgers.id),
+        Player(id=4, name='Aaron Judge', team_id=yankees.id)
+    ]
+    db.session.add_all(players)
+    db.session.add_all([Game(id=1, date=date(2023, 5, 1)), Game(id=2, date=date(2024, 5, 1))])
+    db.session.commit()
+    lines = {  # player_id: (at_bats, hits, home_runs) per season
+        2023: {1: (600, 180, 39), 2: (630, 210, 29), 3: (450, 118, 19), 4: (370, 98, 37)},
+        2024: {1: (450, 130, 19), 2: (540, 153, 22), 3: (490, 121, 20), 4: (560, 180, 58)}
+    }
+    bulk_upsert_game_stats('batting', [
+        {'player_id': player_id, 'game_id': 1 if season == 2023 else 2, 'season': season,
+         'at_bats': ab, 'hits': h, 'runs': 0, 'rbis': 0, 'home_runs': hr}
+        for season, season_lines in lines.items()
+        for player_id, (ab, h, hr) in season_lines.items()
+    ])
+
+
+def test_plan_for_a_ranked_question():
+    plan = parse('Top 10 batting averages in 2023 with at least 300 at bats')
+
+    assert plan.stat_type == 'batting'
+    assert (plan.season_from, plan.season_to) == (2023, 2023)
+    assert plan.minimums == (('min_at_bats', 300),)
+    assert (plan.sort, plan.descending, plan.limit) == ('batting_average', True, 10)
+
+
+def test_pitching_vocabulary_and_direction():
+    plan = parse('best ERA among pitchers since 2020, minimum 100 innings')
+
+    assert plan.stat_type == 'pitching'
+    assert (plan.season_from, plan.season_to) == (2020, 2024)
+    assert plan.minimums == (('min_innings', 100.0),)
+    assert (plan.sort, plan.descending) == ('era', False)
+
+
+def test_singular_stat_names_and_empty_limits():
+    assert parse('most strikeout in 2023').sort == 'strikeouts'
+    assert parse('top 0 home run hitters').limit == 1
+
+
+def test_paraphrases_normalize_to_one_plan():
+    plans = {
+        parse('top 5 home runs for the Dodgers 2022-2023'),
+        parse('Most  homers on LAD from 2022 to 2023, top 5'),
+        parse('top 5 HR with LAD between 2023 and 2022'),
+    }
+
+    assert len(plans) == 1
+    assert plans.pop().team == 'LAD'
+
+
+def test_plans_differing_in_values_share_a_statement(app):
+    first = parse('top 10 home runs in 2023 with at least 300 at bats')
+    second = parse('top 3 homers in 2019 with 500+ at bats')
+
+    assert first != second
+    assert compiled_statement(first.shape) is compiled_statement(second.shape)
+
+
+def test_gibberish_is_not_understood():
+    with pytest.raises(QueryNotUnderstood):
+        parse('hello there')
+
+
+def test_query_endpoint_returns_rows_and_columns(client, seeded):
+    response = client.post('/api/nlp/query', json={
+        'query': 'top 2 batting averages in 2024 with at least 500 at bats'
+    })
+
+    body = response.get_json()
+    assert response.status_code == 200
+    assert [row['name'] for row in body['data']] == ['Aaron Judge', 'Freddie Freeman']
+    assert {'field': 'batting_average', 'headerName': 'AVG', 'width': 100, 'sortable': True} in body['columns']
+    assert set(body['timings']) == {'parse_ms', 'execute_ms'}
+    assert 'parse;dur=' in response.headers['Server-Timing']
+
+
+def test_query_endpoint_applies_team_and_season_range(client, seeded):
+    response = client.post('/api/nlp/query', json={'query': 'most home runs for the Dodgers 2023-2024'})
+
+    data = response.get_json()['data']
+    assert [(row['name'], row['season']) for row in data[:2]] == [
+        ('Mookie Betts', 2023), ('Freddie Freeman', 2023)
+    ]
+    assert {row['team'] for row in data} == {'LAD'}
+    assert len(data) == 6
+
+
+def test_query_endpoint_rejects_unparseable_questions(client):
+    assert client.post('/api/nlp/query', json={'query': 'hello there'}).status_code == 400
+    assert client.post('/api/nlp/query', json={}).status_code == 400
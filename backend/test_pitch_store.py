@@ -0,0 +1,127 @@
+import os
+from datetime import date
+import pytest
+from app import db
+from app.models import Player
+from app.utils import statcast
+
+pytest.importorskip('pyarrow')
+from app.services.pitch_store import PitchStore  # noqa: E402
+
+
+def pitch(batter, day, exit_velocity=None, pitch_type='FF', velocity=95.0, pitcher=10):
+    return {
+        'season': day.year, 'month': day.month, 'game_id': day.toordinal(), 'game_date': day,
+        'pitcher_id': pitcher, 'batter_id': batter, 'pitch_type': pitch_type,
+        'events': 'single' if exit_velocity else None, 'velocity': velocity, 'spin_rate': 2300.0,
+        'exit_velocity': exit_velocity, 'launch_angle': 12.0 if exit_velocity else None
+    }
+
+
+def season_events():
+    april, may = date(2024, 4, 10), date(2024, 5, 10)
+    yield from (pitch(1, april, 95.0) for _ in range(150))
+    yield from (pitch(2, may, 100.0) for _ in range(120))
+    yield from (pitch(3, april, 110.0) for _ in range(50))
+    yield from (pitch(4, may, pitch_type='SL', velocity=85.0, pitcher=11) for _ in range(40))
+
+
+@pytest.fixture
+def store(app, tmp_path):
+    store = PitchStore(str(tmp_path / 'pitches'))
+    app.extensions['pitch_store'] = store
+    db.session.add_all(Player(id=i, name=f'Player {i}') for i in (1, 2, 3, 10, 11))
+    db.session.commit()
+    assert store.write(season_events()) == 360
+    return store
+
+
+def test_events_are_partitioned_by_season_and_month(store):
+    assert sorted(os.listdir(os.path.join(store.path, 'season=2024'))) == ['month=4', 'month=5']
+    assert all('month=4' in path for path in store.files(2024, month=4))
+    assert store.files(2023) == []
+
+
+def test_average_exit_velocity_leaders(client, store):
+    response = client.get('/api/statcast/leaders?sort=-exit_velocity&season=2024&min_events=100')
+
+    assert response.get_json()['data'] == [
+        {'rank': 1, 'player_id': 2, 'name': 'Player 2', 'team': None,
+         'exit_velocity': 100.0, 'events': 120},
+        {'rank': 2, 'player_id': 1, 'name': 'Player 1', 'team': None,
+         'exit_velocity': 95.0, 'events': 150}
+    ]
+
+
+def test_statcast_page_size_is_at_least_one(client, store):
+    url = '/api/statcast/leaders?sort=-exit_velocity&season=2024&limit='
+
+    assert [len(client.get(url + limit).get_json()['data']) for limit in ('0', '-1')] == [1, 1]
+
+
+def test_predicates_narrow_the_scan(store):
+    april = store.leaders('exit_velocity', 2024, month=4)
+    sliders = store.leaders('velocity', 2024, descending=False, pitch_type='SL')
+
+    assert [(player_id, events) for _, player_id, _, events in april] == [(3, 50), (1, 150)]
+    assert sliders == [(1, 11, 85.0, 40)]
+    assert store.leaders('velocity', 2024)[0] == (1, 10, 95.0, 320)
+
+
+def test_a_reloaded_month_replaces_its_partition(store):
+    store.write(pitch(1, date(2024, 4, 20), 90.0) for _ in range(10))
+
+    assert [row[1:] for row in store.leaders('exit_velocity', 2024)] == [
+        (2, 100.0, 120), (1, 90.0, 10)
+    ]
+
+
+def test_a_failed_load_keeps_the_previous_partition(store):
+    def interrupted():
+        yield from (pitch(1, date(2024, 4, 20), 90.0) for _ in range(10))
+        raise ConnectionError('upstream went away')
+
+    with pytest.raises(ConnectionError):
+        store.write(interrupted())
+
+    assert store.leaders('exit_velocity', 2024, month=4)[0][1:] == (3, 110.0, 50)
+    assert sorted(os.listdir(store.path)) == ['season=2024']
+
+
+def test_process_pool_matches_a_single_process(store):
+    single = store.averages('exit_velocity', 2024).sort_by('batter_id')
+
+    try:
+        assert store.averages('exit_velocity', 2024, workers=2).sort_by('batter_id').equals(single)
+    finally:
+        store.close()
+
+
+def test_pitches_are_loaded_month_by_month(store, monkeypatch):
+    requested = []
+    body = (
+        'game_pk,game_date,pitcher,batter,pitch_type,events,release_speed,'
+        'release_spin_rate,launch_speed,launch_angle\r\n'
+        '745001,2024-06-01,10,2,FF,double,97.1,2350,104.2,18\r\n'
+        '745001,2024-06-01,10,2,SL,,86.0,2500,,\r\n'
+    )
+
+    def fake_request(stat_type, season, start_date, end_date):
+        requested.append((stat_type, start_date, end_date))
+        return 'text/csv', 'utf-8', iter([body.encode()])
+
+    monkeypatch.setattr(statcast, '_statcast_request', fake_request)
+
+    assert statcast.load_statcast_pitches(2024, months=[6]) == 2
+    assert requested == [('pitches', '2024-06-01', '2024-06-30')]
+    assert store.leaders('exit_velocity', 2024, month=6)[0][1:] == (2, pytest.approx(104.2), 1)
+    assert store.leaders('velocity', 2024, month=6)[0][3] == 2
+
+
+def test_bad_requests_are_rejected(app, client):
+    assert client.get('/api/statcast/leaders?sort=-exit_velocity&season=2024').status_code == 503
+
+    app.extensions['pitch_store'] = PitchStore('unused')
+    assert client.get('/api/statcast/leaders?sort=-hits&season=2024').status_code == 400
+    assert client.get('/api/statcast/leaders?sort=-exit_velocity').status_code == 400
+    assert client.get('/api/statcast/leaders?sort=-velocity&season=2024&month=13').status_code == 400
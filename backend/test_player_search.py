@@ -0,0 +1,95 @@
+from app import create_app, db
+from app.models import Team, Player
+from app.services.player_index import PlayerNameIndex, fold
+from app.services.response_cache import invalidate
+from config import TestConfig
+
+NAMES = [
+    (1, 'Teoscar Hernández'), (2, 'Enrique Hernández'), (3, 'Freddie Freeman'),
+    (4, 'Will Smith'), (5, 'Dominic Smith'), (6, 'Smithson Ruiz'),
+    (7, 'Shohei Ohtani'), (8, 'Freddy Peralta')
+]
+
+
+def test_fold_strips_accents_and_punctuation():
+    assert fold('  Teoscar  Hernández ') == 'teoscar hernandez'
+    assert fold("Travis d'Arnaud") == 'travis darnaud'
+
+
+def test_search_is_accent_insensitive():
+    index = PlayerNameIndex(NAMES)
+
+    assert index.search('Hernandez') == [2, 1]
+    assert index.search('hernández') == [2, 1]
+
+
+def test_prefixes_rank_whole_names_and_words_first():
+    index = PlayerNameIndex(NAMES)
+
+    assert set(index.search('fre')) == {3, 8}
+    assert index.search('smith')[:3] == [4, 5, 6]
+    assert index.search('will smith')[0] == 4
+    assert index.search('sm wi') == [4]
+
+
+def test_fuzzy_matches_fill_in_after_prefix_matches():
+    index = PlayerNameIndex(NAMES)
+
+    assert index.search('freemen')[0] == 3
+    assert index.search('ohtany')[0] == 7
+    assert index.search('zzzz') == []
+
+
+def test_limit_applies_to_prefix_and_fuzzy_results():
+    index = PlayerNameIndex(NAMES)
+
+    assert len(index.search('smith', limit=2)) == 2
+
+
+def test_search_endpoint_ranks_from_the_index(client):
+    team = Team(name='Los Angeles Dodgers', abbreviation='LAD')
+    db.session.add(team)
+    db.session.flush()
+    db.session.add_all(Player(id=i, name=name, team_id=team.id) for i, name in NAMES)
+    db.session.commit()
+
+    response = client.get('/api/players/search?q=hernandez')
+
+    data = response.get_json()['data']
+    assert [row['name'] for row in data] == ['Enrique Hernández', 'Teoscar Hernández']
+    assert data[0]['team'] == 'LAD'
+
+
+def test_index_picks_up_new_players(client):
+    db.session.add(Player(id=1, name='Mookie Betts'))
+    db.session.commit()
+    assert [row['id'] for row in client.get('/api/players/search?q=betts').get_json()['data']] == [1]
+
+    db.session.add(Player(id=2, name='Mookie Wilson'))
+    db.session.commit()
+    invalidate('players')
+
+    data = client.get('/api/players/search?q=mookie').get_json()['data']
+    assert [row['id'] for row in data] == [1, 2]
+
+
+def test_players_added_by_another_process_are_found(tmp_path):
+    class SharedConfig(TestConfig):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{tmp_path}/shared.db'
+
+    # Two apps on one database stand in for the web and sync-worker processes
+    web, worker = create_app(SharedConfig), create_app(SharedConfig)
+    with web.app_context():
+        db.create_all()
+        db.session.add(Player(id=1, name='Will Smith'))
+        db.session.commit()
+    url = '/api/players/search?q=smith'
+    assert [row['id'] for row in web.test_client().get(url).get_json()['data']] == [1]
+
+    with worker.app_context():
+        db.session.add(Player(id=2, name='Dominic Smith'))
+        db.session.commit()
+
+    assert [row['id'] for row in web.test_client().get(url).get_json()['data']] == [1, 2]
+    with web.app_context():
+        db.drop_all()
@@ -0,0 +1,116 @@
+"""EXPLAIN checks for every supported stats filter combination.
+
+SQLite always runs. Set TEST_POSTGRES_URL to an empty scratch database to
+also check PostgreSQL plans; sequential scans are disabled there so any
+remaining Seq Scan means no index can serve the query.
+"""
+import json
+import os
+import pytest
+from sqlalchemy import text
+from app import create_app, db
+from app.services.aggregates import STAT_MODELS, season_totals_query
+from config import TestConfig
+
+POSTGRES_URL = os.environ.get('TEST_POSTGRES_URL')
+
+LEADERBOARD_FILTERS = {
+    'batting': [
+        {'season': 2024},
+        {'season': 2024, 'min_games': 100},
+        {'season': 2024, 'min_at_bats': 400},
+        {'season': 2024, 'min_hits': 150},
+        {'season': 2024, 'min_home_runs': 30},
+        {'team': 'LAD'},
+        {'season': 2024, 'team': 'LAD'},
+        {'season': 2024, 'team': 'LAD', 'min_home_runs': 30},
+    ],
+    'pitching': [
+        {'season': 2024},
+        {'season': 2024, 'min_games': 30},
+        {'season': 2024, 'min_innings': 150.0},
+        {'season': 2024, 'min_strikeouts': 200},
+        {'team': 'LAD'},
+        {'season': 2024, 'team': 'LAD'},
+        {'season': 2024, 'team': 'LAD', 'min_strikeouts': 200},
+    ]
+}
+
+PLAYER_FILTERS = [
+    {'player_id': 1},
+    {'player_id': 1, 'season': 2024},
+]
+
+
+def leaderboard_cases():
+    for stat_type, combinations in LEADERBOARD_FILTERS.items():
+        for filters in combinations:
+            yield pytest.param(
+                lambda t=stat_type, f=filters: season_totals_query(t, **f),
+                id=f'{stat_type}-leaderboard-{"-".join(sorted(filters))}'
+            )
+
+
+def player_cases():
+    for stat_type, model in STAT_MODELS.items():
+        for filters in PLAYER_FILTERS:
+            yield pytest.param(
+                lambda m=model, f=filters: m.query.filter_by(**f),
+                id=f'{stat_type}-player-{"-".join(sorted(filters))}'
+            )
+
+
+class PostgresTestConfig(TestConfig):
+    SQLALCHEMY_DATABASE_URI = POSTGRES_URL
+
+
+def sqlite_full_scans(sql):
+    plan = db.session.execute(text(f'EXPLAIN QUERY PLAN {sql}')).all()
+    return [row[-1] for row in plan if row[-1].startswith('SCAN ')]
+
+
+def postgres_full_scans(sql):
+    db.session.execute(text('SET LOCAL enable_seqscan = off'))
+    output = db.session.execute(text(f'EXPLAIN (FORMAT JSON) {sql}')).scalar()
+    if isinstance(output, str):
+        output = json.loads(output)
+    [plan] = output
+
+    scans = []
+    nodes = [plan['Plan']]
+    while nodes:
+        node = nodes.pop()
+        if node['Node Type'] == 'Seq Scan':
+            scans.append(node['Relation Name'])
+        nodes.extend(node.get('Plans', []))
+    return scans
+
+
+@pytest.fixture(params=[
+    'sqlite',
+    pytest.param('postgresql', marks=pytest.mark.skipif(
+        not POSTGRES_URL, reason='TEST_POSTGRES_URL is not set'))
+])
+def explain(request):
+    config = TestConfig if request.param == 'sqlite' else PostgresTestConfig
+    full_scans = sqlite_full_scans if request.param == 'sqlite' else postgres_full_scans
+
+    app = create_app(config)
+    with app.app_context():
+        db.create_all()
+
+        def run(query):
+            sql = query.statement.compile(
+                dialect=db.engine.dialect,
+                compile_kwargs={'literal_binds': True}
+            )
+            return full_scans(str(sql))
+
+        yield run
+        db.session.rollback()
+        db.drop_all()
+
+
+@pytest.mark.parametrize('build_query', [*leaderboard_cases(), *player_cases()])
+def test_filter_combination_uses_an_index(explain, build_query):
+    assert explain(build_query()) == []
@@ -0,0 +1,85 @@
+from datetime import date
+import pytest
+from app import cache, create_app, db
+from app.models import Player, Game
+from app.services.ingest import bulk_upsert_game_stats
+from app.services.response_cache import cache_stats
+from config import TestConfig
+
+
+class CachedTestConfig(TestConfig):
+    CACHE_TYPE = 'SimpleCache'
+
+
+@pytest.fixture
+def client():
+    app = create_app(CachedTestConfig)
+    with app.app_context():
+        db.create_all()
+        db.session.add(Player(id=1, name='Freddie Freeman'))
+        db.session.add_all(Game(id=i, date=date(2024, 4, i)) for i in (1, 2, 3))
+        db.session.commit()
+        write_game(1, season=2024)
+        write_game(3, season=2023)
+        yield app.test_client()
+        db.session.remove()
+        db.drop_all()
+
+
+def write_game(game_id, season):
+    bulk_upsert_game_stats('batting', [{
+        'player_id': 1, 'game_id': game_id, 'season': season,
+        'at_bats': 4, 'hits': 2, 'runs': 1, 'rbis': 1, 'home_runs': 0
+    }])
+
+
+def counted_get(client, url):
+    before = cache_stats()
+    response = client.get(url)
+    after = cache_stats()
+    return response, after['hits'] - before['hits']
+
+
+def test_identical_requests_hit_the_cache(client):
+    counted_get(client, '/api/stats/batting?season=2024&min_hits=1')
+
+    response, hits = counted_get(client, '/api/stats/batting?min_hits=1&season=2024&team=')
+
+    assert hits == 1
+    assert response.get_json()['data'][0]['hits'] == 2
+    assert client.get('/api/cache/stats').get_json()['data']['hits'] >= 1
+
+
+def test_writes_invalidate_their_season_only(client):
+    counted_get(client, '/api/stats/batting?season=2024')
+    counted_get(client, '/api/stats/batting?season=2023')
+
+    write_game(2, season=2024)
+    response, hits_2024 = counted_get(client, '/api/stats/batting?season=2024')
+    _, hits_2023 = counted_get(client, '/api/stats/batting?season=2023')
+
+    assert hits_2024 == 0
+    assert response.get_json()['data'][0]['hits'] == 4
+    assert hits_2023 == 1
+
+
+def test_evicted_generation_tokens_are_not_reused(client):
+    url = '/api/stats/batting/career?sort=-hits'
+    cache.delete('generation:season:all')
+    counted_get(client, url)
+    write_game(2, season=2024)
+    cache.delete('generation:season:all')  # e.g. pruned by SimpleCache or Redis maxmemory
+
+    response, hits = counted_get(client, url)
+
+    assert hits == 0
+    assert response.get_json()['data'][0]['hits'] == 6
+
+
+def test_pending_responses_are_not_cached(client):
+    counted_get(client, '/api/stats/pitching?season=2024')
+
+    response, hits = counted_get(client, '/api/stats/pitching?season=2024')
+
+    assert response.status_code == 202
+    assert hits == 0
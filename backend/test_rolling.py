@@ -0,0 +1,155 @@
+from datetime import date, timedelta
+import pytest
+from sqlalchemy import insert
+from app import create_app, db
+from app.models import Game, Player, Team
+from app.services.game_logs import game_log
+from app.services.ingest import bulk_upsert_game_stats
+from config import TestConfig
+
+OPENING_DAY = date(2024, 4, 1)
+
+# player_id -> hits per game; game i is played on OPENING_DAY + 2 * i
+HITS = {
+    1: [0, 1, 2, 3, 4],
+    2: [3, 3, 0, 0, 0],
+    3: [1, None, 1, 1, 2]  # None: on the roster but did not bat
+}
+
+
+@pytest.fixture
+def game_logs(app):
+    db.session.add(Team(id=1, name='Los Angeles Dodgers', abbreviation='LAD'))
+    db.session.execute(insert(Player), [
+        {'id': i, 'name': f'Player {i}', 'team_id': 1 if i != 2 else None} for i in HITS
+    ])
+    db.session.execute(insert(Game), [
+        {'id': i + 1, 'date': OPENING_DAY + timedelta(days=2 * i)} for i in range(5)
+    ])
+    db.session.commit()
+    bulk_upsert_game_stats('batting', [
+        {'player_id': player_id, 'game_id': game + 1, 'season': 2024, 'at_bats': 4 if hits is not None else 0,
+         'hits': hits, 'runs': 0, 'rbis': 0, 'home_runs': 0}
+        for player_id, games in HITS.items() for game, hits in enumerate(games)
+    ])
+
+
+def both_paths(app, client, url):
+    """The response JSON from SQL, then from the in-memory game logs (when numpy is here)."""
+    app.config['COLUMNAR_SNAPSHOT'] = False
+    sql = client.get(url).get_json()
+    pytest.importorskip('numpy')
+    app.config['COLUMNAR_SNAPSHOT'] = True
+    return sql, client.get(url).get_json()
+
+
+def test_hottest_hitters_over_the_last_days(app, client, game_logs):
+    sql, arrays = both_paths(app, client, '/api/stats/batting/hot?sort=-hits&days=5')
+
+    # As of the last game (April 9): games on April 5, 7 and 9
+    assert sql['as_of'] == '2024-04-09'
+    assert [(row['rank'], row['player_id'], row['hits'], row['games']) for row in sql['data']] == [
+        (1, 1, 9, 3), (2, 3, 4, 3), (3, 2, 0, 3)
+    ]
+    assert sql['data'][0]['batting_average'] == pytest.approx(0.75)
+    assert arrays == sql
+
+
+def test_hot_page_size_is_at_least_one(app, client, game_logs):
+    for limit in (0, -1):
+        sql, arrays = both_paths(app, client, f'/api/stats/batting/hot?sort=-hits&days=5&limit={limit}')
+
+        assert [row['player_id'] for row in sql['data']] == [1]
+        assert arrays == sql
+
+
+@pytest.mark.parametrize('url', [
+    '/api/stats/batting/hot?sort=-hits&days=3&as_of=2024-04-04',
+    '/api/stats/batting/hot?sort=hits&days=30&min_at_bats=20',
+    '/api/stats/batting/hot?sort=-batting_average&days=2&team=LAD',
+    '/api/stats/batting/hot?sort=-hits&days=1&as_of=2024-04-02',
+])
+def test_hot_leaders_match_sql(app, client, game_logs, url):
+    sql, arrays = both_paths(app, client, url)
+
+    assert arrays == sql
+
+
+def test_rolling_series_by_days_and_games(app, client, game_logs):
+    for unit, window, expected in (('days', 3, [0, 1, 3, 5, 7]), ('games', 4, [0, 1, 3, 6, 10])):
+        url = f'/api/players/1/rolling?window={window}&unit={unit}&season=2024'
+        sql, arrays = both_paths(app, client, url)
+
+        assert [row['hits'] for row in sql['data']] == expected
+        assert arrays == sql
+    assert sql['data'][0] == {
+        'date': '2024-04-01', 'game_id': 1, 'games': 1, 'at_bats': 4, 'hits': 0, 'runs': 0,
+        'rbis': 0, 'home_runs': 0, 'batting_average': 0.0
+    }
+
+
+def test_day_windows_stay_within_the_player(app, game_logs):
+    pytest.importorskip('numpy')
+    app.config['COLUMNAR_SNAPSHOT'] = True
+    log = game_log(app, 'batting', 2024)
+
+    # Player 1's rows sit right before player 2's; a window wider than the
+    # day bits used to reach back into them
+    _, wide = log.rolling(2, 1_100_000)
+    _, season = log.rolling(2, 366)
+
+    assert wide['hits'].tolist() == season['hits'].tolist() == [3, 6, 6, 6, 6]
+
+
+def test_games_without_at_bats_leave_rates_empty(app, client, game_logs):
+    sql, arrays = both_paths(app, client, '/api/players/3/rolling?window=1&season=2024')
+
+    assert [row['batting_average'] for row in sql['data']] == [0.25, None, 0.25, 0.25, 0.5]
+    assert arrays == sql
+
+
+def test_game_logs_are_reloaded_after_writes(app, client, game_logs):
+    pytest.importorskip('numpy')
+    app.config['COLUMNAR_SNAPSHOT'] = True
+    url = '/api/stats/batting/hot?sort=-hits&days=1'
+    assert client.get(url).get_json()['data'][0]['hits'] == 4
+
+    bulk_upsert_game_stats('batting', [{'player_id': 2, 'game_id': 5, 'season': 2024,
+                                        'at_bats': 5, 'hits': 5, 'runs': 0, 'rbis': 0, 'home_runs': 0}])
+
+    assert client.get(url).get_json()['data'][0]['player_id'] == 2
+
+
+def test_writes_by_another_process_are_served(tmp_path):
+    pytest.importorskip('numpy')
+
+    class SharedConfig(TestConfig):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{tmp_path}/shared.db'
+        COLUMNAR_SNAPSHOT = True
+
+    # Two apps on one database stand in for the web and sync-worker processes
+    web, worker = create_app(SharedConfig), create_app(SharedConfig)
+    line = {'player_id': 1, 'game_id': 1, 'season': 2024, 'at_bats': 4, 'hits': 1}
+    with web.app_context():
+        db.create_all()
+        db.session.add(Player(id=1, name='Mookie Betts'))
+        db.session.add(Game(id=1, date=OPENING_DAY))
+        db.session.commit()
+        bulk_upsert_game_stats('batting', [line])
+    url = '/api/stats/batting/hot?sort=-hits&days=1'
+    assert web.test_client().get(url).get_json()['data'][0]['hits'] == 1
+
+    with worker.app_context():
+        bulk_upsert_game_stats('batting', [{**line, 'hits': 4}])
+
+    assert web.test_client().get(url).get_json()['data'][0]['hits'] == 4
+    with web.app_context():
+        db.drop_all()
+
+
+def test_bad_requests_are_rejected(client, game_logs):
+    assert client.get('/api/stats/batting/hot').status_code == 400
+    assert client.get('/api/stats/batting/hot?sort=-hits&as_of=yesterday').status_code == 400
+    assert client.get('/api/stats/batting/hot?sort=-hits&days=0').status_code == 400
+    assert client.get('/api/players/1/rolling?unit=weeks').status_code == 400
+    assert client.get('/api/players/1/rolling?window=367').status_code == 400
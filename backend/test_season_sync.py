@@ -0,0 +1,146 @@
+import os
+import pytest
+from app import create_app, db
+from app.models import Team, Player, Game, BattingStats, PitchingStats, PlayerSeasonBatting, SyncCheckpoint
+from app.services.mlb_api import MLBAPIService
+from app.services.season_sync import game_record, innings, sync_season
+from config import TestConfig
+
+POSTGRES_URL = os.environ.get('TEST_POSTGRES_URL')
+
+DODGERS = {'id': 119, 'name': 'Los Angeles Dodgers', 'abbreviation': 'LAD'}
+GIANTS = {'id': 137, 'name': 'San Francisco Giants', 'abbreviation': 'SF'}
+
+
+def game_log(players=5, games=3):
+    """One batting split per player per game; players alternate between the two clubs."""
+    splits = []
+    for game in range(games):
+        for player in range(players):
+            team, opponent = (DODGERS, GIANTS) if player % 2 == 0 else (GIANTS, DODGERS)
+            splits.append({
+                'date': f'2024-04-0{game + 1}',
+                'isHome': team is DODGERS,
+                'team': team,
+                'opponent': opponent,
+                'player': {'id': 1000 + player, 'fullName': f'Player {player}'},
+                'position': {'abbreviation': 'SS'},
+                'game': {'gamePk': 700000 + game},
+                'stat': {'atBats': 4, 'hits': 1, 'runs': 0, 'rbi': 1, 'homeRuns': player % 2, 'avg': '.250'}
+            })
+    return splits
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """Serves game_log() in pages; `fail_at` makes the page at that offset raise."""
+    state = {'splits': game_log(), 'offsets': [], 'fail_at': None}
+
+    def get_season_game_logs(season, stat_type, offset, limit):
+        state['offsets'].append(offset)
+        if offset == state['fail_at']:
+            raise ConnectionError('upstream went away')
+        return state['splits'][offset:offset + limit]
+
+    monkeypatch.setattr(MLBAPIService, 'get_season_game_logs', staticmethod(get_season_game_logs))
+    return state
+
+
+def test_innings_notation_is_converted():
+    assert innings('6.1') == pytest.approx(6 + 1 / 3)
+    assert innings('7.2') == pytest.approx(7 + 2 / 3)
+    assert innings('5.0') == 5
+    assert innings(None) is None
+
+
+def test_counting_stats_are_integers():
+    record = game_record('batting', 2024, game_log(players=1, games=1)[0])
+
+    assert [type(record[column]) for column in ('at_bats', 'hits', 'home_runs')] == [int] * 3
+    assert record['batting_average'] == 0.25
+
+
+def test_season_is_synced_in_pages(app, upstream):
+    written = sync_season(2024, 'batting', page_size=4)
+
+    assert written == 15
+    assert upstream['offsets'] == [0, 4, 8, 12]
+    assert BattingStats.query.count() == 15
+    assert Player.query.count() == 5
+    assert Game.query.count() == 3
+    assert {team.abbreviation for team in Team.query} == {'LAD', 'SF'}
+    game = db.session.get(Game, 700000)
+    assert (game.home_team_id, game.away_team_id) == (119, 137)
+
+    totals = db.session.get(PlayerSeasonBatting, (1001, 2024))
+    assert (totals.games, totals.at_bats, totals.home_runs) == (3, 12, 3)
+
+
+def test_interrupted_sync_resumes_from_the_checkpoint(app, upstream):
+    upstream['fail_at'] = 8
+    with pytest.raises(ConnectionError):
+        sync_season(2024, 'batting', page_size=4)
+    checkpoint = SyncCheckpoint.query.one()
+    assert (checkpoint.cursor, checkpoint.completed) == ('8', False)
+    assert BattingStats.query.count() == 8
+
+    upstream['fail_at'] = None
+    upstream['offsets'].clear()
+    sync_season(2024, 'batting', page_size=4)
+
+    assert upstream['offsets'] == [8, 12]
+    assert BattingStats.query.count() == 15
+    assert SyncCheckpoint.query.one().completed
+
+
+def test_completed_sync_starts_over(app, upstream):
+    sync_season(2024, 'batting', page_size=10)
+    upstream['offsets'].clear()
+
+    sync_season(2024, 'batting', page_size=10)
+
+    assert upstream['offsets'] == [0, 10]
+    assert BattingStats.query.count() == 15
+
+
+def test_existing_teams_are_matched_by_name(app, upstream):
+    db.session.add(Team(id=1, name='Los Angeles Dodgers', abbreviation='LAD'))
+    db.session.commit()
+
+    sync_season(2024, 'batting', page_size=100)
+
+    assert Team.query.count() == 2
+    assert db.session.get(Player, 1000).team_id == 1
+    assert {row.team_id for row in BattingStats.query.filter_by(player_id=1000)} == {1}
+
+
+def test_pitching_lines_are_mapped(app, upstream):
+    for split in upstream['splits']:
+        split['stat'] = {'inningsPitched': '6.1', 'hits': 5, 'runs': 2, 'earnedRuns': 2,
+                         'baseOnBalls': 1, 'strikeOuts': 7, 'era': '2.84'}
+
+    sync_season(2024, 'pitching', page_size=100)
+
+    row = PitchingStats.query.first()
+    assert row.innings_pitched == pytest.approx(6 + 1 / 3)
+    assert (row.strikeouts, row.era) == (7, 2.84)
+
+
+class PostgresTestConfig(TestConfig):
+    SQLALCHEMY_DATABASE_URI = POSTGRES_URL
+
+
+@pytest.mark.skipif(not POSTGRES_URL, reason='TEST_POSTGRES_URL is not set')
+def test_sync_copies_into_postgres(upstream):
+    # PostgreSQL upserts go through COPY, which rejects '4.0' for an integer column
+    app = create_app(PostgresTestConfig)
+    with app.app_context():
+        db.create_all()
+        try:
+            sync_season(2024, 'batting', page_size=100)
+
+            assert BattingStats.query.count() == 15
+            assert db.session.get(PlayerSeasonBatting, (1000, 2024)).hits == 3
+        finally:
+            db.session.rollback()
+            db.drop_all()
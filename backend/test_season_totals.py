@@ -0,0 +1,64 @@
+from datetime import date
+from app import db
+from app.models import Team, Player, Game, BattingStats, PlayerSeasonBatting
+from app.services.season_totals import refresh_season_totals
+
+
+def add_game_line(player_id, game_id, season, hits):
+    db.session.add(BattingStats(
+        player_id=player_id, game_id=game_id, season=season,
+        at_bats=4, hits=hits, runs=0, rbis=0, home_runs=0
+    ))
+
+
+def seed():
+    team = Team(name='Los Angeles Dodgers', abbreviation='LAD')
+    db.session.add(team)
+    db.session.flush()
+    players = [Player(name=name, team_id=team.id) for name in ('Betts', 'Freeman')]
+    games = [Game(date=date(2024, 4, day)) for day in (1, 2)]
+    db.session.add_all(players + games)
+    db.session.flush()
+    return players, games
+
+
+def test_refresh_only_recomputes_touched_seasons(app):
+    (betts, freeman), (first, second) = seed()
+    add_game_line(betts.id, first.id, 2024, 2)
+    add_game_line(freeman.id, first.id, 2024, 1)
+    refresh_season_totals('batting', [(betts.id, 2024), (freeman.id, 2024)])
+    db.session.commit()
+
+    add_game_line(betts.id, second.id, 2024, 3)
+    add_game_line(freeman.id, second.id, 2024, 3)
+    refresh_season_totals('batting', [(betts.id, 2024)])
+    db.session.commit()
+
+    totals = {row.player_id: row for row in PlayerSeasonBatting.query}
+    assert (totals[betts.id].games, totals[betts.id].hits) == (2, 5)
+    assert totals[betts.id].batting_average == 5 / 8
+    assert (totals[freeman.id].games, totals[freeman.id].hits) == (1, 1)
+
+
+def test_rebuild_command_backfills_totals(app):
+    (betts, _), (first, _) = seed()
+    add_game_line(betts.id, first.id, 2024, 2)
+    db.session.commit()
+
+    result = app.test_cli_runner().invoke(args=['rebuild-season-totals', '--type', 'batting'])
+
+    assert 'Rebuilt 1 batting season rows' in result.output
+    assert PlayerSeasonBatting.query.one().hits == 2
+
+
+def test_leaderboard_does_not_scan_game_rows(client, query_counter):
+    (betts, _), (first, _) = seed()
+    add_game_line(betts.id, first.id, 2024, 2)
+    refresh_season_totals('batting', [(betts.id, 2024)])
+    db.session.commit()
+    query_counter.clear()
+
+    response = client.get('/api/stats/batting?season=2024')
+
+    assert len(response.get_json()['data']) == 1
+    assert not any('batting_stats' in statement for statement in query_counter)
@@ -0,0 +1,38 @@
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from flask.json.provider import DefaultJSONProvider
+from app import db
+from app.models import Player, Game, BattingStats
+
+
+def test_encoding_matches_the_default_provider(app):
+    payload = {'b': [1, 2.5, None], 'a': {'when': date(2024, 4, 1), 'at': datetime(2024, 4, 1, 19, 5)},
+               'avg': Decimal('0.312')}
+
+    fast = json.loads(app.json.dumps(payload))
+
+    assert fast == json.loads(DefaultJSONProvider(app).dumps(payload))
+    assert list(json.loads(app.json.dumps({'b': 1, 'a': 2}))) == ['a', 'b']
+
+
+def test_jsonify_writes_utf8(app):
+    with app.test_request_context():
+        response = app.json.response({'name': 'Ronald Acuña'})
+
+    assert response.mimetype == 'application/json'
+    assert json.loads(response.get_data()) == {'name': 'Ronald Acuña'}
+    assert 'Acuña'.encode() in response.get_data()
+
+
+def test_player_stats_are_serialized_from_rows(client):
+    db.session.add(Player(id=1, name='Mookie Betts'))
+    db.session.add(Game(id=1, date=date(2024, 4, 1)))
+    db.session.add(BattingStats(player_id=1, game_id=1, season=2024, at_bats=4, hits=2,
+                                runs=1, rbis=0, home_runs=0, batting_average=0.5))
+    db.session.commit()
+    expected = BattingStats.query.one().to_dict()
+
+    response = client.get('/api/stats/player/1?season=2024')
+
+    assert response.get_json()['data']['stats'] == [expected]
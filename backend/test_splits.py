@@ -0,0 +1,121 @@
+from datetime import date
+import pytest
+from sqlalchemy import insert
+from app import db
+from app.models import Game, Player, PlayerSplitBatting, Team
+from app.services.ingest import bulk_upsert_game_stats
+from app.services.season_totals import rebuild_season_totals
+from app.services.splits import split_aggregate_select
+
+
+def line(player_id, game_id, hits, team_id=None, at_bats=4, home_runs=0):
+    return {'player_id': player_id, 'game_id': game_id, 'season': 2024, 'team_id': team_id,
+            'at_bats': at_bats, 'hits': hits, 'runs': 0, 'rbis': 0, 'home_runs': home_runs}
+
+
+@pytest.fixture
+def season(app):
+    db.session.execute(insert(Team), [
+        {'id': 1, 'name': 'Los Angeles Dodgers', 'abbreviation': 'LAD'},
+        {'id': 2, 'name': 'San Francisco Giants', 'abbreviation': 'SF'},
+        {'id': 3, 'name': 'San Diego Padres', 'abbreviation': 'SD'}
+    ])
+    # Player 2 has since moved to SF, but played these games for LAD
+    db.session.execute(insert(Player), [
+        {'id': 1, 'name': 'Mookie Betts', 'team_id': 1},
+        {'id': 2, 'name': 'Traded Player', 'team_id': 2}
+    ])
+    db.session.execute(insert(Game), [
+        {'id': 1, 'date': date(2024, 4, 1), 'home_team_id': 1, 'away_team_id': 2},
+        {'id': 2, 'date': date(2024, 4, 2), 'home_team_id': 3, 'away_team_id': 1},
+        {'id': 3, 'date': date(2024, 5, 1), 'home_team_id': 1, 'away_team_id': 3},
+        {'id': 4, 'date': date(2024, 5, 2), 'home_team_id': 2, 'away_team_id': 3}
+    ])
+    db.session.commit()
+    # Player 2's May game was synced without a team; it is not known to be for SF
+    bulk_upsert_game_stats('batting', [
+        line(1, 1, 1, team_id=1), line(1, 2, 2, team_id=1, home_runs=1), line(1, 3, 3, team_id=1),
+        line(2, 1, 0, team_id=1), line(2, 2, 1, team_id=1), line(2, 4, 2)
+    ])
+
+
+def test_player_splits(client, season):
+    data = client.get('/api/players/1/splits?season=2024').get_json()['data']
+
+    assert [(row['value'], row['games'], row['hits']) for row in data['venue']] == [
+        ('away', 1, 2), ('home', 2, 4)
+    ]
+    assert [(row['value'], row['team'], row['hits']) for row in data['opponent']] == [
+        (2, 'SF', 1), (3, 'SD', 5)
+    ]
+    assert [(row['value'], row['at_bats'], row['hits']) for row in data['month']] == [
+        (4, 8, 3), (5, 4, 3)
+    ]
+    assert data['venue'][0]['batting_average'] == pytest.approx(0.5)
+
+
+def test_splits_use_the_team_of_each_game(client, season):
+    data = client.get('/api/players/2/splits?season=2024').get_json()['data']
+
+    assert [(row['value'], row['hits']) for row in data['month']] == [(4, 1), (5, 2)]
+    assert [(row['value'], row['hits']) for row in data['opponent']] == [(2, 0), (3, 1)]
+    assert {'venue': data['venue']} == {'venue': [
+        {'value': 'away', 'games': 1, 'at_bats': 4, 'hits': 1, 'runs': 0, 'rbis': 0,
+         'home_runs': 0, 'batting_average': 0.25},
+        {'value': 'home', 'games': 1, 'at_bats': 4, 'hits': 0, 'runs': 0, 'rbis': 0,
+         'home_runs': 0, 'batting_average': 0.0}
+    ]}
+
+
+def test_split_page_reads_only_split_totals(client, season, query_counter):
+    query_counter.clear()
+
+    client.get('/api/players/1/splits?season=2024')
+
+    assert len(query_counter) == 2
+    assert not any('batting_stats' in statement for statement in query_counter)
+
+
+def test_split_totals_follow_ingest(app, client, season):
+    # A scoring correction refreshes only that player-season, splits included
+    bulk_upsert_game_stats('batting', [line(1, 3, 4)])
+    url = '/api/players/1/splits?season=2024&split=month'
+
+    assert [row['hits'] for row in client.get(url).get_json()['data']['month']] == [3, 4]
+    live = db.session.execute(split_aggregate_select('batting', 'opponent')).all()
+    assert rebuild_season_totals('batting', season=2024) == 2
+    stored = db.session.query(
+        PlayerSplitBatting.player_id, PlayerSplitBatting.value, PlayerSplitBatting.hits
+    ).filter_by(split='opponent').order_by(PlayerSplitBatting.player_id, PlayerSplitBatting.value)
+    expected = [(1, '2', 1), (1, '3', 6), (2, '2', 0), (2, '3', 1)]
+    assert [(row.player_id, row.value, row.hits) for row in live] == expected
+    assert [tuple(row) for row in stored] == expected
+
+
+def test_split_leaders(client, season):
+    away = client.get('/api/stats/batting/splits/venue?value=away&sort=-hits&season=2024')
+    versus = client.get('/api/stats/batting/splits/opponent?value=sd&sort=-hits')
+    april = client.get('/api/stats/batting/splits/month?value=4&sort=-hits&min_at_bats=5')
+
+    assert [(row['rank'], row['player_id'], row['hits']) for row in away.get_json()['data']] == [
+        (1, 1, 2), (2, 2, 1)
+    ]
+    assert [(row['player_id'], row['hits']) for row in versus.get_json()['data']] == [(1, 5), (2, 1)]
+    assert [(row['player_id'], row['at_bats']) for row in april.get_json()['data']] == [
+        (1, 8), (2, 8)
+    ]
+
+
+def test_split_leaders_page_size_is_at_least_one(client, season):
+    url = '/api/stats/batting/splits/venue?value=away&sort=-hits&season=2024&limit='
+
+    assert [len(client.get(url + limit).get_json()['data']) for limit in ('0', '-1')] == [1, 1]
+
+
+def test_bad_split_requests_are_rejected(client, season):
+    assert client.get('/api/players/1/splits').status_code == 400
+    assert client.get('/api/players/1/splits?season=2024&split=weekday').status_code == 400
+    assert client.get('/api/stats/batting/splits/venue?value=road&sort=-hits').status_code == 400
+    assert client.get('/api/stats/batting/splits/month?value=13&sort=-hits').status_code == 400
+    assert client.get('/api/stats/batting/splits/opponent?value=XYZ&sort=-hits').status_code == 400
+    assert client.get('/api/stats/batting/splits/venue?value=home').status_code == 400
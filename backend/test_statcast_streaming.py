@@ -0,0 +1,88 @@
+import json
+import threading
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from app import db
+from app.models import Player, Game, BattingStats, PlayerSeasonBatting
+from app.utils.statcast import stream_statcast_data, sync_statcast_data
+from app.utils.streaming import iter_json_array
+
+RECORDS = [
+    {'player_id': 1, 'game_id': game_id, 'player_name': 'Mookie Betts',
+     'at_bats': 4, 'hits': 2, 'runs': 1, 'rbis': 0, 'home_runs': 0}
+    for game_id in (1, 2, 3)
+]
+
+BODIES = {
+    'application/json': json.dumps(RECORDS),
+    'application/x-ndjson': '\n'.join(json.dumps(record) for record in RECORDS) + '\n',
+    'text/csv': 'player_id,game_id,player_name,at_bats,hits,runs,rbis,home_runs\r\n' + ''.join(
+        f'1,{record["game_id"]},Mookie Betts,4,2,1,0,0\r\n' for record in RECORDS
+    )
+}
+
+
+class FakeStatcastHandler(BaseHTTPRequestHandler):
+    """Serves BODIES with chunked transfer encoding, a few bytes per chunk."""
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        body = BODIES[self.server.content_type].encode()
+        self.send_response(200)
+        self.send_header('Content-Type', self.server.content_type)
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        for start in range(0, len(body), 7):
+            chunk = body[start:start + 7]
+            self.wfile.write(f'{len(chunk):x}\r\n'.encode() + chunk + b'\r\n')
+        self.wfile.write(b'0\r\n\r\n')
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def statcast_server(app):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeStatcastHandler)
+    server.content_type = 'application/json'
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    app.config['STATCAST_API_URL'] = f'http://127.0.0.1:{server.server_port}'
+    app.config['STATCAST_API_KEY'] = 'test-key'
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.parametrize('content_type', list(BODIES))
+def test_stream_yields_processed_records(statcast_server, content_type):
+    statcast_server.content_type = content_type
+
+    records = list(stream_statcast_data('batting', season=2024))
+
+    assert [record['game_id'] for record in records] == [1, 2, 3]
+    assert records[0]['name'] == 'Mookie Betts'
+    assert records[0]['hits'] == 2
+    assert records[0]['season'] == 2024
+
+
+def test_sync_streams_into_database(statcast_server):
+    db.session.add(Player(id=1, name='Mookie Betts'))
+    db.session.add_all(Game(id=i, date=date(2024, 4, i)) for i in (1, 2, 3))
+    db.session.commit()
+    statcast_server.content_type = 'application/x-ndjson'
+
+    written = sync_statcast_data('batting', season=2024)
+
+    assert written == 3
+    assert BattingStats.query.count() == 3
+    assert PlayerSeasonBatting.query.one().hits == 6
+
+
+def test_json_array_elements_can_span_chunks():
+    body = json.dumps([{'a': 'x' * 10, 'b': [1, 2]}, {'a': 'é'}])
+
+    items = list(iter_json_array(body[i:i + 3] for i in range(0, len(body), 3)))
+
+    assert items == [{'a': 'x' * 10, 'b': [1, 2]}, {'a': 'é'}]
@@ -0,0 +1,184 @@
+import json
+from datetime import date
+from app import db
+from app.models import Team, Player, Game, BattingStats, PitchingStats
+from app.services.season_totals import rebuild_season_totals
+
+
+def rebuild_totals():
+    rebuild_season_totals('batting')
+    rebuild_season_totals('pitching')
+    db.session.commit()
+
+
+def seed_players(count, season=2024):
+    """Adds `count` players, each on their own team with one game row of stats."""
+    game = Game(date=date(season, 4, 1))
+    db.session.add(game)
+    db.session.flush()
+    for i in range(count):
+        team = Team(name=f'Team {i}', abbreviation=f'T{i:02d}')
+        db.session.add(team)
+        db.session.flush()
+        player = Player(name=f'Player {i}', team_id=team.id, position='SS')
+        db.session.add(player)
+        db.session.flush()
+        db.session.add(BattingStats(
+            player_id=player.id, game_id=game.id, season=season, team_id=team.id,
+            at_bats=4, hits=1, runs=0, rbis=1, home_runs=0, batting_average=0.250
+        ))
+        db.session.add(PitchingStats(
+            player_id=player.id, game_id=game.id, season=season, team_id=team.id,
+            innings_pitched=6.0, hits_allowed=5, runs_allowed=2, earned_runs=2,
+            walks=1, strikeouts=7, era=3.00
+        ))
+    db.session.commit()
+    rebuild_totals()
+    db.session.expunge_all()
+
+
+def test_batting_rows_include_team_abbreviation(client):
+    seed_players(2)
+
+    response = client.get('/api/stats/batting?season=2024')
+
+    data = response.get_json()['data']
+    assert response.status_code == 200
+    assert sorted(row['team'] for row in data) == ['T00', 'T01']
+    assert data[0]['name'].startswith('Player')
+    assert data[0]['at_bats'] == 4
+
+
+def test_team_filter_uses_abbreviation(client):
+    seed_players(3)
+
+    response = client.get('/api/stats/pitching?season=2024&team=T01')
+
+    data = response.get_json()['data']
+    assert [row['team'] for row in data] == ['T01']
+    assert data[0]['strikeouts'] == 7
+
+
+def test_query_count_does_not_grow_with_result_size(client, query_counter):
+    seed_players(2)
+    query_counter.clear()
+    client.get('/api/stats/batting?season=2024')
+    small = len(query_counter)
+
+    seed_players(25, season=2024)
+    query_counter.clear()
+    response = client.get('/api/stats/batting?season=2024')
+
+    assert len(response.get_json()['data']) == 27
+    assert len(query_counter) == small
+
+
+def test_batting_rows_are_season_totals(client):
+    seed_players(1)
+    player = Player.query.first()
+    second_game = Game(date=date(2024, 4, 2))
+    db.session.add(second_game)
+    db.session.flush()
+    db.session.add(BattingStats(
+        player_id=player.id, game_id=second_game.id, season=2024,
+        at_bats=4, hits=3, runs=1, rbis=2, home_runs=1, batting_average=0.750
+    ))
+    db.session.commit()
+    rebuild_totals()
+
+    response = client.get('/api/stats/batting?season=2024')
+
+    [row] = response.get_json()['data']
+    assert row['games'] == 2
+    assert row['at_bats'] == 8
+    assert row['hits'] == 4
+    assert row['batting_average'] == 0.5
+
+
+def test_minimums_filter_on_season_totals(client):
+    seed_players(2)
+    player = Player.query.first()
+    second_game = Game(date=date(2024, 4, 2))
+    db.session.add(second_game)
+    db.session.flush()
+    db.session.add(PitchingStats(
+        player_id=player.id, game_id=second_game.id, season=2024,
+        innings_pitched=3.0, hits_allowed=1, runs_allowed=0, earned_runs=0,
+        walks=0, strikeouts=2, era=0.0
+    ))
+    db.session.commit()
+    rebuild_totals()
+
+    response = client.get('/api/stats/pitching?season=2024&min_games=2&min_strikeouts=9')
+
+    [row] = response.get_json()['data']
+    assert row['player_id'] == player.id
+    assert row['innings_pitched'] == 9.0
+    assert row['era'] == 2.0
+    assert row['strikeouts_per_nine'] == 9.0
+
+
+def test_unknown_stat_type_is_rejected(client):
+    response = client.get('/api/stats/fielding')
+
+    assert response.status_code == 400
+
+
+def test_pages_follow_the_cursor(client):
+    seed_players(5)
+
+    first = client.get('/api/stats/batting?season=2024&limit=2').get_json()
+    second = client.get(f'/api/stats/batting?season=2024&limit=2&cursor={first["next_cursor"]}').get_json()
+    last = client.get(f'/api/stats/batting?season=2024&limit=2&cursor={second["next_cursor"]}').get_json()
+
+    pages = [[row['player_id'] for row in page['data']] for page in (first, second, last)]
+    assert pages == [[1, 2], [3, 4], [5]]
+    assert last['next_cursor'] is None
+
+
+def test_default_page_size_comes_from_config(client, app):
+    app.config['ITEMS_PER_PAGE'] = 3
+    seed_players(5)
+
+    body = client.get('/api/stats/pitching?season=2024').get_json()
+
+    assert len(body['data']) == 3
+    assert body['next_cursor']
+
+
+def test_page_size_is_at_least_one(client):
+    seed_players(3)
+
+    for limit in (0, -1):
+        response = client.get(f'/api/stats/batting?season=2024&limit={limit}')
+        body = response.get_json()
+
+        assert response.status_code == 200
+        assert [row['player_id'] for row in body['data']] == [1]
+        assert body['next_cursor']
+
+
+def test_invalid_cursor_is_rejected(client):
+    response = client.get('/api/stats/batting?cursor=not-a-cursor')
+
+    assert response.status_code == 400
+
+
+def test_streamed_ndjson_has_every_row(client, app):
+    app.config['STREAM_BATCH_SIZE'] = 2
+    seed_players(5)
+
+    response = client.get('/api/stats/batting?season=2024&stream=ndjson')
+
+    assert response.is_streamed
+    rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [row['player_id'] for row in rows] == [1, 2, 3, 4, 5]
+
+
+def test_streamed_json_keeps_the_envelope(client):
+    seed_players(3)
+
+    body = json.loads(client.get('/api/stats/batting?season=2024&stream=json').get_data())
+
+    assert body['success'] is True
+    assert len(body['data']) == 3
@@ -0,0 +1,160 @@
+import threading
+import time
+import pytest
+from app import create_app, db
+from app.models import Player
+from app.services.mlb_api import MLBAPIService
+from app.services.upstream import SingleFlight, upstream_stats
+from config import TestConfig
+
+
+class CachedTestConfig(TestConfig):
+    CACHE_TYPE = 'SimpleCache'
+
+
+@pytest.fixture
+def app():
+    app = create_app(CachedTestConfig)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """Replaces the HTTP call; `responses` maps endpoint -> response, calls are recorded."""
+    calls = []
+    responses = {}
+
+    def make_request(endpoint, params=None):
+        calls.append((endpoint, params))
+        time.sleep(0.05)
+        response = responses.get(endpoint, {})
+        return response(params) if callable(response) else response
+
+    monkeypatch.setattr(MLBAPIService, '_make_request', staticmethod(make_request))
+    return calls, responses
+
+
+def counted(name, before):
+    return upstream_stats()[name] - before[name]
+
+
+def test_concurrent_callers_share_one_call():
+    flights = SingleFlight()
+    calls = []
+    results = []
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.1)
+        return {'id': 1}
+
+    before = upstream_stats()
+    threads = [threading.Thread(target=lambda: results.append(flights.do(('k',), fetch))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == [{'id': 1}] * 8
+    assert counted('coalesced', before) == 7
+
+
+def test_waiters_see_the_leaders_exception():
+    flights = SingleFlight()
+    started = threading.Event()
+    errors = []
+
+    def fetch():
+        started.set()
+        time.sleep(0.1)
+        raise RuntimeError('upstream down')
+
+    def call():
+        try:
+            flights.do(('k',), fetch)
+        except RuntimeError as e:
+            errors.append(str(e))
+
+    leader = threading.Thread(target=call)
+    leader.start()
+    started.wait()
+    follower = threading.Thread(target=call)
+    follower.start()
+    leader.join()
+    follower.join()
+
+    assert errors == ['upstream down', 'upstream down']
+
+
+def test_concurrent_searches_hit_upstream_once(app, upstream):
+    calls, responses = upstream
+    responses['search'] = {'searchResults': [{'id': 1, 'name': 'Mookie Betts'}]}
+    results = []
+
+    def search():
+        with app.app_context():
+            results.append(MLBAPIService.search_players('Mookie'))
+
+    threads = [threading.Thread(target=search) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert len(results) == 5
+
+
+def test_empty_searches_are_remembered(app, upstream):
+    calls, _ = upstream
+    before = upstream_stats()
+
+    assert MLBAPIService.search_players('Nobody Atall') == []
+    assert MLBAPIService.search_players('  nobody   atall') == []
+
+    assert len(calls) == 1
+    assert counted('negative_hits', before) == 1
+
+
+def test_found_results_are_not_negatively_cached(app, upstream):
+    calls, responses = upstream
+    responses['teams/119/roster'] = {'roster': [{'person': {'id': 1}}]}
+
+    MLBAPIService.get_team_roster(119)
+    MLBAPIService.get_team_roster(119)
+
+    assert len(calls) == 2
+
+
+def test_batch_fetch_skips_players_without_stats(app, upstream):
+    calls, responses = upstream
+    responses['people'] = lambda params: {'people': [
+        {'id': 1, 'stats': [{'splits': [{'stat': {'hits': 3}}]}]},
+        {'id': 2, 'stats': [{'splits': []}]}
+    ]}
+
+    MLBAPIService.get_players_stats([1, 2, 3], 2024, 'batting')
+    MLBAPIService.get_players_stats([1, 2, 3], 2024, 'batting')
+    MLBAPIService.get_player_stats(3, 2024, 'batting')
+
+    assert [params['personIds'] for _, params in calls] == ['1,2,3', '1']
+
+
+def test_search_fallback_stores_players_and_reports_metrics(app, upstream):
+    _, responses = upstream
+    responses['search'] = {'searchResults': [
+        {'id': 605141, 'name': 'Mookie Betts', 'primaryPosition': {'abbreviation': 'RF'}}
+    ]}
+    client = app.test_client()
+
+    data = client.get('/api/players/search?q=mookie').get_json()['data']
+
+    assert data == [{'id': 605141, 'name': 'Mookie Betts', 'team': None, 'position': 'RF'}]
+    assert db.session.get(Player, 605141).name == 'Mookie Betts'
+    stats = client.get('/api/cache/stats').get_json()['data']['upstream']
+    assert set(stats) == {'calls', 'coalesced', 'negative_hits', 'negative_stores'}
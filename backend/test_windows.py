@@ -0,0 +1,108 @@
+import pytest
+from sqlalchemy import insert
+from app import db
+from app.models import Player, Team, PlayerSeasonBatting, PlayerSeasonPitching
+
+# player_id -> {season: home_runs}; every season is 100 hits in 400 at-bats
+HOME_RUNS = {
+    1: {2020: 10, 2021: 20, 2022: 30, 2023: 40},
+    2: {2021: 35, 2023: 5},
+    3: {2023: 40, 2024: 12}
+}
+
+
+@pytest.fixture
+def seasons(app):
+    db.session.add(Team(id=1, name='Los Angeles Dodgers', abbreviation='LAD'))
+    db.session.execute(insert(Player), [
+        {'id': i, 'name': f'Player {i}', 'team_id': 1 if i != 2 else None} for i in HOME_RUNS
+    ])
+    db.session.execute(insert(PlayerSeasonBatting), [
+        {'player_id': player_id, 'season': season, 'games': 150, 'at_bats': 400, 'hits': 100,
+         'runs': 80, 'rbis': 90, 'home_runs': home_runs, 'batting_average': 0.25}
+        for player_id, by_season in HOME_RUNS.items() for season, home_runs in by_season.items()
+    ])
+    db.session.commit()
+
+
+def lines(client, url):
+    response = client.get(url)
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()['data']
+
+
+def test_career_to_date_totals_include_seasons_before_the_range(client, seasons):
+    rows = lines(client, '/api/stats/batting/running?sort=-home_runs&season_from=2023&limit=3')
+
+    assert [(row['player_id'], row['season'], row['home_runs'], row['seasons']) for row in rows] == [
+        (1, 2023, 100, 4), (3, 2024, 52, 2), (2, 2023, 40, 2)
+    ]
+    assert rows[0]['at_bats'] == 1600
+    assert rows[0]['batting_average'] == pytest.approx(0.25)
+
+
+def test_rolling_windows_span_calendar_seasons(client, seasons):
+    rows = lines(client, '/api/stats/batting/running?sort=-home_runs&window=2&season=2023')
+
+    # Player 2 skipped 2022, so their 2022-23 window holds one season
+    assert {row['player_id']: (row['home_runs'], row['seasons']) for row in rows} == {
+        1: (70, 2), 3: (40, 1), 2: (5, 1)
+    }
+    assert [row['rank'] for row in rows] == [1, 2, 3]
+
+
+def test_career_totals_are_ranked_with_ties(client, seasons):
+    rows = lines(client, '/api/stats/batting/career?sort=-home_runs&season_from=2021&season_to=2023')
+
+    assert [(row['rank'], row['player_id'], row['home_runs']) for row in rows] == [
+        (1, 1, 90), (2, 2, 40), (2, 3, 40)
+    ]
+    assert (rows[0]['first_season'], rows[0]['last_season'], rows[0]['seasons']) == (2021, 2023, 3)
+
+
+def test_page_size_is_kept_in_range(client, seasons, app):
+    app.config['MAX_ITEMS_PER_PAGE'] = 2
+    url = '/api/stats/batting/career?sort=-home_runs&limit='
+
+    assert [len(lines(client, url + limit)) for limit in ('0', '-1', '5')] == [1, 1, 2]
+
+
+def test_best_season_per_player(client, seasons):
+    rows = lines(client, '/api/stats/batting/best?sort=-home_runs')
+
+    assert [(row['rank'], row['player_id'], row['season']) for row in rows] == [
+        (1, 1, 2023), (1, 3, 2023), (3, 2, 2021)
+    ]
+    two_each = lines(client, '/api/stats/batting/best?sort=-home_runs&per_player=2&team=LAD')
+    assert [(row['player_id'], row['season']) for row in two_each] == [
+        (1, 2023), (3, 2023), (1, 2022), (3, 2024)
+    ]
+
+
+def test_top_single_seasons_over_a_range(client, seasons):
+    rows = lines(client, '/api/stats/batting?sort=-home_runs&season_from=2021&season_to=2022&limit=2')
+
+    assert [(row['player_id'], row['season']) for row in rows] == [(2, 2021), (1, 2022)]
+
+
+def test_pitching_rates_are_derived_from_summed_totals(client, app):
+    db.session.add(Player(id=1, name='Ace'))
+    db.session.execute(insert(PlayerSeasonPitching), [
+        {'player_id': 1, 'season': 2023, 'games': 30, 'innings_pitched': 180.0, 'earned_runs': 60,
+         'strikeouts': 200, 'era': 3.0},
+        {'player_id': 1, 'season': 2024, 'games': 10, 'innings_pitched': 20.0, 'earned_runs': 20,
+         'strikeouts': 20, 'era': 9.0}
+    ])
+    db.session.commit()
+
+    [row] = lines(client, '/api/stats/pitching/career?sort=era')
+
+    assert row['era'] == pytest.approx(80 * 9 / 200)
+    assert row['strikeouts_per_nine'] == pytest.approx(220 * 9 / 200)
+
+
+def test_sort_is_required_and_validated(client, seasons):
+    assert client.get('/api/stats/batting/career').status_code == 400
+    assert client.get('/api/stats/batting/best?sort=-nope').status_code == 400
+    assert client.get('/api/stats/batting/running?sort=hits&window=0').status_code == 400
+    assert client.get('/api/stats/fielding/career?sort=hits').status_code == 400
@@ -57,8 +57,10 @@ export const getPlayers = async (query: string) => {
 };
 
 export const exportStatistics = async (filters: FilterOptions): Promise<Blob> => {
+    // Season totals have no dates; a date range exports game logs instead
+    const level = filters.start_date || filters.end_date ? 'game' : 'season';
     const response = await api.get('/statistics/export', {
-        params: filters,
+        params: { level, ...filters },
         responseType: 'blob'
     });
     return response.data;